@@ -21,6 +21,7 @@ along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import base64
+import binascii
 import base58
 
 from dna.crypto.curve import Curve
@@ -31,8 +32,7 @@ from dna.common.address import Address
 from dna.crypto.key_type import KeyType
 from dna.crypto.signature import Signature
 from dna.crypto.aes_handler import AESHandler
-from dna.io.binary_writer import BinaryWriter
-from dna.io.memory_stream import StreamManager
+from dna.io.binary_writer import encode_var_bytes
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 from dna.crypto.signature_scheme import SignatureScheme
@@ -173,16 +173,9 @@ class Account(object):
         return private_key.hex()
 
     def get_public_key_serialize(self):
-        stream = StreamManager.get_stream()
-        writer = BinaryWriter(stream)
-        if self.__key_type == KeyType.ECDSA:
-            writer.write_var_bytes(self.__public_key)
-        else:
+        if self.__key_type != KeyType.ECDSA:
             raise SDKException(ErrorCode.unknown_asymmetric_key_type)
-        stream.flush()
-        bytes_stream = stream.hexlify()
-        StreamManager.release_stream(stream)
-        return bytes_stream
+        return binascii.hexlify(encode_var_bytes(self.__public_key))
 
     def get_private_key_bytes(self) -> bytes:
         """
@@ -154,20 +154,31 @@ class Claim(object):
                                                             b58_payer_address, gas_limit, gas_price)
         return tx
 
-    def generate_blk_proof(self, commit_tx_hash: str, is_big_endian: bool = True, hex_contract_address: str = ''):
+    def generate_blk_proof(self, commit_tx_hash: str, is_big_endian: bool = True, hex_contract_address: str = '',
+                           timeout: float = 60):
         if len(hex_contract_address) == 0:
             hex_contract_address = self.__sdk.neo_vm.claim_record().hex_contract_address
-        count = 0
-        while True:
-            try:
-                merkle_proof = self.__sdk.default_network.get_merkle_proof(commit_tx_hash)
-                if isinstance(merkle_proof, dict):
-                    break
-            except SDKException as e:
-                if count > 5 or 'INVALID PARAMS' not in e.args[1]:
-                    raise e
+        try:
+            merkle_proof = self.__sdk.default_network.get_merkle_proof(commit_tx_hash)
+        except SDKException as e:
+            if 'INVALID PARAMS' not in e.args[1]:
+                raise e
+            merkle_proof = None
+        if not isinstance(merkle_proof, dict) or len(merkle_proof) == 0:
+            self.__sdk.tx_watcher.wait(commit_tx_hash, timeout)
+            count = 0
+            while True:
+                try:
+                    merkle_proof = self.__sdk.default_network.get_merkle_proof(commit_tx_hash)
+                    if isinstance(merkle_proof, dict) and len(merkle_proof) != 0:
+                        break
+                except SDKException as e:
+                    if count > 5 or 'INVALID PARAMS' not in e.args[1]:
+                        raise e
+                if count > 5:
+                    raise SDKException(ErrorCode.other_error('Invalid merkle proof'))
                 sleep(6)
-            count += 1
+                count += 1
         tx_block_height = merkle_proof['BlockHeight']
         current_block_height = merkle_proof['CurBlockHeight']
         target_hash = merkle_proof['TransactionsRoot']
@@ -0,0 +1,184 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import List
+
+from dna.common.address import Address
+from dna.core.transaction import Transaction
+from dna.crypto.digest import Digest
+from dna.io.binary_reader import BinaryReader
+from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_reader import MemoryReader
+from dna.io.memory_stream import StreamManager
+
+HEADER_FORMAT = '<I32s32s32sIIQ'
+
+
+class Header(object):
+    def __init__(self, version: int = 0, prev_block_hash: bytes = bytes(32), transactions_root: bytes = bytes(32),
+                 block_root: bytes = bytes(32), timestamp: int = 0, height: int = 0, consensus_data: int = 0,
+                 consensus_payload: bytes = b'', next_bookkeeper: bytes = bytes(20), bookkeepers: List[bytes] = None,
+                 sig_data: List[bytes] = None):
+        self.version = version
+        self.prev_block_hash = prev_block_hash
+        self.transactions_root = transactions_root
+        self.block_root = block_root
+        self.timestamp = timestamp
+        self.height = height
+        self.consensus_data = consensus_data
+        self.consensus_payload = consensus_payload
+        self.next_bookkeeper = next_bookkeeper
+        if bookkeepers is None:
+            bookkeepers = list()
+        self.bookkeepers = bookkeepers
+        if sig_data is None:
+            sig_data = list()
+        self.sig_data = sig_data
+
+    def __iter__(self):
+        data = dict()
+        data['Version'] = self.version
+        data['PrevBlockHash'] = bytes.hex(self.prev_block_hash[::-1])
+        data['TransactionsRoot'] = bytes.hex(self.transactions_root[::-1])
+        data['BlockRoot'] = bytes.hex(self.block_root[::-1])
+        data['Timestamp'] = self.timestamp
+        data['Height'] = self.height
+        data['ConsensusData'] = self.consensus_data
+        data['ConsensusPayload'] = bytes.hex(self.consensus_payload)
+        data['NextBookkeeper'] = Address(self.next_bookkeeper).b58encode()
+        data['Bookkeepers'] = [bytes.hex(key) for key in self.bookkeepers]
+        data['SigData'] = [bytes.hex(sig) for sig in self.sig_data]
+        data['Hash'] = self.hash256_explorer()
+        for key, value in data.items():
+            yield (key, value)
+
+    def serialize_unsigned_to(self, writer: BinaryWriter):
+        writer.write_uint32(self.version)
+        writer.write_bytes(self.prev_block_hash)
+        writer.write_bytes(self.transactions_root)
+        writer.write_bytes(self.block_root)
+        writer.write_uint32(self.timestamp)
+        writer.write_uint32(self.height)
+        writer.write_uint64(self.consensus_data)
+        writer.write_var_bytes(self.consensus_payload)
+        writer.write_bytes(self.next_bookkeeper)
+
+    def serialize_to(self, writer: BinaryWriter):
+        self.serialize_unsigned_to(writer)
+        writer.write_var_int(len(self.bookkeepers))
+        for key in self.bookkeepers:
+            writer.write_var_bytes(key)
+        writer.write_var_int(len(self.sig_data))
+        for sig in self.sig_data:
+            writer.write_var_bytes(sig)
+
+    def serialize_unsigned(self) -> bytes:
+        with StreamManager.checkout() as ms:
+            self.serialize_unsigned_to(BinaryWriter(ms))
+            ms.flush()
+            header_bytes = ms.to_bytes()
+        return header_bytes
+
+    def serialize(self, is_hex: bool = False) -> bytes or str:
+        with StreamManager.checkout() as ms:
+            self.serialize_to(BinaryWriter(ms))
+            ms.flush()
+            header_bytes = ms.to_bytes()
+        if is_hex:
+            return header_bytes.hex()
+        return header_bytes
+
+    def hash256(self, is_hex: bool = False) -> bytes or str:
+        return Digest.hash256(self.serialize_unsigned(), is_hex)
+
+    def hash256_explorer(self) -> str:
+        return bytes.hex(self.hash256()[::-1])
+
+    @staticmethod
+    def deserialize_from(header_bytes: bytes):
+        return Header.deserialize(MemoryReader(header_bytes))
+
+    @staticmethod
+    def deserialize(reader: BinaryReader):
+        header = Header()
+        (header.version, header.prev_block_hash, header.transactions_root, header.block_root, header.timestamp,
+         header.height, header.consensus_data) = reader.read_fields(HEADER_FORMAT)
+        header.consensus_payload = reader.read_var_bytes()
+        header.next_bookkeeper = reader.read_bytes(20)
+        header.bookkeepers = [reader.read_var_bytes() for _ in range(reader.read_var_int())]
+        header.sig_data = [reader.read_var_bytes() for _ in range(reader.read_var_int())]
+        return header
+
+
+class Block(object):
+    def __init__(self, header: Header = None, transactions: List[Transaction] = None):
+        if header is None:
+            header = Header()
+        self.header = header
+        if transactions is None:
+            transactions = list()
+        self.transactions = transactions
+
+    def __iter__(self):
+        data = dict()
+        data['Hash'] = self.hash256_explorer()
+        data['Header'] = dict(self.header)
+        data['Transactions'] = [dict(tx) for tx in self.transactions]
+        for key, value in data.items():
+            yield (key, value)
+
+    @property
+    def height(self) -> int:
+        return self.header.height
+
+    def hash256(self, is_hex: bool = False) -> bytes or str:
+        return self.header.hash256(is_hex)
+
+    def hash256_explorer(self) -> str:
+        return self.header.hash256_explorer()
+
+    def serialize(self, is_hex: bool = False) -> bytes or str:
+        with StreamManager.checkout() as ms:
+            writer = BinaryWriter(ms)
+            self.header.serialize_to(writer)
+            writer.write_uint32(len(self.transactions))
+            for tx in self.transactions:
+                writer.write_bytes(tx.serialize())
+            ms.flush()
+            block_bytes = ms.to_bytes()
+        if is_hex:
+            return block_bytes.hex()
+        return block_bytes
+
+    @staticmethod
+    def deserialize_from(block_bytes: bytes):
+        """
+        This interface is used to decode the raw block, e.g. bytes.fromhex(sdk.rpc.get_raw_block_by_height(height)).
+        """
+        return Block.deserialize(MemoryReader(block_bytes))
+
+    @staticmethod
+    def deserialize(reader: BinaryReader):
+        header = Header.deserialize(reader)
+        tx_len = reader.read_uint32()
+        transactions = [Transaction.deserialize(reader) for _ in range(tx_len)]
+        return Block(header, transactions)
@@ -27,19 +27,22 @@ from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 
 from dna.common.address import Address
+from dna.io.binary_reader import BinaryReader
 from dna.io.binary_writer import BinaryWriter
 from dna.core.transaction import Transaction, TxType
 from dna.vm.vm_type import VmType
 
 
 class DeployTransaction(Transaction):
-    def __init__(self, code: bytearray or str, vm_type: VmType, name: str = '', version: str = '', author: str = '',
-                 email: str = '', description: str = '', gas_price: int = 0, gas_limit: int = 0,
+    __slots__ = ('__code', '__vm_type', '__name', '__code_version', '__author', '__email', '__description')
+
+    def __init__(self, code: Union[bytes, bytearray, str], vm_type: VmType, name: str = '', version: str = '',
+                 author: str = '', email: str = '', description: str = '', gas_price: int = 0, gas_limit: int = 0,
                  payer: Union[str, bytes, Address, None] = b''):
         super().__init__(0, TxType.Deploy, gas_price, gas_limit, payer)
         if isinstance(code, str):
-            code = bytearray.fromhex(code)
-        self.__code = code
+            code = bytes.fromhex(code)
+        self.__code = bytes(code)
         if not isinstance(vm_type, VmType):
             raise SDKException(ErrorCode.other_error('invalid vm type'))
         self.__vm_type = vm_type
@@ -57,3 +60,45 @@ class DeployTransaction(Transaction):
         writer.write_var_str(self.__author)
         writer.write_var_str(self.__email)
         writer.write_var_str(self.__description)
+
+    @property
+    def code(self) -> bytes:
+        """
+        The code is stored as immutable bytes, so that the cached hash of the transaction cannot go stale.
+        """
+        return self.__code
+
+    @property
+    def vm_type(self) -> VmType:
+        return self.__vm_type
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def code_version(self) -> str:
+        return self.__code_version
+
+    @property
+    def author(self) -> str:
+        return self.__author
+
+    @property
+    def email(self) -> str:
+        return self.__email
+
+    @property
+    def description(self) -> str:
+        return self.__description
+
+    @staticmethod
+    def deserialize_exclusive_data(reader: BinaryReader):
+        code = reader.read_var_bytes()
+        vm_type = VmType.from_int(reader.read_byte())
+        name = reader.read_var_str().decode('utf-8')
+        version = reader.read_var_str().decode('utf-8')
+        author = reader.read_var_str().decode('utf-8')
+        email = reader.read_var_str().decode('utf-8')
+        description = reader.read_var_str().decode('utf-8')
+        return DeployTransaction(code, vm_type, name, version, author, email, description)
@@ -40,6 +40,8 @@ from dna.contract.wasm.invoke_function import WasmInvokeFunction
 
 
 class InvokeTransaction(Transaction):
+    __slots__ = ()
+
     def __init__(self, payer: Union[str, bytes, Address] = b'', gas_price: int = 0, gas_limit: int = 0,
                  payload: bytearray = None, tx_type: TxType = TxType.InvokeNeoVm, version: int = 0):
         super().__init__(version, tx_type, gas_price, gas_limit, payer, payload)
@@ -25,11 +25,9 @@ from typing import List
 
 from dna.core.base_params_builder import BaseParamsBuilder
 from dna.crypto.key_type import KeyType
-from dna.utils.utils import bytes_reader
 from dna.io.binary_reader import BinaryReader
-from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_reader import MemoryReader
 from dna.core.program_info import ProgramInfo
-from dna.io.memory_stream import StreamManager
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 from dna.vm.op_code import PUSHBYTES75, PUSHBYTES1, PUSHDATA1, PUSHDATA2, PUSHDATA4, CHECKSIG, CHECKMULTISIG, PUSH1
@@ -55,27 +53,18 @@ class ProgramBuilder(object):
 
     @staticmethod
     def push_bytes(data):
-        ms = StreamManager.get_stream()
-        writer = BinaryWriter(ms)
-        if len(data) == 0:
+        length = len(data)
+        if length == 0:
             raise ValueError("push data error: data is null")
-        if len(data) <= int.from_bytes(PUSHBYTES75, 'little') + 1 - int.from_bytes(PUSHBYTES1, 'little'):
-            num = len(data) + int.from_bytes(PUSHBYTES1, 'little') - 1
-            writer.write_byte(num)
-        elif len(data) < 0x100:
-            writer.write_byte(PUSHDATA1)
-            writer.write_uint8(len(data))
-        elif len(data) < 0x10000:
-            writer.write_byte(PUSHDATA2)
-            writer.write_uint16(len(data))
+        if length <= int.from_bytes(PUSHBYTES75, 'little') + 1 - int.from_bytes(PUSHBYTES1, 'little'):
+            res = bytearray((length + int.from_bytes(PUSHBYTES1, 'little') - 1,))
+        elif length < 0x100:
+            res = bytearray(PUSHDATA1 + length.to_bytes(1, 'little'))
+        elif length < 0x10000:
+            res = bytearray(PUSHDATA2 + length.to_bytes(2, 'little'))
         else:
-            writer.write_byte(PUSHDATA4)
-            writer.write_uint32(len(data))
-        writer.write_bytes(data)
-        ms.flush()
-        res = ms.hexlify()
-        StreamManager.release_stream(ms)
-        res = bytes_reader(res)
+            res = bytearray(PUSHDATA4 + length.to_bytes(4, 'little'))
+        res += data
         return res
 
     @staticmethod
@@ -141,8 +130,7 @@ class ProgramBuilder(object):
 
     @staticmethod
     def get_param_info(program: bytes):
-        ms = StreamManager.get_stream(program)
-        reader = BinaryReader(ms)
+        reader = MemoryReader(program)
         param_info = []
         while True:
             try:
@@ -156,9 +144,7 @@ class ProgramBuilder(object):
     def get_program_info(program: bytes) -> ProgramInfo:
         length = len(program)
         end = program[length - 1]
-        temp = program[:length - 1]
-        ms = StreamManager.get_stream(temp)
-        reader = BinaryReader(ms)
+        reader = MemoryReader(program[:length - 1])
         info = ProgramInfo()
         if end == int.from_bytes(CHECKSIG, 'little'):
             pub_keys = ProgramBuilder.read_bytes(reader)
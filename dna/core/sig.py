@@ -19,15 +19,15 @@ GNU Lesser General Public License for more details.
 You should have received a copy of the GNU Lesser General Public License
 along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
+
 from typing import List
 
 from dna.core.program import ProgramBuilder
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 from dna.io.binary_reader import BinaryReader
-from dna.io.binary_writer import BinaryWriter
-from dna.io.memory_stream import StreamManager
-from dna.utils.utils import bytes_reader
+from dna.io.binary_writer import encode_var_bytes
+from dna.io.memory_reader import MemoryReader
 
 
 class Sig(object):
@@ -64,21 +64,13 @@ class Sig(object):
             verification_script = ProgramBuilder.program_from_pubkey(self.public_keys[0])
         else:
             verification_script = ProgramBuilder.program_from_multi_pubkey(self.m, self.public_keys)
-        ms = StreamManager.get_stream()
-        writer = BinaryWriter(ms)
-        writer.write_var_bytes(invoke_script)
-        writer.write_var_bytes(verification_script)
-        ms.flush()
-        res = ms.hexlify()
-        res = bytes_reader(res)
-        StreamManager.release_stream(ms)
+        res = bytearray(encode_var_bytes(invoke_script))
+        res += encode_var_bytes(verification_script)
         return res
 
     @staticmethod
     def deserialize_from(sig_bytes: bytes):
-        ms = StreamManager.get_stream(sig_bytes)
-        reader = BinaryReader(ms)
-        return Sig.deserialize(reader)
+        return Sig.deserialize(MemoryReader(sig_bytes))
 
     @staticmethod
     def deserialize(reader: BinaryReader):
@@ -35,6 +35,7 @@ from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 from dna.io.binary_reader import BinaryReader
 from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_reader import MemoryReader
 from dna.io.memory_stream import StreamManager
 
 
@@ -51,15 +52,17 @@ class TxType(Enum):
 
 TX_MAX_SIG_SIZE = 16
 
+TX_HEADER_FORMAT = '<BBIQQ20s'
+
 
 class Transaction(object):
+    __slots__ = ('__version', '__tx_type', '__nonce', '__gas_price', '__gas_limit', '__payer', '__payload',
+                 '__attributes', '__unsigned', '__unsigned_attributes', '__hash', 'sig_list')
+
     def __init__(self, version=0, tx_type: TxType or int = None, gas_price: int = 0, gas_limit: int = 0,
                  payer: Union[str, bytes, Address, None] = b'', payload: bytearray = bytearray(), nonce: int = None,
                  attributes: bytearray = bytearray(), sig_list: List[Sig] = None):
-        if gas_price < 0:
-            raise SDKException(ErrorCode.other_error('the gas price should be equal or greater than zero.'))
-        if gas_limit < 0:
-            raise SDKException(ErrorCode.other_error('the gas limit should be equal or greater than zero.'))
+        self.__invalidate()
         self.version = version
         if isinstance(tx_type, int):
             tx_type = TxType(tx_type)
@@ -70,12 +73,6 @@ class Transaction(object):
         self.nonce = nonce
         self.gas_price = gas_price
         self.gas_limit = gas_limit
-        if not payer:
-            payer = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
-        if isinstance(payer, str):
-            payer = Address.b58decode(payer).to_bytes()
-        if isinstance(payer, Address):
-            payer = payer.to_bytes()
         self.payer = payer
         self.payload = payload
         self.attributes = attributes
@@ -92,56 +89,164 @@ class Transaction(object):
         data['gasLimit'] = self.gas_limit
         data['payer'] = Address(self.payer).b58encode()
         data['payload'] = binascii.b2a_hex(self.payload)
-        data['attributes'] = binascii.b2a_hex(self.attributes)
+        if isinstance(self.attributes, list):
+            data['attributes'] = binascii.b2a_hex(b''.join(self.attributes))
+        else:
+            data['attributes'] = binascii.b2a_hex(self.attributes)
         data['sigs'] = list()
         for sig in self.sig_list:
             data['sigs'].append(dict(sig))
         for key, value in data.items():
             yield (key, value)
 
+    def __invalidate(self):
+        self.__unsigned = None
+        self.__unsigned_attributes = None
+        self.__hash = None
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    @version.setter
+    def version(self, version: int):
+        self.__version = version
+        self.__invalidate()
+
+    @property
+    def tx_type(self) -> int:
+        return self.__tx_type
+
+    @tx_type.setter
+    def tx_type(self, tx_type: int):
+        self.__tx_type = tx_type
+        self.__invalidate()
+
+    @property
+    def nonce(self) -> int:
+        return self.__nonce
+
+    @nonce.setter
+    def nonce(self, nonce: int):
+        self.__nonce = nonce
+        self.__invalidate()
+
+    @property
+    def gas_price(self) -> int:
+        return self.__gas_price
+
+    @gas_price.setter
+    def gas_price(self, gas_price: int):
+        if gas_price < 0:
+            raise SDKException(ErrorCode.other_error('the gas price should be equal or greater than zero.'))
+        self.__gas_price = gas_price
+        self.__invalidate()
+
+    @property
+    def gas_limit(self) -> int:
+        return self.__gas_limit
+
+    @gas_limit.setter
+    def gas_limit(self, gas_limit: int):
+        if gas_limit < 0:
+            raise SDKException(ErrorCode.other_error('the gas limit should be equal or greater than zero.'))
+        self.__gas_limit = gas_limit
+        self.__invalidate()
+
+    @property
+    def payer(self) -> bytes:
+        return self.__payer
+
+    @payer.setter
+    def payer(self, payer: Union[str, bytes, Address, None]):
+        if not payer:
+            payer = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+        if isinstance(payer, str):
+            payer = Address.b58decode(payer).to_bytes()
+        if isinstance(payer, Address):
+            payer = payer.to_bytes()
+        self.__payer = bytes(payer)
+        self.__invalidate()
+
+    @property
+    def payload(self) -> bytes:
+        """
+        The payload is stored as immutable bytes, so that it can only be changed by assignment.
+        """
+        return self.__payload
+
+    @payload.setter
+    def payload(self, payload: bytes):
+        if payload is not None:
+            payload = bytes(payload)
+        self.__payload = payload
+        self.__invalidate()
+
+    @property
+    def attributes(self) -> Union[bytes, List[bytes]]:
+        """
+        The attributes are either empty bytes or a list of serialized attributes, which may be appended in place.
+        """
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, attributes: Union[bytes, bytearray, List[bytes]]):
+        if not isinstance(attributes, list):
+            attributes = bytes(attributes)
+        self.__attributes = attributes
+        self.__invalidate()
+
     def serialize_unsigned(self) -> bytes or str:
-        ms = StreamManager.get_stream()
-        writer = BinaryWriter(ms)
-        writer.write_uint8(self.version)
-        writer.write_uint8(self.tx_type)
-        writer.write_uint32(self.nonce)
-        writer.write_uint64(self.gas_price)
-        writer.write_uint64(self.gas_limit)
-        writer.write_bytes(self.payer)
-        self.serialize_exclusive_data(writer)
-        if self.payload is not None and len(self.payload) != 0:
-            writer.write_var_bytes(bytes(self.payload))
-        writer.write_var_int(len(self.attributes))
-        ms.flush()
-        hex_bytes = ms.to_bytes()
-        StreamManager.release_stream(ms)
-        return hex_bytes
+        """
+        The unsigned serialization is cached until one of the serialized fields is assigned again,
+        or the list of attributes is changed in place.
+        """
+        if self.__unsigned is not None:
+            if not isinstance(self.attributes, list) or self.attributes == self.__unsigned_attributes:
+                return self.__unsigned
+            self.__invalidate()
+        with StreamManager.checkout() as ms:
+            writer = BinaryWriter(ms)
+            if len(self.payer) != 20:
+                raise SDKException(ErrorCode.param_err('the length of payer should be 20 bytes.'))
+            writer.write_fields(TX_HEADER_FORMAT, self.version, self.tx_type, self.nonce, self.gas_price,
+                                self.gas_limit, self.payer)
+            self.serialize_exclusive_data(writer)
+            if self.payload is not None and len(self.payload) != 0:
+                writer.write_var_bytes(self.payload)
+            writer.write_var_int(len(self.attributes))
+            if isinstance(self.attributes, list):
+                for attribute in self.attributes:
+                    writer.write_bytes(attribute)
+            ms.flush()
+            self.__unsigned = ms.to_bytes()
+        if isinstance(self.attributes, list):
+            self.__unsigned_attributes = list(self.attributes)
+        return self.__unsigned
 
     def serialize_exclusive_data(self, writer):
         pass
 
     def hash256_explorer(self) -> str:
-        tx_serial = self.serialize_unsigned()
-        digest = Digest.hash256(tx_serial)
-        if not isinstance(digest, bytes):
-            raise SDKException(ErrorCode.require_bytes_params)
-        return bytes.hex(digest[::-1])
+        return bytes.hex(self.hash256()[::-1])
 
     def hash256(self, is_hex: bool = False) -> bytes or str:
         tx_serial = self.serialize_unsigned()
-        digest = Digest.hash256(tx_serial, is_hex)
-        return digest
+        if self.__hash is None:
+            self.__hash = Digest.hash256(tx_serial)
+        if is_hex:
+            return self.__hash.hex()
+        return self.__hash
 
     def serialize(self, is_hex: bool = False) -> bytes or str:
-        ms = StreamManager.get_stream()
-        writer = BinaryWriter(ms)
-        writer.write_bytes(self.serialize_unsigned())
-        writer.write_var_int(len(self.sig_list))
-        for sig in self.sig_list:
-            writer.write_bytes(sig.serialize())
-        ms.flush()
-        bytes_tx = ms.to_bytes()
-        StreamManager.release_stream(ms)
+        with StreamManager.checkout() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_bytes(self.serialize_unsigned())
+            writer.write_var_int(len(self.sig_list))
+            for sig in self.sig_list:
+                writer.write_bytes(sig.serialize())
+            ms.flush()
+            bytes_tx = ms.to_bytes()
         if is_hex:
             return bytes_tx.hex()
         else:
@@ -149,25 +254,52 @@ class Transaction(object):
 
     @staticmethod
     def deserialize_from(bytes_tx: bytes):
-        ms = StreamManager.get_stream(bytes_tx)
-        reader = BinaryReader(ms)
-        tx = Transaction()
-        tx.version = reader.read_uint8()
-        tx.tx_type = reader.read_uint8()
-        tx.nonce = reader.read_uint32()
-        tx.gas_price = reader.read_uint64()
-        tx.gas_limit = reader.read_uint64()
-        tx.payer = reader.read_bytes(20)
-        tx.payload = reader.read_var_bytes()
+        return Transaction.deserialize(MemoryReader(bytes_tx))
+
+    @staticmethod
+    def deserialize(reader: BinaryReader):
+        """
+        This interface is used to read a signed transaction from the reader, which could be shared by a block.
+        """
+        version, tx_type, nonce, gas_price, gas_limit, payer = reader.read_fields(TX_HEADER_FORMAT)
+        try:
+            TxType(tx_type)
+        except ValueError:
+            raise SDKException(ErrorCode.param_err(f'unsupported transaction type: {tx_type}.'))
+        if tx_type == TxType.Deploy.value:
+            from dna.core.deploy_transaction import DeployTransaction
+            tx = DeployTransaction.deserialize_exclusive_data(reader)
+        else:
+            tx = Transaction()
+            tx.payload = reader.read_var_bytes()
+        tx.__version, tx.__tx_type, tx.__nonce = version, tx_type, nonce
+        tx.__gas_price, tx.__gas_limit, tx.__payer = gas_price, gas_limit, payer
         attribute_len = reader.read_var_int()
-        if attribute_len is 0:
+        if attribute_len == 0:
             tx.attributes = bytearray()
+        else:
+            tx.attributes = [Transaction.read_attribute(reader) for _ in range(attribute_len)]
         sig_len = reader.read_var_int()
         tx.sig_list = list()
         for _ in range(0, sig_len):
             tx.sig_list.append(Sig.deserialize(reader))
         return tx
 
+    @staticmethod
+    def read_attribute(reader: BinaryReader) -> bytes:
+        """
+        This interface is used to read a serialized attribute, which is made up of the usage and the var bytes data.
+        """
+        usage = reader.read_uint8()
+        data = reader.read_var_bytes()
+        with StreamManager.checkout() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_uint8(usage)
+            writer.write_var_bytes(data)
+            ms.flush()
+            attribute = ms.to_bytes()
+        return attribute
+
     def sign_transaction(self, *signers: Account):
         """
         This interface is used to sign the transaction.
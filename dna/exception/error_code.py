@@ -83,6 +83,20 @@ class ErrorCode:
     def connect_timeout(url: str):
         return ErrorCode.get_error(60002, f'Network Error, ConnectionError: {url}')
 
+    no_available_endpoint = get_error.__func__(60003, 'Network Error, no available endpoint')
+
+    @staticmethod
+    def wait_tx_timeout(tx_hash: str):
+        return ErrorCode.get_error(60004, f'Network Error, wait for transaction timeout: {tx_hash}')
+
+    @staticmethod
+    def tx_dropped(tx_hash: str):
+        return ErrorCode.get_error(60005, f'Network Error, transaction dropped from memory pool: {tx_hash}')
+
+    @staticmethod
+    def circuit_breaker_open(url: str):
+        return ErrorCode.get_error(60006, f'Network Error, circuit breaker is open: {url}')
+
     hd_index_out_of_range = get_error.__func__(70001, 'Crypto Error, index is out of range: 0 <= index <= 2**32 - 1')
     hd_root_key_not_master_key = get_error.__func__(70002,
                                                     "Crypto Error, root_key must be a master key if m is the first element of the path")
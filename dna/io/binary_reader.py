@@ -25,6 +25,8 @@ import struct
 import binascii
 import importlib
 
+from dna.io import struct_codec
+from dna.io.struct_codec import get_codec
 from dna.io.memory_stream import StreamManager
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
@@ -62,11 +64,26 @@ class BinaryReader(StreamManager):
             variable: the result according to the specified format.
         """
         try:
-            info = struct.unpack(fmt, self.stream.read(length))[0]
+            info = get_codec(fmt).unpack(self.stream.read(length))[0]
         except struct.error as e:
             raise SDKException(ErrorCode.unpack_error(e.args[0]))
         return info
 
+    def _unpack_codec(self, codec: struct.Struct) -> tuple:
+        try:
+            return codec.unpack(self.stream.read(codec.size))
+        except struct.error as e:
+            raise SDKException(ErrorCode.unpack_error(e.args[0]))
+
+    def read_fields(self, fmt: str) -> tuple:
+        """
+        Unpack a fixed size group of values according to the format `fmt` in one call, e.g. a fixed size header.
+
+        Returns:
+            tuple: the values in the order of the format.
+        """
+        return self._unpack_codec(get_codec(fmt))
+
     def read_byte(self, do_ord=True) -> int:
         """
         Read a single byte.
@@ -103,7 +120,7 @@ class BinaryReader(StreamManager):
         Returns:
             bool:
         """
-        return self.unpack('?')
+        return self._unpack_codec(struct_codec.BOOL)[0]
 
     def read_char(self):
         """
@@ -112,7 +129,7 @@ class BinaryReader(StreamManager):
         Returns:
             str: a single character.
         """
-        return self.unpack('c')
+        return self._unpack_codec(struct_codec.CHAR)[0]
 
     def read_float(self, little_endian=True):
         """
@@ -124,11 +141,7 @@ class BinaryReader(StreamManager):
         Returns:
             float:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack("%sf" % endian, 4)
+        return self._unpack_codec(struct_codec.FLOAT if little_endian else struct_codec.FLOAT_BE)[0]
 
     def read_double(self, little_endian=True):
         """
@@ -140,11 +153,7 @@ class BinaryReader(StreamManager):
         Returns:
             float:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack("%sd" % endian, 8)
+        return self._unpack_codec(struct_codec.DOUBLE if little_endian else struct_codec.DOUBLE_BE)[0]
 
     def read_int8(self, little_endian=True):
         """
@@ -156,11 +165,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sb' % endian)
+        return self._unpack_codec(struct_codec.INT8)[0]
 
     def read_uint8(self, little_endian=True):
         """
@@ -172,11 +177,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sB' % endian)
+        return self._unpack_codec(struct_codec.UINT8)[0]
 
     def read_int16(self, little_endian=True):
         """
@@ -188,11 +189,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sh' % endian, 2)
+        return self._unpack_codec(struct_codec.INT16 if little_endian else struct_codec.INT16_BE)[0]
 
     def read_uint16(self, little_endian=True):
         """
@@ -204,11 +201,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sH' % endian, 2)
+        return self._unpack_codec(struct_codec.UINT16 if little_endian else struct_codec.UINT16_BE)[0]
 
     def read_int32(self, little_endian=True):
         """
@@ -220,11 +213,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%si' % endian, 4)
+        return self._unpack_codec(struct_codec.INT32 if little_endian else struct_codec.INT32_BE)[0]
 
     def read_uint32(self, little_endian=True):
         """
@@ -236,11 +225,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sI' % endian, 4)
+        return self._unpack_codec(struct_codec.UINT32 if little_endian else struct_codec.UINT32_BE)[0]
 
     def read_int64(self, little_endian=True):
         """
@@ -252,11 +237,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sq' % endian, 8)
+        return self._unpack_codec(struct_codec.INT64 if little_endian else struct_codec.INT64_BE)[0]
 
     def read_uint64(self, little_endian=True):
         """
@@ -268,11 +249,7 @@ class BinaryReader(StreamManager):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sQ' % endian, 8)
+        return self._unpack_codec(struct_codec.UINT64 if little_endian else struct_codec.UINT64_BE)[0]
 
     def read_var_int(self, max_size=sys.maxsize):
         """
@@ -286,19 +263,17 @@ class BinaryReader(StreamManager):
             int:
         """
         fb = self.read_byte()
-        if fb is 0:
-            return fb
-        if hex(fb) == '0xfd':
-            value = self.read_uint16()
-        elif hex(fb) == '0xfe':
-            value = self.read_uint32()
-        elif hex(fb) == '0xff':
-            value = self.read_uint64()
-        else:
+        if fb < 0xfd:
             value = fb
+        elif fb == 0xfd:
+            value = self._unpack_codec(struct_codec.UINT16)[0]
+        elif fb == 0xfe:
+            value = self._unpack_codec(struct_codec.UINT32)[0]
+        else:
+            value = self._unpack_codec(struct_codec.UINT64)[0]
         if value > max_size:
             raise SDKException(ErrorCode.param_err('Invalid format'))
-        return int(value)
+        return value
 
     def read_var_bytes(self, max_size=sys.maxsize) -> bytes:
         """
@@ -20,15 +20,33 @@ You should have received a copy of the GNU Lesser General Public License
 along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import struct
 import binascii
 from typing import Union
 
+from dna.io import struct_codec
+from dna.io.struct_codec import get_codec
 from dna.io.memory_stream import StreamManager, MemoryStream
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 
 
+def encode_var_int(value: int) -> bytes:
+    """
+    Encode an integer in the same space saving way as BinaryWriter.write_var_int, without a stream.
+    """
+    try:
+        return struct_codec.encode_var_int(value)
+    except ValueError:
+        raise SDKException(ErrorCode.param_err('%d too small.' % value)) from None
+
+
+def encode_var_bytes(value: bytes) -> bytes:
+    """
+    Encode bytes with a var int length prefix in the same way as BinaryWriter.write_var_bytes, without a stream.
+    """
+    return encode_var_int(len(value)) + bytes(value)
+
+
 class BinaryWriter(StreamManager):
     def __init__(self, stream: MemoryStream):
         """
@@ -61,7 +79,7 @@ class BinaryWriter(StreamManager):
         Write bytes by packing them according to the provided format `fmt`.
         For more information about the `fmt` format see: https://docs.python.org/3/library/struct.html
         """
-        return self.write_bytes(struct.pack(fmt, data))
+        return self.stream.write(get_codec(fmt).pack(data))
 
     def write_char(self, value):
         """
@@ -73,87 +91,55 @@ class BinaryWriter(StreamManager):
         """
         Pack the value as a signed byte and write 1 byte to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sb' % endian, value)
+        return self.stream.write(struct_codec.INT8.pack(value))
 
     def write_uint8(self, value, little_endian=True):
         """
         Pack the value as an unsigned byte and write 1 byte to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sB' % endian, value)
+        return self.stream.write(struct_codec.UINT8.pack(value))
 
     def write_bool(self, value: bool):
         """
         Pack the value as a bool and write 1 byte to the stream.
         """
-        return self.pack('?', value)
+        return self.stream.write(struct_codec.BOOL.pack(value))
 
     def write_int16(self, value, little_endian=True):
         """
         Pack the value as a signed integer and write 2 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sh' % endian, value)
+        return self.stream.write((struct_codec.INT16 if little_endian else struct_codec.INT16_BE).pack(value))
 
     def write_uint16(self, value, little_endian=True):
         """
         Pack the value as an unsigned integer and write 2 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sH' % endian, value)
+        return self.stream.write((struct_codec.UINT16 if little_endian else struct_codec.UINT16_BE).pack(value))
 
     def write_int32(self, value, little_endian=True):
         """
         Pack the value as a signed integer and write 4 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%si' % endian, value)
+        return self.stream.write((struct_codec.INT32 if little_endian else struct_codec.INT32_BE).pack(value))
 
     def write_uint32(self, value, little_endian=True):
         """
         Pack the value as an unsigned integer and write 4 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sI' % endian, value)
+        return self.stream.write((struct_codec.UINT32 if little_endian else struct_codec.UINT32_BE).pack(value))
 
     def write_int64(self, value, little_endian=True):
         """
         Pack the value as a signed integer and write 8 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sq' % endian, value)
+        return self.stream.write((struct_codec.INT64 if little_endian else struct_codec.INT64_BE).pack(value))
 
     def write_uint64(self, value, little_endian=True):
         """
         Pack the value as an unsigned integer and write 8 bytes to the stream.
         """
-        if little_endian:
-            endian = '<'
-        else:
-            endian = '>'
-        return self.pack('%sQ' % endian, value)
+        return self.stream.write((struct_codec.UINT64 if little_endian else struct_codec.UINT64_BE).pack(value))
 
     def write_var_int(self, value: int, little_endian=True):
         """
@@ -161,6 +147,8 @@ class BinaryWriter(StreamManager):
         """
         if not isinstance(value, int):
             raise SDKException(ErrorCode.param_err('%s not int type.' % value))
+        if little_endian:
+            return self.stream.write(encode_var_int(value))
 
         if value < 0:
             raise SDKException(ErrorCode.param_err('%d too small.' % value))
@@ -180,6 +168,13 @@ class BinaryWriter(StreamManager):
             self.write_byte(0xff)
             return self.write_uint64(value, little_endian)
 
+    def write_fields(self, fmt: str, *values):
+        """
+        Pack the values according to the format `fmt` in one call and write them to the stream,
+        e.g. a fixed size header.
+        """
+        return self.stream.write(get_codec(fmt).pack(*values))
+
     def write_var_bytes(self, value: bytes, little_endian: bool = True):
         """
         Write an integer value in a space saving way to the stream.
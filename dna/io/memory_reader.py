@@ -0,0 +1,142 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import mmap
+import struct
+
+from dna.io.binary_reader import BinaryReader
+from dna.io.struct_codec import get_codec
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+
+
+class MemoryReader(BinaryReader):
+    """
+    A BinaryReader over a memoryview with an integer cursor, which reads bytes, bytearray, memoryview and mmap
+    without copying them into a stream first:
+
+        tx = Transaction.deserialize(MemoryReader(tx_bytes))
+
+        with MemoryReader.open_file('blocks.dat') as reader:
+            while reader.remaining > 0:
+                block = Block.deserialize(reader)
+
+    read_bytes returns a bytes copy of the slice, and read_view returns the slice itself without copying, which
+    is only valid while the underlying buffer is. Reading beyond the end raises SDKException instead of returning
+    fewer bytes.
+    """
+
+    def __init__(self, data, offset: int = 0):
+        super().__init__(None)
+        view = memoryview(data)
+        if view.format != 'B' or view.ndim != 1:
+            view = view.cast('B')
+        self.__view = view
+        self.__mmap = None
+        self.position = offset
+
+    @staticmethod
+    def open_file(path: str):
+        """
+        Map a file into memory and return a reader over it, which should be released to close the file.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = MemoryReader(mapped)
+        reader.__mmap = mapped
+        return reader
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def release(self):
+        """
+        Release the memoryview, and close the file mapped by open_file. The views returned by read_view should
+        have been released before.
+        """
+        self.__view.release()
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+    def __len__(self):
+        return len(self.__view)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.__view) - self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, position: int):
+        if not 0 <= position <= len(self.__view):
+            raise SDKException(ErrorCode.param_err('the position is out of range.'))
+        self.position = position
+
+    def __advance(self, length: int) -> int:
+        start = self.position
+        end = start + length
+        if length < 0 or end > len(self.__view):
+            raise SDKException(ErrorCode.read_byte_error(f'expect {length} bytes, but {self.remaining} left'))
+        self.position = end
+        return start
+
+    def _unpack_codec(self, codec: struct.Struct) -> tuple:
+        return codec.unpack_from(self.__view, self.__advance(codec.size))
+
+    def unpack(self, fmt, length=1):
+        start = self.__advance(length)
+        try:
+            return get_codec(fmt).unpack(self.__view[start:start + length])[0]
+        except struct.error as e:
+            raise SDKException(ErrorCode.unpack_error(e.args[0]))
+
+    def read_byte(self, do_ord=True) -> int:
+        start = self.__advance(1)
+        if do_ord:
+            return self.__view[start]
+        return bytes(self.__view[start:start + 1])
+
+    def read_view(self, length: int) -> memoryview:
+        """
+        Read the specified number of bytes as a slice of the underlying buffer, without copying.
+        """
+        start = self.__advance(length)
+        return self.__view[start:start + length]
+
+    def read_bytes(self, length) -> bytes:
+        start = self.__advance(length)
+        return self.__view[start:start + length].tobytes()
+
+    def read_uint8(self, little_endian=True):
+        return self.__view[self.__advance(1)]
+
+    def read_var_view(self, max_size=sys.maxsize) -> memoryview:
+        """
+        Read a variable length of bytes as a slice of the underlying buffer, without copying.
+        """
+        return self.read_view(self.read_var_int(max_size))
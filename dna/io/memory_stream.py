@@ -20,11 +20,136 @@ You should have received a copy of the GNU Lesser General Public License
 along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import threading
+
 from io import BytesIO
 from binascii import hexlify
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = 64
+DEFAULT_MAX_BUFFER_SIZE = 64 * 1024
+
+
+class StreamPoolStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+        self.discards = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total != 0 else 0.0
+
+    def __iter__(self):
+        data = dict(hits=self.hits, misses=self.misses, releases=self.releases, discards=self.discards,
+                    hit_rate=self.hit_rate)
+        for key, value in data.items():
+            yield (key, value)
+
+
+class StreamPool(object):
+    """
+    A bounded pool of MemoryStream, which is safe to be shared by threads and asyncio tasks, because a stream is
+    only handed out again after it is released.
+
+    At most max_size idle streams are kept. A stream which has grown beyond max_buffer_size is dropped on release
+    rather than pooled, so that an oversized payload does not pin its buffer, and a later checkout gets a new
+    small stream. Only a stream which is checked out of the pool is accepted on release, so that releasing a stream
+    twice, or a stream which is not from the pool, never wipes or hands out a stream which another caller holds.
+    Each checkout is numbered, and the checkout context manager releases only its own checkout, so a stale release
+    of a stream which has been checked out again by another caller is ignored as well.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE):
+        if max_size < 0 or max_buffer_size <= 0:
+            raise ValueError('the size of stream pool should be positive')
+        self.max_size = max_size
+        self.max_buffer_size = max_buffer_size
+        self.__available = list()
+        self.__in_use = 0
+        self.__checkout_count = 0
+        self.__stats = StreamPoolStats()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__available)
+
+    @property
+    def in_use(self) -> int:
+        return self.__in_use
+
+    def __check_out(self, mstream) -> int:
+        with self.__lock:
+            self.__in_use += 1
+            self.__checkout_count += 1
+            mstream._pool_checkout = (self, self.__checkout_count)
+            return self.__checkout_count
+
+    def __lease(self, data=None) -> tuple:
+        with self.__lock:
+            if len(self.__available) == 0:
+                self.__stats.misses += 1
+                mstream = None
+            else:
+                self.__stats.hits += 1
+                mstream = self.__available.pop()
+        if mstream is None:
+            mstream = MemoryStream(data) if data else MemoryStream()
+        elif data is not None and len(data):
+            mstream.write(data)
+        mstream.seek(0)
+        return mstream, self.__check_out(mstream)
 
-__mstreams__ = []
-__mstreams_available__ = []
+    def get_stream(self, data=None):
+        return self.__lease(data)[0]
+
+    def release_stream(self, mstream, checkout_id: int = None):
+        """
+        Release a stream which is checked out of the pool. A stream which is not checked out, or whose checkout
+        does not match checkout_id, is ignored.
+        """
+        with self.__lock:
+            pool, current_id = getattr(mstream, '_pool_checkout', (None, None))
+            if pool is not self or (checkout_id is not None and checkout_id != current_id):
+                return
+            mstream._pool_checkout = (None, None)
+            self.__in_use -= 1
+            self.__stats.releases += 1
+        try:
+            size = mstream.seek(0, 2)
+            mstream.clean_up()
+            is_reusable = size <= self.max_buffer_size
+        except (BufferError, ValueError):
+            is_reusable = False
+        with self.__lock:
+            if not is_reusable or len(self.__available) >= self.max_size:
+                self.__stats.discards += 1
+                return
+            self.__available.append(mstream)
+
+    @contextmanager
+    def checkout(self, data=None):
+        mstream, checkout_id = self.__lease(data)
+        try:
+            yield mstream
+        finally:
+            self.release_stream(mstream, checkout_id)
+
+    def clear(self):
+        with self.__lock:
+            self.__available.clear()
+
+    def stats(self) -> dict:
+        with self.__lock:
+            data = dict(self.__stats)
+            data['size'] = len(self.__available)
+            data['in_use'] = self.__in_use
+            return data
+
+
+__stream_pool__ = StreamPool()
 
 
 class StreamManager:
@@ -32,12 +157,12 @@ class StreamManager:
     @staticmethod
     def TotalBuffers():
         """
-        Get the total number of buffers stored in the StreamManager.
+        Get the total number of buffers which are idle in or checked out of the pool.
 
         Returns:
             int:
         """
-        return len(__mstreams__)
+        return len(__stream_pool__) + __stream_pool__.in_use
 
     @staticmethod
     def get_stream(data=None):
@@ -50,24 +175,7 @@ class StreamManager:
         Returns:
             MemoryStream: instance.
         """
-        if len(__mstreams_available__) == 0:
-            if data:
-                mstream = MemoryStream(data)
-                mstream.seek(0)
-            else:
-                mstream = MemoryStream()
-            __mstreams__.append(mstream)
-            return mstream
-
-        mstream = __mstreams_available__.pop()
-
-        if data is not None and len(data):
-            mstream.clean_up()
-            mstream.write(data)
-
-        mstream.seek(0)
-
-        return mstream
+        return __stream_pool__.get_stream(data)
 
     @staticmethod
     def release_stream(mstream):
@@ -76,8 +184,25 @@ class StreamManager:
         Args:
             mstream (MemoryStream): instance.
         """
-        mstream.clean_up()
-        __mstreams_available__.append(mstream)
+        __stream_pool__.release_stream(mstream)
+
+    @staticmethod
+    def checkout(data=None):
+        """
+        Get a MemoryStream instance which is released when the with block exits.
+
+        Usage:
+            with StreamManager.checkout() as ms:
+                writer = BinaryWriter(ms)
+        """
+        return __stream_pool__.checkout(data)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        Get the hit rate and the other statistics of the stream pool.
+        """
+        return __stream_pool__.stats()
 
 
 class MemoryStream(BytesIO):
@@ -98,6 +223,7 @@ class MemoryStream(BytesIO):
             **kwargs:
         """
         super().__init__(*args, **kwargs)
+        self._pool_checkout = (None, None)
 
     def readable(self):
         """
@@ -0,0 +1,73 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import struct
+
+from functools import lru_cache
+
+INT8 = struct.Struct('<b')
+UINT8 = struct.Struct('<B')
+INT16 = struct.Struct('<h')
+UINT16 = struct.Struct('<H')
+INT32 = struct.Struct('<i')
+UINT32 = struct.Struct('<I')
+INT64 = struct.Struct('<q')
+UINT64 = struct.Struct('<Q')
+INT16_BE = struct.Struct('>h')
+UINT16_BE = struct.Struct('>H')
+INT32_BE = struct.Struct('>i')
+UINT32_BE = struct.Struct('>I')
+INT64_BE = struct.Struct('>q')
+UINT64_BE = struct.Struct('>Q')
+BOOL = struct.Struct('?')
+CHAR = struct.Struct('c')
+FLOAT = struct.Struct('<f')
+FLOAT_BE = struct.Struct('>f')
+DOUBLE = struct.Struct('<d')
+DOUBLE_BE = struct.Struct('>d')
+
+VAR_INT_UINT16 = struct.Struct('<BH')
+VAR_INT_UINT32 = struct.Struct('<BI')
+VAR_INT_UINT64 = struct.Struct('<BQ')
+
+
+@lru_cache(maxsize=256)
+def get_codec(fmt: str) -> struct.Struct:
+    """
+    Return the precompiled struct.Struct of a format, which is cached to avoid parsing the format on every call.
+    """
+    return struct.Struct(fmt)
+
+
+def encode_var_int(value: int) -> bytes:
+    """
+    Encode an integer in the space saving way of BinaryWriter.write_var_int.
+    """
+    if value < 0xfd:
+        if value < 0:
+            raise ValueError(f'{value} too small.')
+        return bytes((value,))
+    if value <= 0xffff:
+        return VAR_INT_UINT16.pack(0xfd, value)
+    if value <= 0xffffffff:
+        return VAR_INT_UINT32.pack(0xfe, value)
+    return VAR_INT_UINT64.pack(0xff, value)
@@ -20,10 +20,10 @@ You should have received a copy of the GNU Lesser General Public License
 along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import json
 import asyncio
 
 from typing import List
+from urllib.parse import urlsplit
 
 from aiohttp import client_exceptions
 from aiohttp.client import ClientSession
@@ -32,59 +32,156 @@ from dna.core.transaction import Transaction
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
 from dna.network.restful import Restful, RestfulMethod
-
-
-class AioRestful(Restful):
-    def __init__(self, url: str = '', session: ClientSession = None):
-        super().__init__(url)
-        self.__session = session
+from dna.network.cache import ResponseCache
+from dna.network.hedge import HedgePolicy
+from dna.network.fetcher import AioRangeFetcher
+from dna.network.singleflight import SingleFlight
+from dna.network.throttle import Throttle, ThrottleSlot
+from dna.network.retry import RetryPolicy
+from dna.network.metrics import Instrumentation, InstrumentSlot
+from dna.network.session import AioPooledSession, DEFAULT_AIO_LIMIT, DEFAULT_KEEP_ALIVE_TIMEOUT, DEFAULT_TIMEOUT
+
+
+class AioRestful(Restful, AioRangeFetcher):
+    def __init__(self, url: str = '', session: ClientSession = None, limit: int = DEFAULT_AIO_LIMIT,
+                 limit_per_host: int = 0, keepalive_timeout: float = DEFAULT_KEEP_ALIVE_TIMEOUT,
+                 hedge_policy: HedgePolicy = None, cache: ResponseCache = None, coalesce: bool = True,
+                 throttle: Throttle = None, timeout: float = DEFAULT_TIMEOUT, retry_policy: RetryPolicy = None,
+                 instrumentation: Instrumentation = None):
+        super().__init__(url, cache=cache, throttle=throttle, timeout=timeout, retry_policy=retry_policy,
+                         instrumentation=instrumentation)
+        self._aio_http = AioPooledSession(session, limit, limit_per_host, keepalive_timeout)
+        self._hedge_policy = hedge_policy
+        self._single_flight = SingleFlight() if coalesce else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        This interface is used to close the session owned by the client.
+        """
+        await self._aio_http.close()
 
     @property
     def session(self):
-        return self.__session
+        return self._aio_http.session
 
     @session.setter
     def session(self, session: ClientSession):
         if not isinstance(session, ClientSession):
             raise SDKException(ErrorCode.param_error)
-        self.__session = session
+        self._aio_http.session = session
+
+    @property
+    def hedge_policy(self):
+        return self._hedge_policy
+
+    @hedge_policy.setter
+    def hedge_policy(self, hedge_policy: HedgePolicy):
+        if hedge_policy is not None and not isinstance(hedge_policy, HedgePolicy):
+            raise SDKException(ErrorCode.param_error)
+        self._hedge_policy = hedge_policy
+
+    @property
+    def single_flight(self):
+        return self._single_flight
+
+    async def __hedge(self, url: str, send):
+        path = url[len(self._url):]
+        return await self._hedge_policy.request(self.get_path_key(path),
+                                                lambda address: send(address + path, self.__get_throttle(address)),
+                                                self._url)
+
+    def __get_throttle(self, address: str) -> Throttle or None:
+        if address == self._url:
+            return self._throttle
+        return self._hedge_policy.get_throttle(address)
+
+    async def _aio_call(self, method: str, send, on_duplicate=None):
+        if self._retry_policy is None:
+            return await send(self._timeout)
+        return await self._retry_policy.aio_call(self._url, method, send, self._timeout, on_duplicate,
+                                                 self._get_retry_hook(method))
 
     async def __post(self, url: str, data: str):
-        try:
-            if self.__session is None:
-                async with ClientSession() as session:
-                    async with session.post(url, data=data, timeout=10) as response:
-                        res = json.loads(await response.content.read(-1))
+        method = self._get_retry_method(url)
+        return await self._aio_call(method, lambda timeout: self.__request_post(url, data, timeout),
+                                    lambda: self._get_duplicated_tx_response(data))
+
+    async def __request_post(self, url: str, data: str, timeout: float):
+        if self._hedge_policy is not None and url == RestfulMethod.send_transaction_pre_exec(self._url):
+            res = await self.__hedge(url, lambda hedge_url, throttle: self.__send_post(hedge_url, data, timeout,
+                                                                                        throttle))
+        else:
+            res = await self.__send_post(url, data, timeout, self._throttle)
+        if res['Error'] != 0:
+            if res['Result'] != '':
+                raise SDKException(ErrorCode.other_error(res['Result']))
             else:
-                async with self.__session.post(url, data=data, timeout=10) as response:
-                    res = json.loads(await response.content.read(-1))
-            if res['Error'] != 0:
-                if res['Result'] != '':
-                    raise SDKException(ErrorCode.other_error(res['Result']))
-                else:
-                    raise SDKException(ErrorCode.other_error(res['Desc']))
-            return res
-        except (asyncio.TimeoutError, client_exceptions.ClientConnectorError):
-            raise SDKException(ErrorCode.connect_timeout(self._url)) from None
+                raise SDKException(ErrorCode.other_error(res['Desc']))
+        return res
 
     async def __get(self, url):
-        try:
-            if self.__session is None:
-                async with ClientSession() as session:
-
-                    async with session.get(url, timeout=10) as response:
-                        res = json.loads(await response.content.read(-1))
+        method = self._get_cache_method(url)
+        if method is not None:
+            is_hit, res = await self._cache.aio_get(method, url)
+            if is_hit:
+                return res
+        if self._single_flight is not None:
+            res = await self._single_flight.request(url, lambda: self.__retry_get(url))
+        else:
+            res = await self.__retry_get(url)
+        await self._aio_put_cache(method, url, res)
+        return res
+
+    async def __retry_get(self, url):
+        return await self._aio_call(self.get_path_key(url[len(self._url):]),
+                                    lambda timeout: self.__request_get(url, timeout))
+
+    async def __request_get(self, url, timeout: float):
+        if self._hedge_policy is not None:
+            res = await self.__hedge(url, lambda hedge_url, throttle: self.__send_get(hedge_url, timeout, throttle))
+        else:
+            res = await self.__send_get(url, timeout, self._throttle)
+        if res['Error'] != 0:
+            if res['Result'] != '':
+                raise SDKException(ErrorCode.other_error(res['Result']))
             else:
-                async with self.__session.get(url, timeout=10) as response:
-                    res = json.loads(await response.content.read(-1))
-            if res['Error'] != 0:
-                if res['Result'] != '':
-                    raise SDKException(ErrorCode.other_error(res['Result']))
-                else:
-                    raise SDKException(ErrorCode.other_error(res['Desc']))
-            return res
-        except (asyncio.TimeoutError, client_exceptions.ClientConnectorError):
-            raise SDKException(ErrorCode.connect_timeout(self._url)) from None
+                raise SDKException(ErrorCode.other_error(res['Desc']))
+        return res
+
+    async def __send_post(self, url: str, data: str, timeout: float, throttle: Throttle or None):
+        method = self._get_retry_method(url)
+        async with ThrottleSlot(throttle), InstrumentSlot(self._instrumentation, 'restful', method, url) as info:
+            info.request_bytes = len(data)
+            try:
+                session = await self._aio_http.get_session()
+                async with session.post(url, data=data, timeout=timeout) as response:
+                    content = await response.content.read(-1)
+            except (asyncio.TimeoutError, client_exceptions.ClientConnectionError):
+                raise SDKException(ErrorCode.connect_timeout(url)) from None
+            info.response_bytes = len(content)
+            response = info.decode(content)
+            info.node_error = response.get('Error', 0)
+            return response
+
+    async def __send_get(self, url: str, timeout: float, throttle: Throttle or None):
+        method = self.get_path_key(urlsplit(url).path)
+        async with ThrottleSlot(throttle), InstrumentSlot(self._instrumentation, 'restful', method, url) as info:
+            try:
+                session = await self._aio_http.get_session()
+                async with session.get(url, timeout=timeout) as response:
+                    content = await response.content.read(-1)
+            except (asyncio.TimeoutError, client_exceptions.ClientConnectionError):
+                raise SDKException(ErrorCode.connect_timeout(url)) from None
+            info.response_bytes = len(content)
+            response = info.decode(content)
+            info.node_error = response.get('Error', 0)
+            return response
 
     async def get_version(self, is_full: bool = False):
         url = RestfulMethod.get_version(self._url)
@@ -132,14 +229,14 @@ class AioRestful(Restful):
 
     async def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
         response = await self.get_block_height_by_tx_hash(tx_hash, is_full=True)
-        response['Result'] += 1
+        response = dict(response, Result=response['Result'] + 1)
         if is_full:
             return response
         return response['Result']
 
     async def get_block_count(self, is_full: bool = False) -> int or dict:
         response = await self.get_block_height(is_full=True)
-        response['Result'] += 1
+        response = dict(response, Result=response['Result'] + 1)
         if is_full:
             return response
         return response['Result']
@@ -159,6 +256,20 @@ class AioRestful(Restful):
             return response
         return response['Result']
 
+    async def get_raw_block_by_height(self, height: int, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_block_by_height(self._url, height)
+        response = await self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
+    async def get_raw_block_by_hash(self, block_hash: str, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_block_by_hash(self._url, block_hash)
+        response = await self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
     async def get_balance(self, b58_address: str, is_full: bool = False):
         url = RestfulMethod.get_account_balance(self._url, b58_address)
         response = await self.__get(url)
@@ -221,6 +332,13 @@ class AioRestful(Restful):
             return response
         return response['Result']
 
+    async def get_raw_transaction(self, tx_hash: str, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_transaction(self._url, tx_hash)
+        response = await self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
     async def send_raw_transaction(self, tx: Transaction, is_full: bool = False):
         hex_tx_data = tx.serialize(is_hex=True)
         data = f'{{"Action":"sendrawtransaction", "Version":"1.0.0","Data":"{hex_tx_data}"}}'
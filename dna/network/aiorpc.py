@@ -23,14 +23,14 @@ along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 import json
 import asyncio
 
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from aiohttp import client_exceptions
 from aiohttp.client import ClientSession
 
 from dna.contract.neo.vm import NeoVm
 from dna.account.account import Account
-from dna.network.rpc import Rpc, RpcMethod
+from dna.network.rpc import Rpc, RpcMethod, DEFAULT_MAX_BATCH_SIZE
 from dna.core.transaction import Transaction, TxType
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
@@ -38,42 +38,148 @@ from dna.utils.transaction import ensure_bytearray_contract_address
 from dna.contract.neo.abi.abi_function import AbiFunction
 from dna.vm.build_params import BuildParams
 from dna.contract.neo.invoke_function import NeoInvokeFunction
+from dna.network.cache import ResponseCache
+from dna.network.hedge import HedgePolicy
+from dna.network.fetcher import AioRangeFetcher
+from dna.network.singleflight import SingleFlight
+from dna.network.throttle import Throttle, ThrottleSlot
+from dna.network.retry import RetryPolicy
+from dna.network.metrics import Instrumentation, InstrumentSlot
+from dna.network.session import AioPooledSession, DEFAULT_AIO_LIMIT, DEFAULT_KEEP_ALIVE_TIMEOUT, DEFAULT_TIMEOUT
 
 
-class AioRpc(Rpc):
-    def __init__(self, url: str = '', qid: int = 0, session: ClientSession = None):
-        super().__init__(url, qid)
-        self._session = session
+class AioRpc(Rpc, AioRangeFetcher):
+    def __init__(self, url: str = '', qid: int = 0, session: ClientSession = None, limit: int = DEFAULT_AIO_LIMIT,
+                 limit_per_host: int = 0, keepalive_timeout: float = DEFAULT_KEEP_ALIVE_TIMEOUT,
+                 hedge_policy: HedgePolicy = None, cache: ResponseCache = None, coalesce: bool = True,
+                 throttle: Throttle = None, timeout: float = DEFAULT_TIMEOUT, retry_policy: RetryPolicy = None,
+                 instrumentation: Instrumentation = None):
+        super().__init__(url, qid, cache=cache, throttle=throttle, timeout=timeout, retry_policy=retry_policy,
+                         instrumentation=instrumentation)
+        self._aio_http = AioPooledSession(session, limit, limit_per_host, keepalive_timeout)
+        self._hedge_policy = hedge_policy
+        self._single_flight = SingleFlight() if coalesce else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        This interface is used to close the session owned by the client.
+        """
+        await self._aio_http.close()
 
     @property
     def session(self):
-        return self._session
+        return self._aio_http.session
 
     @session.setter
     def session(self, session: ClientSession):
         if not isinstance(session, ClientSession):
             raise SDKException(ErrorCode.param_error)
-        self._session = session
+        self._aio_http.session = session
+
+    @property
+    def hedge_policy(self):
+        return self._hedge_policy
+
+    @hedge_policy.setter
+    def hedge_policy(self, hedge_policy: HedgePolicy):
+        if hedge_policy is not None and not isinstance(hedge_policy, HedgePolicy):
+            raise SDKException(ErrorCode.param_error)
+        self._hedge_policy = hedge_policy
+
+    @property
+    def single_flight(self):
+        return self._single_flight
+
+    @staticmethod
+    def is_idempotent_payload(payload: dict) -> bool:
+        method = payload.get('method')
+        if method == RpcMethod.SEND_TRANSACTION:
+            params = payload.get('params', list())
+            return len(params) > 1 and params[1] == 1
+        return method != RpcMethod.SEND_EMERGENCY_GOV_REQ
+
+    async def _aio_call(self, method: str, send, on_duplicate=None):
+        if self._retry_policy is None:
+            return await send(self._timeout)
+        return await self._retry_policy.aio_call(self._url, method, send, self._timeout, on_duplicate,
+                                                 self._get_retry_hook('rpc', method))
+
+    async def __send(self, payload, timeout: float, url: str = ''):
+        if not url or url == self._url:
+            url, throttle = self._url, self._throttle
+        else:
+            throttle = self._hedge_policy.get_throttle(url)
+        method = self._get_retry_method(payload) if isinstance(payload, dict) else 'batch'
+        async with ThrottleSlot(throttle), InstrumentSlot(self._instrumentation, 'rpc', method, url) as info:
+            header = {'Content-type': 'application/json'}
+            data = json.dumps(payload)
+            info.request_bytes = len(data)
+            try:
+                session = await self._aio_http.get_session()
+                async with session.post(url, data=data, headers=header, timeout=timeout) as response:
+                    content = await response.content.read(-1)
+            except (asyncio.TimeoutError, client_exceptions.ClientConnectionError):
+                raise SDKException(ErrorCode.connect_timeout(url)) from None
+            info.response_bytes = len(content)
+            content = info.decode(content)
+            if isinstance(content, dict):
+                info.node_error = content.get('error', 0)
+            return content
 
     async def __post(self, payload):
-        header = {'Content-type': 'application/json'}
-        try:
-            if self._session is None:
-                async with ClientSession() as session:
-                    async with session.post(self._url, json=payload, headers=header, timeout=10) as response:
-                        res = json.loads(await response.content.read(-1))
+        key = self._get_cache_key(self._url, payload)
+        if key is not None:
+            is_hit, res = await self._cache.aio_get(payload['method'], key)
+            if is_hit:
+                return res
+        if self._single_flight is not None and self.is_idempotent_payload(payload):
+            flight_key = ResponseCache.get_rpc_key(self._url, payload)
+            res = await self._single_flight.request(flight_key, lambda: self.__retry(payload))
+        else:
+            res = await self.__retry(payload)
+        await self._aio_put_cache(key, payload, res)
+        return res
+
+    async def __retry(self, payload):
+        return await self._aio_call(self._get_retry_method(payload), lambda timeout: self.__request(payload, timeout),
+                                    lambda: self._get_duplicated_tx_response(payload))
+
+    async def __request(self, payload, timeout: float):
+        if self._hedge_policy is not None and self.is_idempotent_payload(payload):
+            res = await self._hedge_policy.request(payload['method'], lambda url: self.__send(payload, timeout, url),
+                                                   self._url)
+        else:
+            res = await self.__send(payload, timeout)
+        if res['error'] != 0:
+            if res['result'] != '':
+                raise SDKException(ErrorCode.other_error(res['result']))
             else:
-                async with self._session.post(self._url, json=payload, headers=header, timeout=10) as response:
-                    res = json.loads(await response.content.read(-1))
-            if res['error'] != 0:
-                if res['result'] != '':
-                    raise SDKException(ErrorCode.other_error(res['result']))
-                else:
-                    raise SDKException(ErrorCode.other_error(res['desc']))
-        except (asyncio.TimeoutError, client_exceptions.ClientConnectorError):
-            raise SDKException(ErrorCode.connect_timeout(self._url)) from None
+                raise SDKException(ErrorCode.other_error(res['desc']))
         return res
 
+    async def batch(self, calls: List[Union[str, Tuple[str, list]]], max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                    is_full: bool = False) -> list:
+        """
+        This interface is used to send a list of calls in JSON-RPC 2.0 batch requests.
+        The batches split by max_batch_size are sent concurrently.
+        """
+        batch_payload_list = self.generate_json_rpc_batch_payload(calls, max_batch_size)
+        batch_response_list = await asyncio.gather(*[self.__send_batch(payload) for payload in batch_payload_list])
+        result_list = list()
+        for batch_payload, batch_response in zip(batch_payload_list, batch_response_list):
+            result_list.extend(self.parse_json_rpc_batch_response(batch_payload, batch_response, is_full))
+        return result_list
+
+    async def __send_batch(self, batch_payload: List[dict]):
+        method = self._get_batch_retry_method(batch_payload)
+        return await self._aio_call(method, lambda timeout: self.__send(batch_payload, timeout))
+
     async def get_version(self, is_full: bool = False):
         """
         This interface is used to get the version information of the connected node in current network.
@@ -140,6 +246,26 @@ class AioRpc(Rpc):
             return response
         return response['result']
 
+    async def get_raw_block_by_height(self, height: int, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized block by block height in current network.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_BLOCK, [height, 0])
+        response = await self.__post(payload)
+        if is_full:
+            return response
+        return response['result']
+
+    async def get_raw_block_by_hash(self, block_hash: str, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized block by block hash in current network.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_BLOCK, [block_hash, 0])
+        response = await self.__post(payload)
+        if is_full:
+            return response
+        return response['result']
+
     async def get_block_count(self, is_full: bool = False) -> int or dict:
         """
         This interface is used to get the decimal block number in current network.
@@ -155,7 +281,7 @@ class AioRpc(Rpc):
         This interface is used to get the decimal block height in current network.
         """
         response = await self.get_block_count(is_full=True)
-        response['result'] -= 1
+        response = dict(response, result=response['result'] - 1)
         if is_full:
             return response
         return response['result']
@@ -171,7 +297,7 @@ class AioRpc(Rpc):
 
     async def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
         response = await self.get_block_height_by_tx_hash(tx_hash, is_full=True)
-        response['result'] += 1
+        response = dict(response, result=response['result'] + 1)
         if is_full:
             return response
         return response['result']
@@ -278,6 +404,16 @@ class AioRpc(Rpc):
         result = response['result']
         return dict() if result is None else result
 
+    async def get_raw_transaction(self, tx_hash: str, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized transaction based on the specified hash value.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_TRANSACTION, [tx_hash, 0])
+        response = await self.__post(payload)
+        if is_full:
+            return response
+        return response['result']
+
     async def get_contract(self, hex_contract_address: str, is_full: bool = False) -> dict:
         """
         This interface is used to get the information of smart contract based on the specified hexadecimal hash value.
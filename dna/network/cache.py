@@ -0,0 +1,199 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import threading
+
+from time import monotonic
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_TTL = 5
+
+# The cache policy of a method is the time to live of its responses in seconds, and None means that the responses
+# never change and are only evicted by the size bound. The methods which are not in the policies are not cached.
+DEFAULT_CACHE_POLICIES = {
+    'getblock': None,
+    'getrawtransaction': None,
+    'getblockhash': None,
+    'getblockheightbytxhash': None,
+    'getsmartcodeevent': None,
+    'getmerkleproof': None,
+    'getcontractstate': None,
+    'getnetworkid': None,
+    'getgasprice': DEFAULT_TTL,
+    'getbalance': DEFAULT_TTL,
+    'getallowance': DEFAULT_TTL,
+    'getunboundong': DEFAULT_TTL,
+    'getgrantong': DEFAULT_TTL,
+    'getstorage': DEFAULT_TTL,
+    '/api/v1/block/details/height/{}': None,
+    '/api/v1/block/details/hash/{}': None,
+    '/api/v1/transaction/{}': None,
+    '/api/v1/block/height/txhash/{}': None,
+    '/api/v1/smartcode/event/transactions/{}': None,
+    '/api/v1/smartcode/event/txhash/{}': None,
+    '/api/v1/merkleproof/{}': None,
+    '/api/v1/contract/{}': None,
+    '/api/v1/networkid': None,
+    '/api/v1/gasprice': DEFAULT_TTL,
+    '/api/v1/balance/{}': DEFAULT_TTL,
+    '/api/v1/allowance/{}/{}/{}': DEFAULT_TTL,
+    '/api/v1/unboundong/{}': DEFAULT_TTL,
+    '/api/v1/grantong/{}': DEFAULT_TTL,
+    '/api/v1/storage/{}/{}': DEFAULT_TTL,
+}
+
+
+class CacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total != 0 else 0.0
+
+    def __iter__(self):
+        data = dict(hits=self.hits, misses=self.misses, evictions=self.evictions, expirations=self.expirations,
+                    hit_rate=self.hit_rate)
+        for key, value in data.items():
+            yield (key, value)
+
+
+class ResponseCache(object):
+    """
+    A size bounded LRU cache of the responses of the network clients.
+
+    The responses of the methods which have a None policy, e.g. blocks and transactions, are kept until they are
+    evicted, and the responses of the mutable methods, e.g. balances, expire after their time to live. Empty results
+    and errors are never cached. The responses are stored as JSON text, so that every hit returns a new copy which
+    the caller is free to modify.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, policies: dict = None):
+        if max_size <= 0:
+            raise SDKException(ErrorCode.param_err('the max size of cache should be greater than zero.'))
+        self.max_size = max_size
+        self.policies = dict(DEFAULT_CACHE_POLICIES)
+        if policies is not None:
+            self.policies.update(policies)
+        self.__entries = OrderedDict()
+        self.__stats = dict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def is_cacheable(self, method: str) -> bool:
+        if method not in self.policies:
+            return False
+        ttl = self.policies[method]
+        return ttl is None or ttl > 0
+
+    @staticmethod
+    def get_rpc_key(url: str, payload: dict) -> str:
+        return f"{url}|{payload['method']}|{json.dumps(payload.get('params', list()))}"
+
+    @staticmethod
+    def is_empty_result(result) -> bool:
+        return result is None or result == '' or result == list() or result == dict()
+
+    def __get_stats(self, method: str) -> CacheStats:
+        stats = self.__stats.get(method)
+        if stats is None:
+            stats = CacheStats()
+            self.__stats[method] = stats
+        return stats
+
+    def get(self, method: str, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a response, and return a tuple of whether it is hit and the response.
+        """
+        with self.__lock:
+            stats = self.__get_stats(method)
+            entry = self.__entries.get(key)
+            if entry is not None:
+                _, expire_time, data = entry
+                if expire_time is None or monotonic() < expire_time:
+                    self.__entries.move_to_end(key)
+                    stats.hits += 1
+                    return True, json.loads(data)
+                del self.__entries[key]
+                stats.expirations += 1
+            stats.misses += 1
+            return False, None
+
+    def put(self, method: str, key: str, value):
+        self._put_data(method, key, json.dumps(value, separators=(',', ':')))
+
+    async def aio_get(self, method: str, key: str) -> Tuple[bool, Any]:
+        """
+        The get of the async clients, which is overridden by the caches that could block the event loop.
+        """
+        return self.get(method, key)
+
+    async def aio_put(self, method: str, key: str, value):
+        self.put(method, key, value)
+
+    def _put_data(self, method: str, key: str, data: str):
+        """
+        Store a response which has been serialized into JSON text.
+        """
+        if not self.is_cacheable(method):
+            return
+        ttl = self.policies[method]
+        expire_time = None if ttl is None else monotonic() + ttl
+        with self.__lock:
+            self.__entries[key] = (method, expire_time, data)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                _, (evicted_method, _, _) = self.__entries.popitem(last=False)
+                self.__get_stats(evicted_method).evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the statistics of each method, together with the total under the key 'total'.
+        """
+        with self.__lock:
+            total = CacheStats()
+            data = dict()
+            for method, stats in self.__stats.items():
+                total.hits += stats.hits
+                total.misses += stats.misses
+                total.evictions += stats.evictions
+                total.expirations += stats.expirations
+                data[method] = dict(stats)
+            data['total'] = dict(total)
+            data['total']['size'] = len(self.__entries)
+            return data
@@ -0,0 +1,310 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import inspect
+import threading
+
+from time import monotonic
+from typing import List, Union, Callable
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+
+CONNECTION_ERROR_CODES = (ErrorCode.connect_timeout('')['error'], ErrorCode.connect_err('')['error'],
+                          ErrorCode.circuit_breaker_open('')['error'])
+
+
+def is_read_only(method_name: str) -> bool:
+    """
+    Whether a network client method only reads chain data and can be safely sent to another node.
+    """
+    return method_name.startswith('get_') or method_name.endswith('_pre_exec')
+
+
+def is_connection_error(e: Exception) -> bool:
+    return isinstance(e, SDKException) and len(e.args) > 0 and e.args[0] in CONNECTION_ERROR_CODES
+
+
+class CircuitBreaker(object):
+    """
+    Fail fast on calls to a dead node instead of waiting for a timeout on each one.
+
+    After failure_threshold consecutive connection errors the breaker opens for reset_timeout seconds, doubled on
+    each further failure up to max_reset_timeout. When the timeout expires one trial call is let through, and the
+    breaker closes on its success.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0, max_reset_timeout: float = 60.0):
+        if failure_threshold <= 0:
+            raise SDKException(ErrorCode.param_err('the failure threshold should be greater than zero.'))
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.rejected = 0
+        self.__failures = 0
+        self.__open_until = 0.0
+        self.__lock = threading.Lock()
+
+    @property
+    def failures(self) -> int:
+        return self.__failures
+
+    @property
+    def state(self) -> str:
+        if self.__failures < self.failure_threshold:
+            return self.CLOSED
+        if self.is_open(monotonic()):
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def is_open(self, now: float) -> bool:
+        return self.__failures >= self.failure_threshold and now < self.__open_until
+
+    def __get_reset_timeout(self) -> float:
+        return min(self.max_reset_timeout, self.reset_timeout * 2 ** (self.__failures - self.failure_threshold))
+
+    def allow(self) -> bool:
+        with self.__lock:
+            if self.__failures < self.failure_threshold:
+                return True
+            now = monotonic()
+            if now < self.__open_until:
+                self.rejected += 1
+                return False
+            # let one trial call through, and hold the others until it succeeds or the timeout expires again.
+            self.__open_until = now + self.__get_reset_timeout()
+            return True
+
+    def on_success(self):
+        with self.__lock:
+            self.__failures = 0
+            self.__open_until = 0.0
+
+    def on_failure(self):
+        with self.__lock:
+            self.__failures += 1
+            if self.__failures >= self.failure_threshold:
+                self.__open_until = monotonic() + self.__get_reset_timeout()
+
+
+class Endpoint(object):
+    """
+    The health and latency score of one node in an endpoint group.
+    """
+
+    def __init__(self, client, breaker: CircuitBreaker):
+        self.client = client
+        self.breaker = breaker
+        self.latency = None
+        self.in_flight = 0
+
+    @property
+    def address(self) -> str:
+        return self.client.get_address()
+
+    @property
+    def failures(self) -> int:
+        return self.breaker.failures
+
+    def is_available(self, now: float) -> bool:
+        return not self.breaker.is_open(now)
+
+    def score(self) -> float:
+        if self.latency is None:
+            return 0.0
+        return self.latency * (self.in_flight + 1)
+
+    def __repr__(self):
+        return f'Endpoint({self.address!r}, latency={self.latency}, failures={self.failures})'
+
+
+class EndpointSelector(object):
+    """
+    Rank nodes by EWMA latency and in-flight requests, and eject failing nodes with a circuit breaker.
+
+    Each node has its own CircuitBreaker: after failure_threshold consecutive connection errors, the node is skipped
+    for open_timeout seconds, doubled on each further failure up to max_open_timeout. When the timeout expires the
+    node is ranked again, and one more connection error opens its breaker again.
+    """
+
+    def __init__(self, clients: list, ewma_alpha: float = 0.3, failure_threshold: int = 3,
+                 open_timeout: float = 5.0, max_open_timeout: float = 120.0):
+        if len(clients) == 0:
+            raise SDKException(ErrorCode.param_err('at least one client is required.'))
+        self.endpoints = [Endpoint(client, CircuitBreaker(failure_threshold, open_timeout, max_open_timeout))
+                          for client in clients]
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.open_timeout = open_timeout
+        self.max_open_timeout = max_open_timeout
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[Endpoint]:
+        now = monotonic()
+        with self._lock:
+            available = [endpoint for endpoint in self.endpoints if endpoint.is_available(now)]
+            return sorted(available, key=Endpoint.score)
+
+    def best(self) -> Endpoint:
+        candidates = self.candidates()
+        if len(candidates) == 0:
+            raise SDKException(ErrorCode.no_available_endpoint)
+        return candidates[0]
+
+    def acquire(self, endpoint: Endpoint) -> float:
+        with self._lock:
+            endpoint.in_flight += 1
+        return monotonic()
+
+    def release(self, endpoint: Endpoint, start: float, error: Exception = None, is_completed: bool = True):
+        elapsed = monotonic() - start
+        with self._lock:
+            endpoint.in_flight -= 1
+            if not is_completed:
+                return
+            if is_connection_error(error):
+                endpoint.breaker.on_failure()
+                return
+            endpoint.breaker.on_success()
+            if endpoint.latency is None:
+                endpoint.latency = elapsed
+            else:
+                endpoint.latency = self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * endpoint.latency
+
+
+class EndpointGroup(object):
+    """
+    A client over several Rpc or Restful nodes which exposes the same interface as one client.
+
+    Each call is routed to the best ranked node. Read-only calls which fail with a connection error
+    are transparently retried on the next node.
+
+        rpc = EndpointGroup.from_addresses(TEST_RPC_ADDRESS, Rpc)
+        height = rpc.get_block_height()
+    """
+
+    def __init__(self, clients: list, max_attempts: int = 0, **kwargs):
+        self._selector = EndpointSelector(clients, **kwargs)
+        self._max_attempts = max_attempts
+
+    @classmethod
+    def from_addresses(cls, addresses: List[str], client_cls: Callable, max_attempts: int = 0, **kwargs):
+        return cls([client_cls(address) for address in addresses], max_attempts, **kwargs)
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return self._selector.endpoints
+
+    def get_address(self) -> str:
+        return self._selector.best().address
+
+    def close(self):
+        """
+        This interface is used to close all clients in the group. It returns an awaitable for async clients.
+        """
+        results = [endpoint.client.close() for endpoint in self._selector.endpoints]
+        awaitable_list = [result for result in results if inspect.isawaitable(result)]
+        if len(awaitable_list) != 0:
+            return asyncio.gather(*awaitable_list)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _attempts(self, method_name: str) -> List[Endpoint]:
+        candidates = self._selector.candidates()
+        if len(candidates) == 0:
+            raise SDKException(ErrorCode.no_available_endpoint)
+        if not is_read_only(method_name):
+            return candidates[:1]
+        if self._max_attempts > 0:
+            return candidates[:self._max_attempts]
+        return candidates
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._selector.endpoints[0].client, name)
+        if not callable(attr):
+            return attr
+        if inspect.iscoroutinefunction(attr):
+            return self._make_async_call(name)
+        return self._make_call(name)
+
+    def _make_call(self, name: str):
+        def call(*args, **kwargs):
+            error = None
+            for endpoint in self._attempts(name):
+                start = self._selector.acquire(endpoint)
+                try:
+                    result = getattr(endpoint.client, name)(*args, **kwargs)
+                except SDKException as e:
+                    self._selector.release(endpoint, start, e)
+                    if not is_connection_error(e):
+                        raise
+                    error = e
+                    continue
+                except BaseException:
+                    self._selector.release(endpoint, start, is_completed=False)
+                    raise
+                self._selector.release(endpoint, start)
+                return result
+            raise error
+
+        call.__name__ = name
+        return call
+
+    def _make_async_call(self, name: str):
+        async def call(*args, **kwargs):
+            error = None
+            for endpoint in self._attempts(name):
+                start = self._selector.acquire(endpoint)
+                try:
+                    result = await getattr(endpoint.client, name)(*args, **kwargs)
+                except SDKException as e:
+                    self._selector.release(endpoint, start, e)
+                    if not is_connection_error(e):
+                        raise
+                    error = e
+                    continue
+                except BaseException:
+                    self._selector.release(endpoint, start, is_completed=False)
+                    raise
+                self._selector.release(endpoint, start)
+                return result
+            raise error
+
+        call.__name__ = name
+        return call
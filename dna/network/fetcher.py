@@ -0,0 +1,119 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+
+from typing import Callable, Awaitable, AsyncIterator, Tuple, Any
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.endpoint import is_connection_error
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_BUFFER_SIZE = 256
+
+
+async def fetch_with_retry(fetch: Callable[[int], Awaitable], height: int, max_retries: int = 3,
+                           retry_delay: float = 0.5):
+    """
+    Fetch the data of a height, and retry with exponential backoff when a connection error is raised. Other errors,
+    e.g. an error returned by the node, are raised immediately.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fetch(height)
+        except SDKException as e:
+            if attempt >= max_retries or not is_connection_error(e):
+                raise
+        await asyncio.sleep(retry_delay * 2 ** attempt)
+        attempt += 1
+
+
+async def fetch_range(fetch: Callable[[int], Awaitable], start: int, end: int,
+                      concurrency: int = DEFAULT_CONCURRENCY, max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+                      max_retries: int = 3, retry_delay: float = 0.5) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Fetch the heights in range(start, end) with at most `concurrency` requests in flight,
+    and yield (height, result) in height order through a reorder buffer.
+
+    Heights are fetched ahead of the next height to yield by at most max_buffer_size, which bounds the
+    memory held by the buffered results. A height which is being retried holds only its own slot, so the
+    other requests keep running until the window is full. A height which fails after max_retries raises
+    when its turn to be yielded comes, and the pending requests are cancelled.
+    """
+    if concurrency <= 0:
+        raise SDKException(ErrorCode.param_err('the concurrency should be greater than zero.'))
+    if max_buffer_size < concurrency:
+        raise SDKException(ErrorCode.param_err('the max buffer size should not be less than the concurrency.'))
+    tasks = dict()
+    results = dict()
+    next_fetch_height = start
+    next_yield_height = start
+    try:
+        while next_yield_height < end:
+            while next_fetch_height < end and len(tasks) < concurrency and \
+                    next_fetch_height - next_yield_height < max_buffer_size:
+                task = asyncio.ensure_future(fetch_with_retry(fetch, next_fetch_height, max_retries, retry_delay))
+                tasks[task] = next_fetch_height
+                next_fetch_height += 1
+            if next_yield_height in results:
+                yield next_yield_height, results.pop(next_yield_height).result()
+                next_yield_height += 1
+                continue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks.pop(task)] = task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class AioRangeFetcher(object):
+    """
+    Bounded-concurrency helpers over the height based queries of an async network client:
+
+        async for height, block in sdk.aio_rpc.iter_blocks(0, 10000, concurrency=16):
+            ...
+    """
+
+    def iter_blocks(self, start: int, end: int, concurrency: int = DEFAULT_CONCURRENCY,
+                    max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE, max_retries: int = 3,
+                    retry_delay: float = 0.5) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        This interface is used to iterate (height, block) of the heights in range(start, end) in height order.
+        """
+        return fetch_range(self.get_block_by_height, start, end, concurrency, max_buffer_size, max_retries,
+                           retry_delay)
+
+    def iter_events(self, start: int, end: int, concurrency: int = DEFAULT_CONCURRENCY,
+                    max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE, max_retries: int = 3,
+                    retry_delay: float = 0.5) -> AsyncIterator[Tuple[int, list]]:
+        """
+        This interface is used to iterate (height, event list) of the heights in range(start, end) in height order.
+        """
+
+        async def get_event_list(height: int) -> list:
+            event_list = await self.get_contract_event_by_height(height)
+            return event_list if event_list else list()
+
+        return fetch_range(get_event_list, start, end, concurrency, max_buffer_size, max_retries, retry_delay)
@@ -0,0 +1,178 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+
+from time import monotonic
+from collections import deque
+from typing import List, Callable, Awaitable
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.throttle import Throttle
+
+
+class HedgeMetrics(object):
+    def __init__(self, max_samples: int):
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.latency_samples = deque(maxlen=max_samples)
+
+    def percentile(self, percentile: float) -> float or None:
+        if len(self.latency_samples) == 0:
+            return None
+        samples = sorted(self.latency_samples)
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def __iter__(self):
+        data = dict(requests=self.requests, hedged=self.hedged, hedge_wins=self.hedge_wins,
+                    budget_exhausted=self.budget_exhausted, p50=self.percentile(50), p95=self.percentile(95))
+        for key, value in data.items():
+            yield (key, value)
+
+
+class HedgePolicy(object):
+    """
+    Hedge idempotent reads against backup nodes.
+
+    When the node of a request has not answered within the given percentile of the recent latency of the same
+    method, the request is sent again to a backup node. The first answer wins and the other request is cancelled.
+    Each method may hedge at most budget_ratio of its requests, so hedging cannot amplify load unboundedly.
+
+    A request which loses the race is cancelled, and its elapsed time at the cancellation is still recorded as a
+    censored sample, so that a slow node keeps raising the delay instead of hiding behind its hedges. A response
+    with a non-zero error code counts as a failed attempt while another request is still racing. A hedged
+    request acquires its slot from the throttle of its backup node in backup_throttles, if any, rather than from
+    the throttle of the primary node.
+    """
+
+    def __init__(self, backup_addresses: List[str], percentile: float = 95, initial_delay: float = 0.05,
+                 min_delay: float = 0.005, budget_ratio: float = 0.1, method_budgets: dict = None,
+                 max_samples: int = 200, min_samples: int = 20, backup_throttles: dict = None):
+        if not isinstance(backup_addresses, list) or len(backup_addresses) == 0:
+            raise SDKException(ErrorCode.param_err('at least one backup address is required.'))
+        if not 0 < percentile < 100:
+            raise SDKException(ErrorCode.param_err('the percentile should be between 0 and 100.'))
+        if backup_throttles is not None and not all(isinstance(throttle, Throttle)
+                                                    for throttle in backup_throttles.values()):
+            raise SDKException(ErrorCode.param_error)
+        self.backup_addresses = backup_addresses
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.method_budgets = method_budgets if method_budgets is not None else dict()
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.backup_throttles = backup_throttles if backup_throttles is not None else dict()
+        self.__metrics = dict()
+        self.__backup_index = 0
+
+    def get_metrics(self, method: str) -> HedgeMetrics:
+        metrics = self.__metrics.get(method)
+        if metrics is None:
+            metrics = HedgeMetrics(self.max_samples)
+            self.__metrics[method] = metrics
+        return metrics
+
+    def metrics(self) -> dict:
+        return dict((method, dict(metrics)) for method, metrics in self.__metrics.items())
+
+    def get_throttle(self, backup_address: str) -> Throttle or None:
+        return self.backup_throttles.get(backup_address)
+
+    def hedge_delay(self, method: str) -> float:
+        metrics = self.get_metrics(method)
+        if len(metrics.latency_samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, metrics.percentile(self.percentile))
+
+    def __take_budget(self, metrics: HedgeMetrics, method: str) -> bool:
+        budget_ratio = self.method_budgets.get(method, self.budget_ratio)
+        if metrics.hedged >= budget_ratio * metrics.requests:
+            metrics.budget_exhausted += 1
+            return False
+        metrics.hedged += 1
+        return True
+
+    def __next_backup_address(self, address: str) -> str or None:
+        for _ in range(len(self.backup_addresses)):
+            backup_address = self.backup_addresses[self.__backup_index % len(self.backup_addresses)]
+            self.__backup_index += 1
+            if backup_address != address:
+                return backup_address
+        return None
+
+    @staticmethod
+    async def __timed(metrics: HedgeMetrics, send: Callable[[str], Awaitable], address: str):
+        start = monotonic()
+        result = await send(address)
+        metrics.latency_samples.append(monotonic() - start)
+        return result
+
+    @staticmethod
+    def __is_error_response(result) -> bool:
+        return isinstance(result, dict) and (result.get('error', 0) != 0 or result.get('Error', 0) != 0)
+
+    @staticmethod
+    def __censor(metrics: HedgeMetrics, starts: dict, tasks: set):
+        now = monotonic()
+        for task in tasks:
+            if not task.done():
+                metrics.latency_samples.append(now - starts[task])
+
+    async def request(self, method: str, send: Callable[[str], Awaitable], address: str):
+        """
+        Send a request by send(address), and hedge it to a backup address if it is slow.
+        """
+        metrics = self.get_metrics(method)
+        metrics.requests += 1
+        primary = asyncio.ensure_future(self.__timed(metrics, send, address))
+        tasks = {primary}
+        starts = {primary: monotonic()}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(method))
+            if len(done) == 0:
+                backup_address = self.__next_backup_address(address)
+                if backup_address is not None and self.__take_budget(metrics, method):
+                    backup = asyncio.ensure_future(self.__timed(metrics, send, backup_address))
+                    tasks.add(backup)
+                    starts[backup] = monotonic()
+            failed = None
+            pending = tasks
+            while len(pending) != 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not self.__is_error_response(task.result()):
+                        if task is not primary:
+                            metrics.hedge_wins += 1
+                        self.__censor(metrics, starts, pending)
+                        return task.result()
+                    if failed is None or task is primary:
+                        failed = task
+            return failed.result()
+        finally:
+            for task in tasks:
+                task.cancel()
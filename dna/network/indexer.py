@@ -0,0 +1,237 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import sqlite3
+import threading
+
+from typing import List, Iterable
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.fetcher import AioRangeFetcher, DEFAULT_CONCURRENCY, DEFAULT_MAX_BUFFER_SIZE
+from dna.utils.event import Event
+
+SCHEMA_VERSION = 1
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BUSY_TIMEOUT = 5
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS notifies (height INTEGER NOT NULL, tx_index INTEGER NOT NULL, '
+    'notify_index INTEGER NOT NULL, tx_hash TEXT NOT NULL, contract_address TEXT NOT NULL, event_name TEXT NOT NULL, '
+    'states TEXT NOT NULL, PRIMARY KEY (height, tx_index, notify_index))',
+    'CREATE INDEX IF NOT EXISTS notifies_contract ON notifies (contract_address, height)',
+    'CREATE INDEX IF NOT EXISTS notifies_event ON notifies (event_name, height)',
+    'CREATE INDEX IF NOT EXISTS notifies_tx_hash ON notifies (tx_hash)',
+    'CREATE TABLE IF NOT EXISTS checkpoints (name TEXT PRIMARY KEY, height INTEGER NOT NULL)',
+]
+
+
+def get_event_name(states) -> str:
+    """
+    Return the first state of a notify, which is the event name by convention, e.g. 'transfer' of the native
+    contracts, or its hex encoding of the NeoVM contracts.
+    """
+    if isinstance(states, list) and len(states) != 0 and isinstance(states[0], str):
+        return states[0]
+    return ''
+
+
+class EventIndexer(object):
+    """
+    A resumable indexer of the contract notifies, which scans the heights concurrently through the iter_events of
+    an async client, and stores the notifies into a local SQLite index keyed by contract address, tx hash, height
+    and event name:
+
+        indexer = EventIndexer(sdk.aio_rpc, 'events.db', contract_addresses=[hex_contract_address])
+        await indexer.run()
+        notifies = indexer.get_notifies(hex_contract_address, start_height=1000, event_name='transfer')
+
+    The notifies of every batch_size heights are committed together with the checkpoint, i.e. the next height to
+    scan, in one transaction, so that a restarted or failed indexer resumes from the last checkpoint without missing or
+    duplicating notifies. Indexers which have different names keep their own checkpoints in the same database.
+    """
+
+    def __init__(self, client: AioRangeFetcher, path: str, name: str = 'default', contract_addresses: Iterable = None,
+                 start_height: int = 0, concurrency: int = DEFAULT_CONCURRENCY,
+                 max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE, max_retries: int = 3, retry_delay: float = 0.5,
+                 batch_size: int = DEFAULT_BATCH_SIZE, busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
+        if not isinstance(client, AioRangeFetcher):
+            raise SDKException(ErrorCode.param_error)
+        if batch_size <= 0:
+            raise SDKException(ErrorCode.param_err('the batch size should be greater than zero.'))
+        if start_height < 0:
+            raise SDKException(ErrorCode.param_err('the start height should not be less than zero.'))
+        self.client = client
+        self.path = path
+        self.name = name
+        self.contract_addresses = set(contract_addresses) if contract_addresses is not None else None
+        self.start_height = start_height
+        self.concurrency = concurrency
+        self.max_buffer_size = max_buffer_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.batch_size = batch_size
+        self.__lock = threading.Lock()
+        try:
+            self.__conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+            self.__conn.execute('PRAGMA journal_mode=WAL')
+            self.__conn.execute('PRAGMA synchronous=NORMAL')
+            self.__init_schema()
+        except sqlite3.Error as e:
+            raise SDKException(ErrorCode.other_error(f'failed to open the index {path}: {e}')) from None
+
+    def __init_schema(self):
+        conn = self.__conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                conn.execute('DROP TABLE IF EXISTS notifies')
+                conn.execute('DROP TABLE IF EXISTS checkpoints')
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self.__lock:
+            self.__conn.close()
+
+    @property
+    def checkpoint(self) -> int:
+        """
+        The next height to scan.
+        """
+        with self.__lock:
+            row = self.__conn.execute('SELECT height FROM checkpoints WHERE name = ?', (self.name,)).fetchone()
+        return row[0] if row is not None else self.start_height
+
+    def get_rows(self, height: int, event_list: list) -> List[tuple]:
+        rows = list()
+        for tx_index, event in enumerate(event_list or list()):
+            tx_hash = Event.get_tx_hash(event)
+            for notify_index, notify in enumerate(Event.get_notify_list(event) or list()):
+                contract_address = notify.get('ContractAddress', '')
+                if self.contract_addresses is not None and contract_address not in self.contract_addresses:
+                    continue
+                states = notify.get('States')
+                rows.append((height, tx_index, notify_index, tx_hash, contract_address, get_event_name(states),
+                             json.dumps(states)))
+        return rows
+
+    def __commit(self, rows: List[tuple], checkpoint: int):
+        with self.__lock:
+            conn = self.__conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany('INSERT OR IGNORE INTO notifies (height, tx_index, notify_index, tx_hash, '
+                                 'contract_address, event_name, states) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                conn.execute('INSERT OR REPLACE INTO checkpoints (name, height) VALUES (?, ?)', (self.name, checkpoint))
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+
+    async def run(self, end_height: int = None) -> int:
+        """
+        Index the heights from the checkpoint to end_height exclusively, or to the current block height inclusively,
+        and return the number of the indexed notifies. The SQLite work runs in the default executor, so that a busy
+        database does not block the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        if end_height is None:
+            end_height = await self.client.get_block_height() + 1
+        start_height = await loop.run_in_executor(None, lambda: self.checkpoint)
+        rows = list()
+        count = 0
+        events = self.client.iter_events(start_height, end_height, self.concurrency, self.max_buffer_size,
+                                         self.max_retries, self.retry_delay)
+        async for height, event_list in events:
+            rows.extend(self.get_rows(height, event_list))
+            if (height + 1 - start_height) % self.batch_size == 0:
+                await loop.run_in_executor(None, self.__commit, rows, height + 1)
+                count += len(rows)
+                rows = list()
+        if start_height < end_height:
+            await loop.run_in_executor(None, self.__commit, rows, end_height)
+            count += len(rows)
+        return count
+
+    async def follow(self, poll_interval: float = 1):
+        """
+        Keep indexing the new blocks until cancelled.
+        """
+        while True:
+            await self.run()
+            await asyncio.sleep(poll_interval)
+
+    def get_notifies(self, contract_address: str = '', start_height: int = None, end_height: int = None,
+                     event_name: str = '', tx_hash: str = '', limit: int = 0) -> List[dict]:
+        """
+        Query the indexed notifies in the heights of range(start_height, end_height) in height order. An event name
+        matches both the plain name and its hex encoding. The query blocks on the database, so call it through
+        loop.run_in_executor in a coroutine.
+        """
+        conditions, params = list(), list()
+        if contract_address:
+            conditions.append('contract_address = ?')
+            params.append(contract_address)
+        if start_height is not None:
+            conditions.append('height >= ?')
+            params.append(start_height)
+        if end_height is not None:
+            conditions.append('height < ?')
+            params.append(end_height)
+        if event_name:
+            conditions.append('event_name IN (?, ?)')
+            params.extend([event_name, event_name.encode('utf-8').hex()])
+        if tx_hash:
+            conditions.append('tx_hash = ?')
+            params.append(tx_hash)
+        sql = 'SELECT height, tx_hash, contract_address, event_name, states FROM notifies'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY height, tx_index, notify_index'
+        if limit > 0:
+            sql += f' LIMIT {int(limit)}'
+        with self.__lock:
+            rows = self.__conn.execute(sql, params).fetchall()
+        return [dict(Height=height, TxHash=tx_hash, ContractAddress=contract_address, EventName=event_name,
+                     States=json.loads(states)) for height, tx_hash, contract_address, event_name, states in rows]
+
+    def count(self, contract_address: str = '') -> int:
+        with self.__lock:
+            if contract_address:
+                sql, params = 'SELECT COUNT(*) FROM notifies WHERE contract_address = ?', (contract_address,)
+            else:
+                sql, params = 'SELECT COUNT(*) FROM notifies', ()
+            return self.__conn.execute(sql, params).fetchone()[0]
@@ -0,0 +1,314 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import threading
+
+from time import monotonic, perf_counter
+from bisect import bisect_left
+from typing import Callable, List, Tuple
+
+from dna.exception.exception import SDKException
+from dna.network.slot import RequestSlot
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DEFAULT_DECODE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+DEFAULT_SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+
+def get_error_code(error: BaseException) -> str:
+    if isinstance(error, SDKException) and len(error.args) > 0:
+        return str(error.args[0])
+    return type(error).__name__
+
+
+class RequestInfo(object):
+    """
+    The record of one request sent by a network client, which is passed to the instrumentation hooks.
+    """
+
+    def __init__(self, protocol: str, method: str, url: str):
+        self.protocol = protocol
+        self.method = method
+        self.url = url
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.decode_time = 0.0
+        self.latency = 0.0
+        self.error = None
+        self.node_error = 0
+        self.start = monotonic()
+
+    @property
+    def error_code(self) -> str or None:
+        """
+        The code of the exception raised by the request, or the error code returned by the node.
+        """
+        if self.error is not None:
+            return get_error_code(self.error)
+        if self.node_error:
+            return str(self.node_error)
+        return None
+
+    def decode(self, content: bytes or str):
+        """
+        Decode a JSON response, and record the time of decoding.
+        """
+        start = perf_counter()
+        result = json.loads(content)
+        self.decode_time = perf_counter() - start
+        return result
+
+
+class Histogram(object):
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+        The number of samples less than or equal to each upper bound, and the last bound is infinity.
+        """
+        result = list()
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def __iter__(self):
+        data = dict(count=self.count, sum=self.sum, buckets=self.cumulative_counts())
+        for key, value in data.items():
+            yield (key, value)
+
+
+class MethodMetrics(object):
+    def __init__(self, latency_buckets: tuple, decode_buckets: tuple, size_buckets: tuple):
+        self.requests = 0
+        self.retries = 0
+        self.errors = dict()
+        self.latency = Histogram(latency_buckets)
+        self.decode_time = Histogram(decode_buckets)
+        self.request_bytes = Histogram(size_buckets)
+        self.response_bytes = Histogram(size_buckets)
+
+    def observe(self, info: RequestInfo):
+        self.requests += 1
+        self.latency.observe(info.latency)
+        self.request_bytes.observe(info.request_bytes)
+        if info.error is None:
+            self.decode_time.observe(info.decode_time)
+            self.response_bytes.observe(info.response_bytes)
+        code = info.error_code
+        if code is not None:
+            self.errors[code] = self.errors.get(code, 0) + 1
+
+    def __iter__(self):
+        data = dict(requests=self.requests, retries=self.retries, errors=dict(self.errors),
+                    latency=dict(self.latency), decode_time=dict(self.decode_time),
+                    request_bytes=dict(self.request_bytes), response_bytes=dict(self.response_bytes))
+        for key, value in data.items():
+            yield (key, value)
+
+
+class MetricsRegistry(object):
+    """
+    A thread-safe registry of the metrics of requests per protocol and method, which can be exported as a dict or
+    in the Prometheus text format.
+    """
+
+    def __init__(self, latency_buckets: tuple = DEFAULT_LATENCY_BUCKETS, decode_buckets: tuple = DEFAULT_DECODE_BUCKETS,
+                 size_buckets: tuple = DEFAULT_SIZE_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self.decode_buckets = decode_buckets
+        self.size_buckets = size_buckets
+        self.__metrics = dict()
+        self.__lock = threading.Lock()
+
+    def __get_metrics(self, protocol: str, method: str) -> MethodMetrics:
+        metrics = self.__metrics.get((protocol, method))
+        if metrics is None:
+            metrics = MethodMetrics(self.latency_buckets, self.decode_buckets, self.size_buckets)
+            self.__metrics[(protocol, method)] = metrics
+        return metrics
+
+    def observe(self, info: RequestInfo):
+        with self.__lock:
+            self.__get_metrics(info.protocol, info.method).observe(info)
+
+    def observe_retry(self, protocol: str, method: str):
+        with self.__lock:
+            self.__get_metrics(protocol, method).retries += 1
+
+    def get(self, protocol: str, method: str) -> MethodMetrics or None:
+        return self.__metrics.get((protocol, method))
+
+    def clear(self):
+        with self.__lock:
+            self.__metrics.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Export the metrics as {protocol: {method: metrics}}.
+        """
+        result = dict()
+        with self.__lock:
+            for (protocol, method), metrics in self.__metrics.items():
+                result.setdefault(protocol, dict())[method] = dict(metrics)
+        return result
+
+    def __iter__(self):
+        for key, value in self.to_dict().items():
+            yield (key, value)
+
+    @staticmethod
+    def __format_labels(**labels) -> str:
+        items = list()
+        for key, value in labels.items():
+            value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+            items.append(f'{key}="{value}"')
+        return '{' + ','.join(items) + '}'
+
+    @staticmethod
+    def __format_bound(bound: float) -> str:
+        if bound == float('inf'):
+            return '+Inf'
+        return repr(float(bound))
+
+    def __format_histogram(self, lines: list, name: str, help_text: str, histograms: list):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (protocol, method), histogram in histograms:
+            for bound, count in histogram.cumulative_counts():
+                labels = self.__format_labels(protocol=protocol, method=method, le=self.__format_bound(bound))
+                lines.append(f'{name}_bucket{labels} {count}')
+            labels = self.__format_labels(protocol=protocol, method=method)
+            lines.append(f'{name}_sum{labels} {histogram.sum}')
+            lines.append(f'{name}_count{labels} {histogram.count}')
+
+    def to_prometheus(self, prefix: str = 'dna_sdk') -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+        """
+        with self.__lock:
+            items = sorted(self.__metrics.items())
+            lines = list()
+            lines.append(f'# HELP {prefix}_requests_total The number of requests sent to the node.')
+            lines.append(f'# TYPE {prefix}_requests_total counter')
+            for (protocol, method), metrics in items:
+                lines.append(f'{prefix}_requests_total{self.__format_labels(protocol=protocol, method=method)} '
+                             f'{metrics.requests}')
+            lines.append(f'# HELP {prefix}_retries_total The number of retried requests.')
+            lines.append(f'# TYPE {prefix}_retries_total counter')
+            for (protocol, method), metrics in items:
+                lines.append(f'{prefix}_retries_total{self.__format_labels(protocol=protocol, method=method)} '
+                             f'{metrics.retries}')
+            lines.append(f'# HELP {prefix}_errors_total The number of failed requests by error code.')
+            lines.append(f'# TYPE {prefix}_errors_total counter')
+            for (protocol, method), metrics in items:
+                for code, count in sorted(metrics.errors.items()):
+                    labels = self.__format_labels(protocol=protocol, method=method, code=code)
+                    lines.append(f'{prefix}_errors_total{labels} {count}')
+            self.__format_histogram(lines, f'{prefix}_request_duration_seconds', 'The latency of requests.',
+                                    [(key, metrics.latency) for key, metrics in items])
+            self.__format_histogram(lines, f'{prefix}_json_decode_seconds', 'The time of decoding JSON responses.',
+                                    [(key, metrics.decode_time) for key, metrics in items])
+            self.__format_histogram(lines, f'{prefix}_request_bytes', 'The size of requests.',
+                                    [(key, metrics.request_bytes) for key, metrics in items])
+            self.__format_histogram(lines, f'{prefix}_response_bytes', 'The size of responses.',
+                                    [(key, metrics.response_bytes) for key, metrics in items])
+        return '\n'.join(lines) + '\n'
+
+
+class Instrumentation(object):
+    """
+    The pre- and post-request hooks of network clients, and a metrics registry which records every request:
+
+        instrumentation = Instrumentation()
+        instrumentation.add_hook(post=lambda info: print(info.method, info.latency, info.error_code))
+        rpc = Rpc(address, instrumentation=instrumentation)
+        print(instrumentation.registry.to_prometheus())
+
+    An instrumentation can be shared by several clients.
+    """
+
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.__pre_hooks = list()
+        self.__post_hooks = list()
+
+    def add_hook(self, pre: Callable[[RequestInfo], None] = None, post: Callable[[RequestInfo], None] = None):
+        if pre is not None:
+            self.__pre_hooks.append(pre)
+        if post is not None:
+            self.__post_hooks.append(post)
+
+    def remove_hook(self, pre: Callable[[RequestInfo], None] = None, post: Callable[[RequestInfo], None] = None):
+        if pre is not None and pre in self.__pre_hooks:
+            self.__pre_hooks.remove(pre)
+        if post is not None and post in self.__post_hooks:
+            self.__post_hooks.remove(post)
+
+    def on_start(self, info: RequestInfo):
+        for hook in self.__pre_hooks:
+            hook(info)
+
+    def on_finish(self, info: RequestInfo):
+        info.latency = monotonic() - info.start
+        self.registry.observe(info)
+        for hook in self.__post_hooks:
+            hook(info)
+
+    def on_retry(self, protocol: str, method: str):
+        self.registry.observe_retry(protocol, method)
+
+    def retry_hook(self, protocol: str, method: str) -> Callable[[int, Exception], None]:
+        return lambda attempt, error: self.on_retry(protocol, method)
+
+
+class InstrumentSlot(RequestSlot):
+    """
+    The slot of one request under an optional instrumentation. Its context value is the RequestInfo of the request,
+    which the client fills with the sizes and the decode time.
+    """
+
+    def __init__(self, instrumentation: Instrumentation or None, protocol: str, method: str, url: str):
+        self.__instrumentation = instrumentation
+        self.__info = RequestInfo(protocol, method, url)
+
+    def enter(self) -> RequestInfo:
+        if self.__instrumentation is not None:
+            self.__info.start = monotonic()
+            self.__instrumentation.on_start(self.__info)
+        return self.__info
+
+    def exit(self, error: BaseException or None):
+        if self.__instrumentation is not None:
+            self.__info.error = error
+            self.__instrumentation.on_finish(self.__info)
@@ -0,0 +1,290 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+
+from typing import Any, Tuple
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.cache import ResponseCache, DEFAULT_CACHE_SIZE
+
+SCHEMA_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT = 5
+EVICTION_RATIO = 0.9
+EVICTION_BATCH_SIZE = 256
+ACCESS_UPDATE_INTERVAL = 60
+ACCESS_BATCH_SIZE = 64
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, method TEXT NOT NULL, value TEXT NOT NULL, '
+    'size INTEGER NOT NULL, accessed REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)',
+    'CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO usage (id, bytes) VALUES (0, 0)',
+    'CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN '
+    'UPDATE usage SET bytes = bytes + new.size WHERE id = 0; END',
+    'CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN '
+    'UPDATE usage SET bytes = bytes - old.size WHERE id = 0; END',
+]
+
+
+class DiskCacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def __iter__(self):
+        data = dict(hits=self.hits, misses=self.misses, writes=self.writes, evictions=self.evictions,
+                    errors=self.errors)
+        for key, value in data.items():
+            yield (key, value)
+
+
+class PersistentCache(ResponseCache):
+    """
+    A ResponseCache whose immutable responses, i.e. the methods which have a None policy such as blocks, events,
+    transactions and contract code, are also kept in a SQLite database shared by all processes on the host:
+
+        cache = PersistentCache('/var/cache/dna/chain.db')
+        rpc, restful = Rpc(url, cache=cache), AioRestful(url, cache=cache)
+
+    The in-memory LRU of ResponseCache is looked up first, and the disk is read through on a miss. The database is
+    opened in WAL mode, so that the readers do not block each other nor the writer. The least recently read entries
+    are evicted when the database is larger than max_bytes, and all entries are dropped when the schema version
+    of the database differs from schema_version, which could be bumped to invalidate a cache.
+
+    A read never writes to the database. The access time of an entry is only refreshed when it is older than
+    ACCESS_UPDATE_INTERVAL seconds, and the refreshes are written in batches by the next put, or by a read once
+    ACCESS_BATCH_SIZE of them are pending, in which case they are dropped rather than waited for when the database
+    is locked, since they are only a hint for the eviction.
+
+    The responses with the time to live, e.g. balances, are only cached in memory. A failed disk access, e.g. a
+    database locked for longer than busy_timeout, is counted as an error and treated as a miss. The async clients
+    go through aio_get and aio_put, which access the disk in the default executor, so that a locked database does
+    not block the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_size: int = DEFAULT_CACHE_SIZE,
+                 policies: dict = None, schema_version: int = SCHEMA_VERSION,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
+        super().__init__(max_size, policies)
+        if max_bytes <= 0:
+            raise SDKException(ErrorCode.param_err('the max bytes of cache should be greater than zero.'))
+        if schema_version <= 0:
+            raise SDKException(ErrorCode.param_err('the schema version should be greater than zero.'))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.schema_version = schema_version
+        self.busy_timeout = busy_timeout
+        self.__local = threading.local()
+        self.__connections = list()
+        self.__lock = threading.Lock()
+        self.__disk_stats = DiskCacheStats()
+        self.__accessed = dict()
+        self.__init_schema(self.__get_connection())
+
+    def __get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self.__local, 'conn', None)
+        if conn is None:
+            try:
+                conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                       check_same_thread=False)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+            except sqlite3.Error as e:
+                raise SDKException(ErrorCode.other_error(f'failed to open the cache {self.path}: {e}')) from None
+            self.__local.conn = conn
+            with self.__lock:
+                self.__connections.append(conn)
+        return conn
+
+    def __init_schema(self, conn: sqlite3.Connection):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if version != self.schema_version:
+                    conn.execute('DROP TABLE IF EXISTS entries')
+                    conn.execute('DROP TABLE IF EXISTS usage')
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version={int(self.schema_version)}')
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            raise SDKException(ErrorCode.other_error(f'failed to open the cache {self.path}: {e}')) from None
+
+    def is_persistent(self, method: str) -> bool:
+        return method in self.policies and self.policies[method] is None
+
+    def __count(self, name: str):
+        with self.__lock:
+            setattr(self.__disk_stats, name, getattr(self.__disk_stats, name) + 1)
+
+    def get(self, method: str, key: str) -> Tuple[bool, Any]:
+        is_hit, value = super().get(method, key)
+        if is_hit or not self.is_persistent(method):
+            return is_hit, value
+        return self.__read(method, key)
+
+    async def aio_get(self, method: str, key: str) -> Tuple[bool, Any]:
+        is_hit, value = super().get(method, key)
+        if is_hit or not self.is_persistent(method):
+            return is_hit, value
+        return await asyncio.get_event_loop().run_in_executor(None, self.__read, method, key)
+
+    def __read(self, method: str, key: str) -> Tuple[bool, Any]:
+        try:
+            conn = self.__get_connection()
+            row = conn.execute('SELECT value, accessed FROM entries WHERE key = ?', (key,)).fetchone()
+        except (sqlite3.Error, SDKException):
+            self.__count('errors')
+            return False, None
+        if row is None:
+            self.__count('misses')
+            return False, None
+        self.__count('hits')
+        value = json.loads(row[0])
+        self._put_data(method, key, row[0])
+        now = time.time()
+        if now - row[1] >= ACCESS_UPDATE_INTERVAL:
+            with self.__lock:
+                self.__accessed[key] = now
+                is_full = len(self.__accessed) >= ACCESS_BATCH_SIZE
+            if is_full:
+                self.__flush_accessed(conn, wait=False)
+        return True, value
+
+    def __flush_accessed(self, conn: sqlite3.Connection, wait: bool):
+        with self.__lock:
+            if len(self.__accessed) == 0:
+                return
+            accessed, self.__accessed = self.__accessed, dict()
+        try:
+            if not wait:
+                conn.execute('PRAGMA busy_timeout=0')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.executemany('UPDATE entries SET accessed = ? WHERE key = ?',
+                                     [(accessed_time, key) for key, accessed_time in accessed.items()])
+                    conn.execute('COMMIT')
+                except sqlite3.Error:
+                    conn.execute('ROLLBACK')
+            finally:
+                if not wait:
+                    conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout * 1000)}')
+        except sqlite3.Error:
+            pass
+
+    def put(self, method: str, key: str, value):
+        data = json.dumps(value, separators=(',', ':'))
+        self._put_data(method, key, data)
+        if self.is_persistent(method):
+            self.__write(method, key, data)
+
+    async def aio_put(self, method: str, key: str, value):
+        data = json.dumps(value, separators=(',', ':'))
+        self._put_data(method, key, data)
+        if self.is_persistent(method):
+            await asyncio.get_event_loop().run_in_executor(None, self.__write, method, key, data)
+
+    def __write(self, method: str, key: str, data: str):
+        try:
+            conn = self.__get_connection()
+            self.__flush_accessed(conn, wait=True)
+            cursor = conn.execute('INSERT OR IGNORE INTO entries (key, method, value, size, accessed) '
+                                  'VALUES (?, ?, ?, ?, ?)', (key, method, data, len(key) + len(data), time.time()))
+            if cursor.rowcount > 0:
+                self.__count('writes')
+                self.__evict(conn)
+        except (sqlite3.Error, SDKException):
+            self.__count('errors')
+
+    def __get_bytes(self, conn: sqlite3.Connection) -> int:
+        return conn.execute('SELECT bytes FROM usage WHERE id = 0').fetchone()[0]
+
+    def __evict(self, conn: sqlite3.Connection):
+        if self.__get_bytes(conn) <= self.max_bytes:
+            return
+        low_watermark = self.max_bytes * EVICTION_RATIO
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            while self.__get_bytes(conn) > low_watermark:
+                cursor = conn.execute('DELETE FROM entries WHERE key IN '
+                                      '(SELECT key FROM entries ORDER BY accessed LIMIT ?)', (EVICTION_BATCH_SIZE,))
+                if cursor.rowcount <= 0:
+                    break
+                with self.__lock:
+                    self.__disk_stats.evictions += cursor.rowcount
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        super().clear()
+        try:
+            self.__get_connection().execute('DELETE FROM entries')
+        except sqlite3.Error:
+            self.__count('errors')
+
+    def close(self):
+        """
+        Close the connections of all threads. The cache should not be used afterwards.
+        """
+        try:
+            self.__flush_accessed(self.__get_connection(), wait=True)
+        except SDKException:
+            pass
+        with self.__lock:
+            connections, self.__connections = self.__connections, list()
+        for conn in connections:
+            conn.close()
+        self.__local = threading.local()
+
+    def stats(self) -> dict:
+        """
+        Return the statistics of the in-memory cache, together with the statistics of this process's disk accesses
+        and the size of the database under the key 'disk'.
+        """
+        data = super().stats()
+        with self.__lock:
+            data['disk'] = dict(self.__disk_stats)
+        try:
+            conn = self.__get_connection()
+            data['disk']['size'] = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            data['disk']['bytes'] = self.__get_bytes(conn)
+        except sqlite3.Error:
+            pass
+        return data
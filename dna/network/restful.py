@@ -24,6 +24,7 @@ import json
 import requests
 
 from typing import List, Union
+from urllib.parse import urlsplit
 
 from Cryptodome.Random.random import randint
 
@@ -36,10 +37,32 @@ from dna.utils.transaction import ensure_bytearray_contract_address
 from dna.contract.neo.abi.abi_function import AbiFunction
 from dna.vm.build_params import BuildParams
 from dna.contract.neo.invoke_function import NeoInvokeFunction
+from dna.network.cache import ResponseCache
+from dna.network.throttle import Throttle, ThrottleSlot
+from dna.network.retry import RetryPolicy
+from dna.network.metrics import Instrumentation, InstrumentSlot
+from dna.network.session import PooledSession, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
 
 TEST_RESTFUL_ADDRESS = ['http://polaris1.ont.io:20334', 'http://polaris2.ont.io:20334', 'http://polaris3.ont.io:20334']
 MAIN_RESTFUL_ADDRESS = ['http://dappnode1.ont.io:20334', 'http://dappnode2.ont.io:20334']
 
+RESTFUL_PATH_TEMPLATES = [
+    '/api/v1/block/details/height/{}',
+    '/api/v1/block/details/hash/{}',
+    '/api/v1/block/height/txhash/{}',
+    '/api/v1/transaction/{}',
+    '/api/v1/smartcode/event/transactions/{}',
+    '/api/v1/smartcode/event/txhash/{}',
+    '/api/v1/merkleproof/{}',
+    '/api/v1/contract/{}',
+    '/api/v1/balance/{}',
+    '/api/v1/allowance/{}/{}/{}',
+    '/api/v1/unboundong/{}',
+    '/api/v1/grantong/{}',
+    '/api/v1/storage/{}/{}',
+    '/api/v1/mempool/txstate/{}',
+]
+
 
 class RestfulMethod(object):
     @staticmethod
@@ -62,6 +85,14 @@ class RestfulMethod(object):
     def get_block_by_height(url: str, height: int):
         return f'{url}/api/v1/block/details/height/{height}?raw=0'
 
+    @staticmethod
+    def get_raw_block_by_height(url: str, height: int):
+        return f'{url}/api/v1/block/details/height/{height}?raw=1'
+
+    @staticmethod
+    def get_raw_block_by_hash(url: str, block_hash: str):
+        return f'{url}/api/v1/block/details/hash/{block_hash}?raw=1'
+
     @staticmethod
     def get_block_height(url: str):
         return f'{url}/api/v1/block/height'
@@ -82,6 +113,10 @@ class RestfulMethod(object):
     def get_transaction(url: str, tx_hash: str):
         return f'{url}/api/v1/transaction/{tx_hash}'
 
+    @staticmethod
+    def get_raw_transaction(url: str, tx_hash: str):
+        return f'{url}/api/v1/transaction/{tx_hash}?raw=1'
+
     @staticmethod
     def send_transaction(url: str, ):
         return f'{url}/api/v1/transaction?preExec=0'
@@ -136,8 +171,78 @@ class RestfulMethod(object):
 
 
 class Restful(object):
-    def __init__(self, url: str = ''):
+    def __init__(self, url: str = '', pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, gzip: bool = True,
+                 cache: ResponseCache = None, throttle: Throttle = None, timeout: float = DEFAULT_TIMEOUT,
+                 retry_policy: RetryPolicy = None, instrumentation: Instrumentation = None):
         self._url = url
+        self._http = PooledSession(pool_size, keep_alive, gzip)
+        self._cache = cache
+        self._throttle = throttle
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.instrumentation = instrumentation
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        This interface is used to release the pooled connections of the client.
+        """
+        self._http.close()
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: ResponseCache):
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise SDKException(ErrorCode.param_error)
+        self._cache = cache
+
+    @property
+    def throttle(self):
+        return self._throttle
+
+    @throttle.setter
+    def throttle(self, throttle: Throttle):
+        if throttle is not None and not isinstance(throttle, Throttle):
+            raise SDKException(ErrorCode.param_error)
+        self._throttle = throttle
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float):
+        if timeout <= 0:
+            raise SDKException(ErrorCode.param_err('the timeout should be greater than zero.'))
+        self._timeout = timeout
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy: RetryPolicy):
+        if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+            raise SDKException(ErrorCode.param_error)
+        self._retry_policy = retry_policy
+
+    @property
+    def instrumentation(self):
+        return self._instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation: Instrumentation):
+        if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+            raise SDKException(ErrorCode.param_error)
+        self._instrumentation = instrumentation
 
     def set_address(self, url: str):
         self._url = url
@@ -148,43 +253,118 @@ class Restful(object):
     def connect_to_localhost(self):
         self.set_address('http://localhost:20334')
 
+    @staticmethod
+    def _get_retry_method(url: str) -> str:
+        if url.endswith('preExec=1'):
+            return 'sendrawtransaction_pre_exec'
+        return 'sendrawtransaction'
+
+    @staticmethod
+    def _get_duplicated_tx_response(data: str) -> dict:
+        tx = Transaction.deserialize_from(bytes.fromhex(json.loads(data)['Data']))
+        return dict(Action='sendrawtransaction', Desc='SUCCESS', Error=0, Result=tx.hash256_explorer(),
+                    Version='1.0.0')
+
+    def _get_retry_hook(self, method: str):
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.retry_hook('restful', method)
+
+    def _call(self, method: str, send, on_duplicate=None):
+        if self._retry_policy is None:
+            return send(self._timeout)
+        return self._retry_policy.call(self._url, method, send, self._timeout, on_duplicate,
+                                       self._get_retry_hook(method))
+
     def __post(self, url: str, data: str):
-        try:
-            response = requests.post(url, data=data, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
-            raise SDKException(ErrorCode.connect_timeout(self._url)) from None
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
-        try:
-            response = json.loads(response.content.decode('utf-8'))
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
-        if response['Error'] != 0:
-            raise SDKException(ErrorCode.other_error(response['Result']))
-        return response
+        return self._call(self._get_retry_method(url), lambda timeout: self.__send_post(url, data, timeout),
+                          lambda: self._get_duplicated_tx_response(data))
+
+    def __send_post(self, url: str, data: str, timeout: float):
+        method = self._get_retry_method(url)
+        with ThrottleSlot(self._throttle), InstrumentSlot(self._instrumentation, 'restful', method, url) as info:
+            info.request_bytes = len(data)
+            try:
+                response = self._http.post(url, data=data, timeout=timeout)
+            except requests.exceptions.MissingSchema as e:
+                raise SDKException(ErrorCode.connect_err(e.args[0]))
+            except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError,
+                    requests.exceptions.ReadTimeout):
+                raise SDKException(ErrorCode.connect_timeout(self._url)) from None
+            info.response_bytes = len(response.content)
+            if response.status_code != 200:
+                raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
+            try:
+                response = info.decode(response.content.decode('utf-8'))
+            except json.decoder.JSONDecodeError as e:
+                raise SDKException(ErrorCode.other_error(e.args[0]))
+            info.node_error = response['Error']
+            if response['Error'] != 0:
+                raise SDKException(ErrorCode.other_error(response['Result']))
+            return response
+
+    @staticmethod
+    def get_path_key(path: str) -> str:
+        """
+        Return the template of a restful path in RESTFUL_PATH_TEMPLATES, e.g. '/api/v1/storage/{}/{}'. The variable
+        segments of an unknown path, i.e. numbers and long hashes or addresses, are replaced with '{}' one by one.
+        """
+        path = path.split('?')[0]
+        segment_count = path.count('/')
+        for template in RESTFUL_PATH_TEMPLATES:
+            if template.count('/') == segment_count and path.startswith(template[:template.index('{}')]):
+                return template
+        return '/'.join('{}' if segment.isdigit() or len(segment) >= 32 else segment for segment in path.split('/'))
+
+    def _get_cache_method(self, url: str) -> str or None:
+        if self._cache is None:
+            return None
+        method = self.get_path_key(url[len(self._url):])
+        return method if self._cache.is_cacheable(method) else None
+
+    def _put_cache(self, method: str or None, url: str, response: dict):
+        if method is not None and not self._cache.is_empty_result(response['Result']):
+            self._cache.put(method, url, response)
+
+    async def _aio_put_cache(self, method: str or None, url: str, response: dict):
+        if method is not None and not self._cache.is_empty_result(response['Result']):
+            await self._cache.aio_put(method, url, response)
 
     def __get(self, url: str):
-        try:
-            response = requests.get(url, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
-            raise SDKException(ErrorCode.connect_timeout(self._url)) from None
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
-        try:
-            response = json.loads(response.content.decode('utf-8'))
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
+        method = self._get_cache_method(url)
+        if method is not None:
+            is_hit, response = self._cache.get(method, url)
+            if is_hit:
+                return response
+        response = self._call(self.get_path_key(url[len(self._url):]), lambda timeout: self.__send_get(url, timeout))
         if response['Error'] != 0:
             if response['Result'] != '':
                 raise SDKException(ErrorCode.other_error(response['Result']))
             else:
                 raise SDKException(ErrorCode.other_error(response['Desc']))
+        self._put_cache(method, url, response)
         return response
 
+    def __send_get(self, url: str, timeout: float):
+        method = self.get_path_key(urlsplit(url).path)
+        with ThrottleSlot(self._throttle), InstrumentSlot(self._instrumentation, 'restful', method, url) as info:
+            try:
+                response = self._http.get(url, timeout=timeout)
+            except requests.exceptions.MissingSchema as e:
+                raise SDKException(ErrorCode.connect_err(e.args[0]))
+            except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError,
+                    requests.exceptions.ReadTimeout):
+                raise SDKException(ErrorCode.connect_timeout(self._url)) from None
+            info.response_bytes = len(response.content)
+            if response.status_code != 200:
+                raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
+            try:
+                response = info.decode(response.content.decode('utf-8'))
+            except json.decoder.JSONDecodeError as e:
+                raise SDKException(ErrorCode.other_error(e.args[0]))
+            info.node_error = response.get('Error', 0)
+            return response
+
     def get_version(self, is_full: bool = False):
         url = RestfulMethod.get_version(self._url)
         response = self.__get(url)
@@ -229,14 +409,14 @@ class Restful(object):
 
     def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
         response = self.get_block_height_by_tx_hash(tx_hash, is_full=True)
-        response['Result'] += 1
+        response = dict(response, Result=response['Result'] + 1)
         if is_full:
             return response
         return response['Result']
 
     def get_block_count(self, is_full: bool = False) -> int or dict:
         response = self.get_block_height(is_full=True)
-        response['Result'] += 1
+        response = dict(response, Result=response['Result'] + 1)
         if is_full:
             return response
         return response['Result']
@@ -313,6 +493,27 @@ class Restful(object):
         result = response['Result']
         return dict() if result is None else result
 
+    def get_raw_block_by_height(self, height: int, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_block_by_height(self._url, height)
+        response = self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
+    def get_raw_block_by_hash(self, block_hash: str, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_block_by_hash(self._url, block_hash)
+        response = self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
+    def get_raw_transaction(self, tx_hash: str, is_full: bool = False) -> str:
+        url = RestfulMethod.get_raw_transaction(self._url, tx_hash)
+        response = self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
     def send_raw_transaction(self, tx: Transaction, is_full: bool = False):
         hex_tx_data = tx.serialize(is_hex=True)
         data = f'{{"Action":"sendrawtransaction", "Version":"1.0.0","Data":"{hex_tx_data}"}}'
@@ -0,0 +1,196 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+import random
+import asyncio
+
+from time import monotonic
+from typing import Any, Callable, Awaitable
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.session import DEFAULT_TIMEOUT
+from dna.network.endpoint import CircuitBreaker, is_connection_error
+
+CIRCUIT_BREAKER_OPEN_CODE = ErrorCode.circuit_breaker_open('')['error']
+
+
+class Idempotency(object):
+    # reads and pre-executions, which can be sent again on any transport error.
+    IDEMPOTENT = 'idempotent'
+    # a signed transaction, which can be sent again as the same bytes since the node rejects a duplicate.
+    RESEND = 'resend'
+    # a request which must not be sent twice.
+    UNSAFE = 'unsafe'
+
+
+# The methods which are not in the classification only read the chain and are idempotent.
+DEFAULT_IDEMPOTENCY = {
+    'sendrawtransaction': Idempotency.RESEND,
+    'sendrawtransaction_pre_exec': Idempotency.IDEMPOTENT,
+    'sendemergencygovreq': Idempotency.UNSAFE,
+}
+
+
+def is_duplicated_tx_error(e: Exception) -> bool:
+    return isinstance(e, SDKException) and len(e.args) > 1 and 'duplicated' in str(e.args[1]).lower()
+
+
+class RetryPolicy(object):
+    """
+    Retry the requests which fail with a connection error, with exponential backoff and jitter:
+
+        rpc = Rpc(address, retry_policy=RetryPolicy(max_attempts=3, deadline=15, circuit_breaker=CircuitBreaker()))
+
+    The delay before the n-th retry is drawn from [(1 - jitter) * d, d] where d = min(max_delay, base_delay * 2 ** n),
+    and no attempt is started or waited for beyond the deadline of the whole call. Only the idempotent methods and
+    the resend of a signed transaction are retried. A circuit breaker is bound to one node, so a policy which holds
+    one should not be shared by the clients of different nodes.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0, jitter: float = 1.0,
+                 deadline: float = 30.0, idempotency: dict = None, circuit_breaker: CircuitBreaker = None):
+        if max_attempts <= 0:
+            raise SDKException(ErrorCode.param_err('the max attempts should be greater than zero.'))
+        if not 0 <= jitter <= 1:
+            raise SDKException(ErrorCode.param_err('the jitter should be in [0, 1].'))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.idempotency = dict(DEFAULT_IDEMPOTENCY)
+        if idempotency is not None:
+            self.idempotency.update(idempotency)
+        self.circuit_breaker = circuit_breaker
+        self.calls = 0
+        self.retries = 0
+        self.duplicates = 0
+
+    def __iter__(self):
+        data = dict(calls=self.calls, retries=self.retries, duplicates=self.duplicates)
+        if self.circuit_breaker is not None:
+            data['circuit_state'] = self.circuit_breaker.state
+            data['circuit_rejected'] = self.circuit_breaker.rejected
+        for key, value in data.items():
+            yield (key, value)
+
+    def get_idempotency(self, method: str) -> str:
+        return self.idempotency.get(method, Idempotency.IDEMPOTENT)
+
+    def get_delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+    def __before_attempt(self, url: str, end_time: float, timeout: float) -> float:
+        remaining = end_time - monotonic()
+        if remaining <= 0:
+            raise SDKException(ErrorCode.connect_timeout(url))
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise SDKException(ErrorCode.circuit_breaker_open(url))
+        return min(timeout, remaining)
+
+    def __after_attempt(self, error: Exception = None):
+        if self.circuit_breaker is None:
+            return
+        if is_connection_error(error):
+            self.circuit_breaker.on_failure()
+        else:
+            self.circuit_breaker.on_success()
+
+    def __get_retry_delay(self, idempotency: str, attempt: int, error: SDKException, end_time: float) -> float or None:
+        if idempotency == Idempotency.UNSAFE or attempt + 1 >= self.max_attempts:
+            return None
+        if not is_connection_error(error) or error.args[0] == CIRCUIT_BREAKER_OPEN_CODE:
+            return None
+        delay = self.get_delay(attempt)
+        if monotonic() + delay >= end_time:
+            return None
+        self.retries += 1
+        return delay
+
+    def __is_resent(self, idempotency: str, attempt: int, error: SDKException, on_duplicate) -> bool:
+        if on_duplicate is None or idempotency != Idempotency.RESEND or attempt == 0:
+            return False
+        if not is_duplicated_tx_error(error):
+            return False
+        self.duplicates += 1
+        return True
+
+    def call(self, url: str, method: str, send: Callable[[float], Any], timeout: float = DEFAULT_TIMEOUT,
+             on_duplicate: Callable[[], Any] = None, on_retry: Callable[[int, SDKException], None] = None):
+        """
+        Call send(timeout) until it succeeds or the retries are exhausted.
+
+        :param on_duplicate: return the result of a transaction which is rejected as a duplicate on a resend,
+            i.e. which has been accepted by the node on an earlier attempt.
+        :param on_retry: called with the number of the next attempt and the error before each retry.
+        """
+        self.calls += 1
+        idempotency = self.get_idempotency(method)
+        end_time = monotonic() + self.deadline
+        attempt = 0
+        while True:
+            attempt_timeout = self.__before_attempt(url, end_time, timeout)
+            try:
+                result = send(attempt_timeout)
+            except SDKException as e:
+                self.__after_attempt(e)
+                if self.__is_resent(idempotency, attempt, e, on_duplicate):
+                    return on_duplicate()
+                delay = self.__get_retry_delay(idempotency, attempt, e, end_time)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt + 1, e)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.__after_attempt()
+            return result
+
+    async def aio_call(self, url: str, method: str, send: Callable[[float], Awaitable],
+                       timeout: float = DEFAULT_TIMEOUT, on_duplicate: Callable[[], Any] = None,
+                       on_retry: Callable[[int, SDKException], None] = None):
+        self.calls += 1
+        idempotency = self.get_idempotency(method)
+        end_time = monotonic() + self.deadline
+        attempt = 0
+        while True:
+            attempt_timeout = self.__before_attempt(url, end_time, timeout)
+            try:
+                result = await send(attempt_timeout)
+            except SDKException as e:
+                self.__after_attempt(e)
+                if self.__is_resent(idempotency, attempt, e, on_duplicate):
+                    return on_duplicate()
+                delay = self.__get_retry_delay(idempotency, attempt, e, end_time)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt + 1, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.__after_attempt()
+            return result
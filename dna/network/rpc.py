@@ -24,7 +24,7 @@ import json
 import requests
 
 from sys import maxsize
-from typing import List
+from typing import List, Tuple, Union
 
 from Cryptodome.Random.random import randint
 
@@ -37,11 +37,18 @@ from dna.utils.transaction import ensure_bytearray_contract_address
 from dna.contract.neo.abi.abi_function import AbiFunction
 from dna.vm.build_params import BuildParams
 from dna.contract.neo.invoke_function import NeoInvokeFunction
+from dna.network.cache import ResponseCache
+from dna.network.throttle import Throttle, ThrottleSlot
+from dna.network.retry import Idempotency, RetryPolicy
+from dna.network.metrics import Instrumentation, InstrumentSlot
+from dna.network.session import PooledSession, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
 
 TEST_RPC_ADDRESS = ['http://polaris1.ont.io:20336', 'http://polaris2.ont.io:20336', 'http://polaris3.ont.io:20336',
                     'http://polaris4.ont.io:20336']
 MAIN_RPC_ADDRESS = ['http://dappnode1.ont.io:20336', 'http://dappnode2.ont.io:20336']
 
+DEFAULT_MAX_BATCH_SIZE = 100
+
 
 class RpcMethod(object):
     GET_VERSION = 'getversion'
@@ -73,10 +80,81 @@ class RpcMethod(object):
 
 
 class Rpc(object):
-    def __init__(self, url: str = '', qid: int = 0):
+    def __init__(self, url: str = '', qid: int = 0, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True,
+                 gzip: bool = True, cache: ResponseCache = None, throttle: Throttle = None,
+                 timeout: float = DEFAULT_TIMEOUT, retry_policy: RetryPolicy = None,
+                 instrumentation: Instrumentation = None):
         self._url = url
         self._qid = qid
         self._generate_qid()
+        self._http = PooledSession(pool_size, keep_alive, gzip)
+        self._cache = cache
+        self._throttle = throttle
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.instrumentation = instrumentation
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        This interface is used to release the pooled connections of the client.
+        """
+        self._http.close()
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: ResponseCache):
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise SDKException(ErrorCode.param_error)
+        self._cache = cache
+
+    @property
+    def throttle(self):
+        return self._throttle
+
+    @throttle.setter
+    def throttle(self, throttle: Throttle):
+        if throttle is not None and not isinstance(throttle, Throttle):
+            raise SDKException(ErrorCode.param_error)
+        self._throttle = throttle
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float):
+        if timeout <= 0:
+            raise SDKException(ErrorCode.param_err('the timeout should be greater than zero.'))
+        self._timeout = timeout
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy: RetryPolicy):
+        if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+            raise SDKException(ErrorCode.param_error)
+        self._retry_policy = retry_policy
+
+    @property
+    def instrumentation(self):
+        return self._instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation: Instrumentation):
+        if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+            raise SDKException(ErrorCode.param_error)
+        self._instrumentation = instrumentation
 
     def set_address(self, url: str):
         self._url = url
@@ -92,27 +170,99 @@ class Rpc(object):
     def connect_to_localhost(self):
         self.set_address('http://localhost:20336')
 
+    def __send(self, url, payload, timeout: float):
+        method = self._get_retry_method(payload) if isinstance(payload, dict) else 'batch'
+        with ThrottleSlot(self._throttle), InstrumentSlot(self._instrumentation, 'rpc', method, url) as info:
+            header = {'Content-type': 'application/json'}
+            try:
+                response = self._http.post(url, json=payload, headers=header, timeout=timeout)
+            except requests.exceptions.MissingSchema as e:
+                raise SDKException(ErrorCode.connect_err(e.args[0])) from None
+            except (requests.exceptions.ConnectTimeout,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.ReadTimeout):
+                raise SDKException(ErrorCode.connect_timeout(url)) from None
+            info.request_bytes = len(response.request.body or b'')
+            info.response_bytes = len(response.content)
+            try:
+                content = response.content.decode('utf-8')
+            except Exception as e:
+                raise SDKException(ErrorCode.other_error(e.args[0])) from None
+            if response.status_code != 200:
+                raise SDKException(ErrorCode.other_error(content))
+            try:
+                content = info.decode(content)
+            except json.decoder.JSONDecodeError as e:
+                raise SDKException(ErrorCode.other_error(e.args[0])) from None
+            if isinstance(content, dict):
+                info.node_error = content.get('error', 0)
+            return content
+
+    def _get_cache_key(self, url, payload) -> str or None:
+        if self._cache is None or not self._cache.is_cacheable(payload['method']):
+            return None
+        return self._cache.get_rpc_key(url, payload)
+
+    def _put_cache(self, key: str or None, payload: dict, content: dict):
+        if key is not None and not self._cache.is_empty_result(content['result']):
+            self._cache.put(payload['method'], key, content)
+
+    async def _aio_put_cache(self, key: str or None, payload: dict, content: dict):
+        if key is not None and not self._cache.is_empty_result(content['result']):
+            await self._cache.aio_put(payload['method'], key, content)
+
     @staticmethod
-    def __post(url, payload):
-        header = {'Content-type': 'application/json'}
-        try:
-            response = requests.post(url, json=payload, headers=header, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0])) from None
-        except (requests.exceptions.ConnectTimeout,
-                requests.exceptions.ConnectionError,
-                requests.exceptions.ReadTimeout):
-            raise SDKException(ErrorCode.connect_timeout(url)) from None
-        try:
-            content = response.content.decode('utf-8')
-        except Exception as e:
-            raise SDKException(ErrorCode.other_error(e.args[0])) from None
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(content))
-        try:
-            content = json.loads(content)
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0])) from None
+    def _get_retry_method(payload: dict) -> str:
+        method = payload['method']
+        params = payload.get('params', list())
+        if method == RpcMethod.SEND_TRANSACTION and len(params) > 1 and params[1] == 1:
+            return 'sendrawtransaction_pre_exec'
+        return method
+
+    def _get_duplicated_tx_response(self, payload: dict) -> dict:
+        tx = Transaction.deserialize_from(bytes.fromhex(payload['params'][0]))
+        return dict(desc='SUCCESS', error=0, id=payload['id'], jsonrpc=RpcMethod.RPC_VERSION,
+                    result=tx.hash256_explorer())
+
+    def _get_batch_retry_method(self, batch_payload: List[dict]) -> str:
+        """
+        A batch is retried as its least idempotent call.
+        """
+        if self._retry_policy is None:
+            return 'batch'
+        method = 'batch'
+        for payload in batch_payload:
+            idempotency = self._retry_policy.get_idempotency(self._get_retry_method(payload))
+            if idempotency == Idempotency.UNSAFE:
+                return self._get_retry_method(payload)
+            if idempotency == Idempotency.RESEND:
+                method = self._get_retry_method(payload)
+        return method
+
+    def _get_retry_hook(self, protocol: str, method: str):
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.retry_hook(protocol, method)
+
+    def _call(self, method: str, send, on_duplicate=None):
+        if self._retry_policy is None:
+            return send(self._timeout)
+        return self._retry_policy.call(self._url, method, send, self._timeout, on_duplicate,
+                                       self._get_retry_hook('rpc', method))
+
+    def __post(self, url, payload):
+        key = self._get_cache_key(url, payload)
+        if key is not None:
+            is_hit, content = self._cache.get(payload['method'], key)
+            if is_hit:
+                return content
+        content = self._call(self._get_retry_method(payload), lambda timeout: self.__request(url, payload, timeout),
+                             lambda: self._get_duplicated_tx_response(payload))
+        self._put_cache(key, payload, content)
+        return content
+
+    def __request(self, url, payload, timeout: float):
+        content = self.__send(url, payload, timeout)
         if content['error'] != 0:
             if content['result'] != '':
                 raise SDKException(ErrorCode.other_error(content['result'])) from None
@@ -120,31 +270,31 @@ class Rpc(object):
                 raise SDKException(ErrorCode.other_error(content['desc'])) from None
         return content
 
-    @staticmethod
-    def __get(url, payload):
-        header = {'Content-type': 'application/json'}
-        try:
-            response = requests.get(url, params=json.dumps(payload), headers=header, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout):
-            raise SDKException(ErrorCode.connect_timeout(url)) from None
-        try:
-            content = response.content.decode('utf-8')
-        except Exception as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(content))
-        try:
-            content = json.loads(content)
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
-        if content['error'] != 0:
-            if content['result'] != '':
-                raise SDKException(ErrorCode.other_error(content['result']))
-            else:
-                raise SDKException(ErrorCode.other_error(content['desc']))
-        return content
+    def __get(self, url, payload):
+        with ThrottleSlot(self._throttle):
+            header = {'Content-type': 'application/json'}
+            try:
+                response = self._http.get(url, params=json.dumps(payload), headers=header, timeout=self._timeout)
+            except requests.exceptions.MissingSchema as e:
+                raise SDKException(ErrorCode.connect_err(e.args[0]))
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout):
+                raise SDKException(ErrorCode.connect_timeout(url)) from None
+            try:
+                content = response.content.decode('utf-8')
+            except Exception as e:
+                raise SDKException(ErrorCode.other_error(e.args[0]))
+            if response.status_code != 200:
+                raise SDKException(ErrorCode.other_error(content))
+            try:
+                content = json.loads(content)
+            except json.decoder.JSONDecodeError as e:
+                raise SDKException(ErrorCode.other_error(e.args[0]))
+            if content['error'] != 0:
+                if content['result'] != '':
+                    raise SDKException(ErrorCode.other_error(content['result']))
+                else:
+                    raise SDKException(ErrorCode.other_error(content['desc']))
+            return content
 
     def generate_json_rpc_payload(self, method, param=None):
         if param is None:
@@ -152,6 +302,82 @@ class Rpc(object):
         json_rpc_payload = dict(jsonrpc=RpcMethod.RPC_VERSION, id=self._qid, method=method, params=param)
         return json_rpc_payload
 
+    def generate_json_rpc_batch_payload(self, calls: List[Union[str, Tuple[str, list]]],
+                                        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> List[List[dict]]:
+        """
+        This interface is used to generate the JSON-RPC 2.0 batch payloads of a list of calls.
+
+        :param calls: a list of RpcMethod names or (RpcMethod name, params) tuples.
+        :param max_batch_size: the maximum number of calls in one batch payload.
+        :return: a list of batch payloads, each one holds at most max_batch_size calls.
+        """
+        if max_batch_size <= 0:
+            raise SDKException(ErrorCode.param_err('the max batch size should be greater than zero.'))
+        payload_list = list()
+        for index, call in enumerate(calls):
+            if isinstance(call, str):
+                method, param = call, None
+            else:
+                method, param = call
+            payload = self.generate_json_rpc_payload(method, param)
+            payload['id'] = index
+            if index % max_batch_size == 0:
+                payload_list.append(list())
+            payload_list[-1].append(payload)
+        return payload_list
+
+    @staticmethod
+    def parse_json_rpc_batch_response(batch_payload: List[dict], batch_response: list, is_full: bool = False) -> list:
+        """
+        This interface is used to map the responses of a batch request back to its calls by id.
+
+        :return: a list in the order of calls. A failed call is represented by an SDKException value.
+        """
+        if not isinstance(batch_response, list):
+            if isinstance(batch_response, dict) and batch_response.get('error', 0) != 0:
+                error = SDKException(ErrorCode.other_error(batch_response.get('desc', '')))
+                return [error] * len(batch_payload)
+            raise SDKException(ErrorCode.other_error('invalid batch response.'))
+        response_map = dict()
+        for response in batch_response:
+            if isinstance(response, dict):
+                response_map[response.get('id')] = response
+        result_list = list()
+        for payload in batch_payload:
+            response = response_map.get(payload['id'])
+            if response is None:
+                msg = f'no response of {payload["method"]} in batch.'
+                result_list.append(SDKException(ErrorCode.other_error(msg)))
+                continue
+            error = response.get('error', 0)
+            if isinstance(error, dict):
+                result_list.append(SDKException(ErrorCode.other_error(error.get('message', ''))))
+            elif error != 0:
+                msg = response.get('result', '') or response.get('desc', '')
+                result_list.append(SDKException(ErrorCode.other_error(msg)))
+            elif is_full:
+                result_list.append(response)
+            else:
+                result_list.append(response.get('result'))
+        return result_list
+
+    def batch(self, calls: List[Union[str, Tuple[str, list]]], max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+              is_full: bool = False) -> list:
+        """
+        This interface is used to send a list of calls in JSON-RPC 2.0 batch requests.
+
+        :param calls: a list of RpcMethod names or (RpcMethod name, params) tuples.
+        :param max_batch_size: the maximum number of calls sent in one request.
+        :param is_full: whether to return the full response of each call.
+        :return: a list of results in the order of calls. A failed call is represented by an SDKException value.
+        """
+        result_list = list()
+        for batch_payload in self.generate_json_rpc_batch_payload(calls, max_batch_size):
+            method = self._get_batch_retry_method(batch_payload)
+            batch_response = self._call(method, lambda timeout: self.__send(self._url, batch_payload, timeout))
+            result_list.extend(self.parse_json_rpc_batch_response(batch_payload, batch_response, is_full))
+        return result_list
+
     def get_version(self, is_full: bool = False) -> dict or str:
         """
         This interface is used to get the version information of the connected node in current network.
@@ -226,6 +452,28 @@ class Rpc(object):
             return response
         return response['result']
 
+    def get_raw_block_by_height(self, height: int, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized block by block height in current network,
+        which could be decoded by Block.deserialize_from.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_BLOCK, [height, 0])
+        response = self.__post(self._url, payload)
+        if is_full:
+            return response
+        return response['result']
+
+    def get_raw_block_by_hash(self, block_hash: str, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized block by block hash in current network,
+        which could be decoded by Block.deserialize_from.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_BLOCK, [block_hash, 0])
+        response = self.__post(self._url, payload)
+        if is_full:
+            return response
+        return response['result']
+
     def get_block_count(self, is_full: bool = False) -> int or dict:
         """
         This interface is used to get the decimal block number in current network.
@@ -245,7 +493,7 @@ class Rpc(object):
             the decimal total height of blocks in current network.
         """
         response = self.get_block_count(is_full=True)
-        response['result'] -= 1
+        response = dict(response, result=response['result'] - 1)
         if is_full:
             return response
         return response['result']
@@ -259,7 +507,7 @@ class Rpc(object):
 
     def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
         response = self.get_block_height_by_tx_hash(tx_hash, is_full=True)
-        response['result'] += 1
+        response = dict(response, result=response['result'] + 1)
         if is_full:
             return response
         return response['result']
@@ -380,6 +628,17 @@ class Rpc(object):
             return response
         return response['result']
 
+    def get_raw_transaction(self, tx_hash: str, is_full: bool = False) -> str:
+        """
+        This interface is used to get the hexadecimal serialized transaction based on the specified hash value,
+        which could be decoded by Transaction.deserialize_from.
+        """
+        payload = self.generate_json_rpc_payload(RpcMethod.GET_TRANSACTION, [tx_hash, 0])
+        response = self.__post(self._url, payload)
+        if is_full:
+            return response
+        return response['result']
+
     def get_contract(self, hex_contract_address: str, is_full: bool = False) -> dict:
         """
         This interface is used to get the information of smart contract based on the specified hexadecimal hash value.
@@ -0,0 +1,171 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import threading
+
+import requests
+
+from aiohttp import TCPConnector
+from aiohttp.client import ClientSession
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_AIO_LIMIT = 100
+DEFAULT_KEEP_ALIVE_TIMEOUT = 15.0
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_TIMEOUT = 10
+
+
+class PooledSession(object):
+    """
+    A lazily created `requests.Session` which keeps connections to the node alive
+    and shares them between the threads that use the same network client.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, gzip: bool = True):
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._gzip = gzip
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def keep_alive(self) -> bool:
+        return self._keep_alive
+
+    @property
+    def gzip(self) -> bool:
+        return self._gzip
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.__create_session()
+        return self._session
+
+    def __create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size, pool_block=True)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Connection'] = 'keep-alive' if self._keep_alive else 'close'
+        session.headers['Accept-Encoding'] = 'gzip, deflate' if self._gzip else 'identity'
+        return session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class AioPooledSession(object):
+    """
+    A lazily created `aiohttp.ClientSession` whose connector keeps the connection pool
+    and DNS cache alive across calls. An owned session is bound to the event loop it was
+    created on and is recreated when it is used from another loop. A session injected by
+    the caller is used as is and never closed by this object.
+    """
+
+    def __init__(self, session: ClientSession = None, limit: int = DEFAULT_AIO_LIMIT, limit_per_host: int = 0,
+                 keepalive_timeout: float = DEFAULT_KEEP_ALIVE_TIMEOUT):
+        self._session = session
+        self._owned = session is None
+        self._loop = None
+        self._retired = list()
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+
+    @property
+    def session(self) -> ClientSession:
+        return self._session
+
+    @session.setter
+    def session(self, session: ClientSession):
+        self.__retire()
+        self._session = session
+        self._owned = False
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def limit_per_host(self) -> int:
+        return self._limit_per_host
+
+    @property
+    def keepalive_timeout(self) -> float:
+        return self._keepalive_timeout
+
+    def __retire(self):
+        if self._owned and self._session is not None:
+            self._retired.append((self._session, self._loop))
+        self._session = None
+        self._loop = None
+
+    async def __close_retired(self):
+        loop = asyncio.get_event_loop()
+        retired, self._retired = self._retired, list()
+        for session, session_loop in retired:
+            if session.closed:
+                continue
+            if session_loop is not None and session_loop is not loop and session_loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+                continue
+            try:
+                await session.close()
+            except RuntimeError:
+                pass
+
+    async def get_session(self) -> ClientSession:
+        loop = asyncio.get_event_loop()
+        if self._owned and self._session is not None and self._loop is not loop:
+            self.__retire()
+        if self._retired:
+            await self.__close_retired()
+        if self._session is None or (self._owned and self._session.closed):
+            connector = TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host,
+                                     keepalive_timeout=self._keepalive_timeout, ttl_dns_cache=DEFAULT_DNS_CACHE_TTL)
+            self._session = ClientSession(connector=connector)
+            self._owned = True
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._owned:
+            self.__retire()
+        await self.__close_retired()
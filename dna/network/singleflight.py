@@ -0,0 +1,70 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import copy
+import asyncio
+
+from typing import Callable, Awaitable, Hashable
+
+
+class SingleFlight(object):
+    """
+    Coalesce the identical in-flight requests, so that the concurrent callers with the same key share one request.
+
+    The shared request is shielded, so a cancelled caller does not cancel the request of the others. A key is
+    removed as soon as its request completes, hence the later callers always send a new request. Each coalesced
+    caller gets its own copy of the result, so that a caller which modifies its result does not affect the others.
+    """
+
+    def __init__(self):
+        self.__in_flight = dict()
+        self.requests = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self.__in_flight)
+
+    def __iter__(self):
+        data = dict(requests=self.requests, coalesced=self.coalesced, in_flight=len(self.__in_flight))
+        for key, value in data.items():
+            yield (key, value)
+
+    def __done(self, key: Hashable, task: asyncio.Future):
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+        if not task.cancelled():
+            # retrieve the exception, in case that all the callers have been cancelled.
+            task.exception()
+
+    async def request(self, key: Hashable, send: Callable[[], Awaitable]):
+        """
+        Await the in-flight request of the key, or start one by send().
+        """
+        task = self.__in_flight.get(key)
+        if task is None:
+            self.requests += 1
+            task = asyncio.ensure_future(send())
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda _: self.__done(key, task))
+            return await asyncio.shield(task)
+        self.coalesced += 1
+        return copy.deepcopy(await asyncio.shield(task))
@@ -0,0 +1,48 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+class RequestSlot(object):
+    """
+    The context of one request, which can be used by both `with` and `async with`. A subclass implements enter and
+    exit, and overrides aio_enter if entering may wait.
+    """
+
+    def enter(self):
+        return self
+
+    async def aio_enter(self):
+        return self.enter()
+
+    def exit(self, error: BaseException or None):
+        pass
+
+    def __enter__(self):
+        return self.enter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.exit(exc_val)
+
+    async def __aenter__(self):
+        return await self.aio_enter()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.exit(exc_val)
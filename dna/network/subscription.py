@@ -0,0 +1,272 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+
+from enum import Enum
+from typing import List, Union
+from collections import deque
+
+from websockets.exceptions import WebSocketException
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+
+
+class OverflowPolicy(Enum):
+    Block = 'block'
+    DropOldest = 'drop_oldest'
+    DropNewest = 'drop_newest'
+
+
+class SubscriptionGap(object):
+    """
+    A marker yielded by SubscriptionStream when the pushed messages of some block heights may have been missed,
+    e.g. while reconnecting. The range is inclusive and may overlap blocks which were already delivered.
+    """
+
+    def __init__(self, start_height: int, end_height: int, reason: str = ''):
+        self.start_height = start_height
+        self.end_height = end_height
+        self.reason = reason
+
+    def __iter__(self):
+        data = dict(StartHeight=self.start_height, EndHeight=self.end_height, Reason=self.reason)
+        for key, value in data.items():
+            yield (key, value)
+
+    def __repr__(self):
+        return f'SubscriptionGap({self.start_height}, {self.end_height}, {self.reason!r})'
+
+
+class SubscriptionStream(object):
+    """
+    An async iterator over the messages pushed by a Websocket subscription.
+
+    The stream keeps the connection alive with heartbeats. When the connection drops, it reconnects with
+    exponential backoff, re-issues the subscription and yields a SubscriptionGap for the block heights
+    produced in the meantime so that the consumer can backfill them. Any other error closes the stream and is
+    raised to the consumer once the buffered messages are consumed.
+    """
+
+    def __init__(self, ws, contract_address_list: Union[List[str], str], is_event: bool = False,
+                 is_json_block: bool = False, is_raw_block: bool = False, is_tx_hash: bool = False,
+                 is_full: bool = False, max_queue_size: int = 1024,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DropOldest, heartbeat_interval: float = 30,
+                 reconnect_delay: float = 1, max_reconnect_delay: float = 60):
+        if max_queue_size <= 0:
+            raise SDKException(ErrorCode.param_err('the max queue size should be greater than zero.'))
+        self.__ws = ws
+        self.__subscribe_args = (contract_address_list, is_event, is_json_block, is_raw_block, is_tx_hash)
+        self.__is_full = is_full
+        self.__max_queue_size = max_queue_size
+        self.__overflow_policy = OverflowPolicy(overflow_policy)
+        self.__heartbeat_interval = heartbeat_interval
+        self.__reconnect_delay = reconnect_delay
+        self.__max_reconnect_delay = max_reconnect_delay
+        self.__buffer = deque()
+        self.__msg_count = 0
+        self.__condition = None
+        self.__task = None
+        self.__closed = False
+        self.__error = None
+        self.__height = None
+        self.__tip_height = None
+        self.dropped_count = 0
+        self.reconnect_count = 0
+
+    @property
+    def height(self) -> int:
+        """
+        The highest block height known to be covered by the delivered messages.
+        """
+        return self.__height
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def start(self):
+        if self.__task is None and not self.__closed:
+            self.__task = asyncio.ensure_future(self.__run())
+
+    async def close(self):
+        self.__closed = True
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.wait([self.__task])
+            self.__task = None
+        async with self.__get_condition():
+            self.__condition.notify_all()
+
+    def __aiter__(self):
+        self.start()
+        return self
+
+    async def __anext__(self):
+        async with self.__get_condition():
+            while len(self.__buffer) == 0:
+                if self.__error is not None:
+                    raise self.__error
+                if self.__closed:
+                    raise StopAsyncIteration
+                await self.__condition.wait()
+            item = self.__buffer.popleft()
+            if not isinstance(item, SubscriptionGap):
+                self.__msg_count -= 1
+            self.__condition.notify_all()
+        if isinstance(item, SubscriptionGap) or self.__is_full:
+            return item
+        return item.get('Result', dict())
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __get_condition(self) -> asyncio.Condition:
+        if self.__condition is None:
+            self.__condition = asyncio.Condition()
+        return self.__condition
+
+    async def __run(self):
+        try:
+            await self.__reconnect_forever()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.__error = e
+        finally:
+            self.__closed = True
+            async with self.__get_condition():
+                self.__condition.notify_all()
+
+    async def __reconnect_forever(self):
+        delay = self.__reconnect_delay
+        while not self.__closed:
+            try:
+                await self.__ws.subscribe(*self.__subscribe_args)
+                await self.__sync_height(is_subscribed=True)
+                delay = self.__reconnect_delay
+                await self.__serve()
+            except (SDKException, OSError, asyncio.TimeoutError, WebSocketException):
+                pass
+            await self.__ws.close_connect()
+            self.reconnect_count += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.__max_reconnect_delay)
+
+    async def __serve(self):
+        tasks = [asyncio.ensure_future(self.__pump()), asyncio.ensure_future(self.__heartbeat()),
+                 asyncio.ensure_future(self.__ws.wait_closed())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    async def __pump(self):
+        while True:
+            msg = await self.__ws.recv_subscribe_info(is_full=True)
+            await self.__put(msg)
+
+    async def __heartbeat(self):
+        while True:
+            await asyncio.sleep(self.__heartbeat_interval)
+            await self.__ws.send_heartbeat()
+            await self.__sync_height()
+
+    async def __sync_height(self, is_subscribed: bool = False):
+        """
+        Record the chain tip. Between reconnections, the height covered by the stream lags one heartbeat behind
+        the tip, so that a reported gap also covers blocks whose messages may still have been in flight.
+        """
+        tip_height = await self.__ws.get_block_height()
+        if is_subscribed and self.__height is not None and tip_height > self.__height:
+            await self.__put_gap(self.__height + 1, tip_height, 'reconnect')
+        if is_subscribed or self.__tip_height is None:
+            self.__height = tip_height
+        else:
+            self.__height = max(self.__height, self.__tip_height)
+        self.__tip_height = tip_height
+
+    async def __put(self, msg: dict):
+        async with self.__get_condition():
+            if self.__overflow_policy == OverflowPolicy.Block:
+                while self.__msg_count >= self.__max_queue_size:
+                    await self.__condition.wait()
+            elif self.__msg_count >= self.__max_queue_size:
+                self.dropped_count += 1
+                if self.__overflow_policy == OverflowPolicy.DropNewest:
+                    self.__put_gap_nowait(self.get_msg_height(msg), 'overflow')
+                    return
+                index = next(i for i, item in enumerate(self.__buffer) if not isinstance(item, SubscriptionGap))
+                height = self.get_msg_height(self.__buffer[index])
+                del self.__buffer[index]
+                self.__msg_count -= 1
+                if height is not None:
+                    self.__insert_gap(index, SubscriptionGap(height, height, 'overflow'))
+            height = self.get_msg_height(msg)
+            if height is not None and self.__height is not None:
+                self.__height = max(self.__height, height)
+            self.__buffer.append(msg)
+            self.__msg_count += 1
+            self.__condition.notify_all()
+
+    async def __put_gap(self, start_height: int, end_height: int, reason: str):
+        async with self.__get_condition():
+            self.__append_gap(SubscriptionGap(start_height, end_height, reason))
+            self.__condition.notify_all()
+
+    def __put_gap_nowait(self, height: int or None, reason: str):
+        if height is not None:
+            self.__append_gap(SubscriptionGap(height, height, reason))
+
+    def __append_gap(self, gap: SubscriptionGap):
+        self.__insert_gap(len(self.__buffer), gap)
+
+    def __insert_gap(self, index: int, gap: SubscriptionGap):
+        if index > 0 and isinstance(self.__buffer[index - 1], SubscriptionGap):
+            last_gap = self.__buffer[index - 1]
+            if last_gap.reason == gap.reason and gap.start_height <= last_gap.end_height + 1:
+                last_gap.start_height = min(last_gap.start_height, gap.start_height)
+                last_gap.end_height = max(last_gap.end_height, gap.end_height)
+                return
+        self.__buffer.insert(index, gap)
+
+    @staticmethod
+    def get_msg_height(msg: dict) -> int or None:
+        result = msg.get('Result')
+        if not isinstance(result, dict):
+            return None
+        if isinstance(result.get('Height'), int):
+            return result['Height']
+        header = result.get('Header')
+        if isinstance(header, dict) and isinstance(header.get('Height'), int):
+            return header['Height']
+        return None
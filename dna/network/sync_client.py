@@ -0,0 +1,172 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import inspect
+import threading
+
+from concurrent.futures import Future
+from typing import Awaitable
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+
+__shared_loop_thread__ = None
+__shared_loop_thread_lock__ = threading.Lock()
+
+
+class EventLoopThread(object):
+    """
+    An event loop which runs forever in a daemon thread, so that blocking code of any thread can submit coroutines
+    to it and share the async clients, their pooled connections and their in-flight requests.
+    """
+
+    def __init__(self, name: str = 'dna-event-loop'):
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        asyncio.set_event_loop(self.__loop)
+        self.__loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.__loop
+
+    @property
+    def closed(self) -> bool:
+        return self.__loop.is_closed()
+
+    def is_in_loop_thread(self) -> bool:
+        return threading.current_thread() is self.__thread
+
+    def submit(self, coroutine: Awaitable) -> Future:
+        """
+        Schedule a coroutine on the loop, and return a concurrent.futures.Future of its result.
+        """
+        if self.closed:
+            coroutine.close()
+            raise SDKException(ErrorCode.other_error('the event loop thread is closed.'))
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+
+    def run(self, coroutine: Awaitable, timeout: float = None):
+        """
+        Run a coroutine on the loop, and block until its result is available.
+        """
+        if self.is_in_loop_thread():
+            coroutine.close()
+            raise SDKException(ErrorCode.other_error('blocking on the event loop thread would deadlock.'))
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self):
+        if self.closed:
+            return
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+
+def get_shared_loop_thread() -> EventLoopThread:
+    """
+    Return the event loop thread shared by the synchronous facades, which is started on the first use.
+    """
+    global __shared_loop_thread__
+    with __shared_loop_thread_lock__:
+        if __shared_loop_thread__ is None or __shared_loop_thread__.closed:
+            __shared_loop_thread__ = EventLoopThread()
+        return __shared_loop_thread__
+
+
+class SyncClient(object):
+    """
+    The blocking facade of an async client, e.g. AioRpc, AioRestful or Websocket:
+
+        rpc = SyncClient(AioRpc(address))
+        height = rpc.get_block_height()
+
+    The coroutines are run on one shared event loop thread, so the calls of all threads share the connection pool,
+    the request coalescing and the concurrency of the async client. The async iterators are exposed as generators.
+    """
+
+    def __init__(self, client, loop_thread: EventLoopThread = None):
+        self._client = client
+        self._loop_thread = loop_thread if loop_thread is not None else get_shared_loop_thread()
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def loop_thread(self) -> EventLoopThread:
+        return self._loop_thread
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        close = getattr(self._client, 'close_connect', None) or getattr(self._client, 'close', None)
+        if close is None:
+            return
+        if inspect.iscoroutinefunction(close):
+            self._loop_thread.run(close())
+        else:
+            close()
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        return self._make_call(attr)
+
+    def _make_call(self, func):
+        def call(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._loop_thread.run(result)
+            if hasattr(result, '__anext__'):
+                return self._iterate(result)
+            return result
+
+        call.__name__ = func.__name__
+        return call
+
+    def _iterate(self, async_iterator):
+        try:
+            while True:
+                try:
+                    yield self._loop_thread.run(async_iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(async_iterator, 'aclose'):
+                self._loop_thread.run(async_iterator.aclose())
@@ -0,0 +1,278 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+import asyncio
+import threading
+
+from time import monotonic
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.endpoint import is_connection_error
+from dna.network.slot import RequestSlot
+
+
+def is_overload_error(e: BaseException) -> bool:
+    """
+    Whether an error means that the node is overloaded or throttling, rather than that it has answered a request.
+    """
+    if isinstance(e, asyncio.CancelledError):
+        return False
+    if isinstance(e, SDKException):
+        return is_connection_error(e)
+    return isinstance(e, Exception)
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket, whose rate is adapted additively-increase and multiplicatively-decrease:
+    the rate backs off by backoff_ratio at most once per second on overload, and recovers by increase_ratio
+    of the max rate on each success.
+    """
+
+    def __init__(self, rate: float, burst: int = 0, min_rate: float = 1, backoff_ratio: float = 0.5,
+                 increase_ratio: float = 0.01, adaptive: bool = True):
+        if rate <= 0:
+            raise SDKException(ErrorCode.param_err('the rate should be greater than zero.'))
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst > 0 else max(1, int(rate))
+        self.min_rate = min(min_rate, rate)
+        self.backoff_ratio = backoff_ratio
+        self.increase_ratio = increase_ratio
+        self.adaptive = adaptive
+        self.__tokens = float(self.burst)
+        self.__updated_at = monotonic()
+        self.__backoff_at = 0.0
+        self.__lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, and return the seconds to wait before the token can be used.
+        """
+        with self.__lock:
+            now = monotonic()
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_at) * self.rate)
+            self.__updated_at = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.rate
+
+    def on_success(self):
+        if not self.adaptive:
+            return
+        with self.__lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.increase_ratio)
+
+    def on_overload(self):
+        if not self.adaptive:
+            return
+        with self.__lock:
+            now = monotonic()
+            if now - self.__backoff_at < 1:
+                return
+            self.__backoff_at = now
+            self.rate = max(self.min_rate, self.rate * self.backoff_ratio)
+
+
+class AdaptiveConcurrency(object):
+    """
+    A thread-safe concurrency limit which is adapted additively-increase and multiplicatively-decrease.
+
+    Each success increases the limit by 1 / limit, i.e. by one per round trip of a full window. The limit backs
+    off by backoff_ratio at most once per round trip when a request fails with an overload error, or when the
+    latency exceeds latency_tolerance times the best recent latency, which means that the requests are queued.
+    """
+
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 128, backoff_ratio: float = 0.5,
+                 latency_tolerance: float = 2.0):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise SDKException(ErrorCode.param_err('1 <= min_limit <= initial_limit <= max_limit is required.'))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.__limit = float(initial_limit)
+        self.__in_flight = 0
+        self.__min_latency = None
+        self.__backoff_at = 0.0
+        self.__lock = threading.Lock()
+        self.__condition = threading.Condition(self.__lock)
+        self.__aio_waiters = list()
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    def try_acquire(self) -> bool:
+        with self.__lock:
+            if self.__in_flight >= int(self.__limit):
+                return False
+            self.__in_flight += 1
+            return True
+
+    def acquire(self):
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait()
+            self.__in_flight += 1
+
+    async def aio_acquire(self):
+        while not self.try_acquire():
+            loop = asyncio.get_event_loop()
+            waiter = loop.create_future()
+            with self.__lock:
+                self.__aio_waiters.append((loop, waiter))
+            if self.try_acquire():
+                return
+            await waiter
+
+    def __wake_up_waiters(self):
+        with self.__lock:
+            waiters, self.__aio_waiters = self.__aio_waiters, list()
+        for loop, waiter in waiters:
+            if not waiter.done():
+                loop.call_soon_threadsafe(self.__set_waiter, waiter)
+
+    @staticmethod
+    def __set_waiter(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, latency: float = None, error: BaseException = None):
+        """
+        Release a slot, and adapt the limit by the latency or the error of the request. The limit is kept
+        when neither is given, e.g. when the request is cancelled.
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            now = monotonic()
+            if error is not None and is_overload_error(error):
+                self.__backoff(now, latency)
+            elif latency is not None:
+                if self.__min_latency is None or latency < self.__min_latency:
+                    self.__min_latency = latency
+                else:
+                    # let the baseline drift slowly, so that it follows a permanent change of the route.
+                    self.__min_latency *= 1.01
+                if latency > self.__min_latency * self.latency_tolerance:
+                    self.__backoff(now, latency)
+                else:
+                    self.__limit = min(self.max_limit, self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+        self.__wake_up_waiters()
+
+    def __backoff(self, now: float, latency: float or None):
+        rtt = latency if latency is not None else self.__min_latency or 0
+        if now - self.__backoff_at < rtt:
+            return
+        self.__backoff_at = now
+        self.__limit = max(self.min_limit, self.__limit * self.backoff_ratio)
+
+
+class Throttle(object):
+    """
+    The rate limit and the adaptive concurrency limit of requests to one node:
+
+        rpc = Rpc(address, throttle=Throttle(TokenBucket(rate=50), AdaptiveConcurrency(max_limit=32)))
+
+    Both limits are optional, and both adapt to the latency and the overload errors of the node.
+    """
+
+    def __init__(self, rate_limiter: TokenBucket = None, concurrency: AdaptiveConcurrency = None):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.requests = 0
+        self.overloads = 0
+
+    def __iter__(self):
+        data = dict(requests=self.requests, overloads=self.overloads)
+        if self.rate_limiter is not None:
+            data['rate'] = self.rate_limiter.rate
+        if self.concurrency is not None:
+            data['limit'] = self.concurrency.limit
+            data['in_flight'] = self.concurrency.in_flight
+        for key, value in data.items():
+            yield (key, value)
+
+    def acquire(self) -> float:
+        """
+        Block until a request is allowed, and return its start time.
+        """
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                time.sleep(delay)
+        if self.concurrency is not None:
+            self.concurrency.acquire()
+        return monotonic()
+
+    async def aio_acquire(self) -> float:
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if self.concurrency is not None:
+            await self.concurrency.aio_acquire()
+        return monotonic()
+
+    def release(self, start: float, error: BaseException = None):
+        self.requests += 1
+        is_cancelled = isinstance(error, asyncio.CancelledError)
+        if error is not None and is_overload_error(error):
+            self.overloads += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_overload()
+        elif not is_cancelled and self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+        if self.concurrency is not None:
+            self.concurrency.release(None if is_cancelled else monotonic() - start, error)
+
+
+class ThrottleSlot(RequestSlot):
+    """
+    The slot of one request under an optional throttle.
+    """
+
+    def __init__(self, throttle: Throttle or None):
+        self.__throttle = throttle
+        self.__start = 0.0
+
+    def enter(self):
+        if self.__throttle is not None:
+            self.__start = self.__throttle.acquire()
+        return self
+
+    async def aio_enter(self):
+        if self.__throttle is not None:
+            self.__start = await self.__throttle.aio_acquire()
+        return self
+
+    def exit(self, error: BaseException or None):
+        if self.__throttle is not None:
+            self.__throttle.release(self.__start, error)
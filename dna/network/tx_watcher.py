@@ -0,0 +1,247 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import inspect
+
+from time import monotonic
+
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.endpoint import is_connection_error
+from dna.network.subscription import SubscriptionGap, SubscriptionStream
+from dna.network.sync_client import EventLoopThread, get_shared_loop_thread
+
+DEFAULT_POLL_INTERVAL = 1
+DEFAULT_MEM_POOL_CHECK_INTERVAL = 10
+DEFAULT_DROP_TIMEOUT = 60
+
+
+class PendingTx(object):
+    def __init__(self, tx_hash: str, future: asyncio.Future):
+        self.tx_hash = tx_hash
+        self.future = future
+        self.checked_at = monotonic()
+        self.missing_since = None
+        self.lookup = None
+
+
+class TxWatcher(object):
+    """
+    Wait for many transactions with one shared watcher of the chain tip:
+
+        event = await TxWatcher(sdk.aio_rpc).wait(tx_hash, timeout=60)
+
+    A watched transaction is looked up by its contract event at once, so that one which is already in a block is
+    resolved without waiting for a new block. Each new block is scanned once by its contract events, and the
+    transactions found in it resolve their waiters with their events. A Websocket client is woken by a block
+    subscription instead of polling the block height.
+    The memory pool state of the pending transactions is checked every mem_pool_check_interval, and a transaction
+    which has been neither in the memory pool nor in a block for drop_timeout is failed.
+    """
+
+    def __init__(self, client, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 mem_pool_check_interval: float = DEFAULT_MEM_POOL_CHECK_INTERVAL,
+                 drop_timeout: float = DEFAULT_DROP_TIMEOUT, use_subscription: bool = True):
+        self.__client = client
+        self.poll_interval = poll_interval
+        self.mem_pool_check_interval = mem_pool_check_interval
+        self.drop_timeout = drop_timeout
+        self.__use_subscription = use_subscription and hasattr(client, 'stream')
+        self.__pending = dict()
+        self.__height = None
+        self.__task = None
+        self.__stream = None
+
+    def __len__(self):
+        return len(self.__pending)
+
+    @property
+    def height(self) -> int or None:
+        """
+        The height of the last scanned block.
+        """
+        return self.__height
+
+    def watch(self, tx_hash: str) -> asyncio.Future:
+        """
+        Start watching a transaction, and return a future which is resolved with its contract event.
+        """
+        tx_hash = tx_hash.lower()
+        pending = self.__pending.get(tx_hash)
+        if pending is None:
+            pending = PendingTx(tx_hash, asyncio.get_event_loop().create_future())
+            self.__pending[tx_hash] = pending
+            pending.lookup = asyncio.ensure_future(self.__lookup(pending))
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__run())
+        return pending.future
+
+    def unwatch(self, tx_hash: str):
+        pending = self.__pending.pop(tx_hash.lower(), None)
+        if pending is not None:
+            pending.future.cancel()
+            if pending.lookup is not None:
+                pending.lookup.cancel()
+
+    async def wait(self, tx_hash: str, timeout: float = None) -> dict:
+        """
+        Wait until the transaction is in a block, and return its contract event.
+        """
+        future = self.watch(tx_hash)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.unwatch(tx_hash)
+            raise SDKException(ErrorCode.wait_tx_timeout(tx_hash)) from None
+
+    async def close(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.wait([self.__task])
+            self.__task = None
+        for tx_hash in list(self.__pending):
+            self.unwatch(tx_hash)
+
+    async def __run(self):
+        last_check_time = monotonic()
+        try:
+            if self.__use_subscription:
+                self.__stream = self.__client.stream([], is_tx_hash=True, is_full=True)
+                self.__stream.start()
+            is_first = True
+            while len(self.__pending) != 0:
+                try:
+                    height = None if is_first else await self.__wait_next_block()
+                    is_first = False
+                    if height is None:
+                        height = await self.__client.get_block_height()
+                    await self.__scan(height)
+                    if monotonic() - last_check_time >= self.mem_pool_check_interval:
+                        last_check_time = monotonic()
+                        await self.__check_mem_pool()
+                except SDKException:
+                    # the error is transient to the watcher, and the waiters are bounded by their own timeouts.
+                    continue
+        finally:
+            if self.__stream is not None:
+                await self.__stream.close()
+                self.__stream = None
+            self.__height = None
+
+    async def __wait_next_block(self) -> int or None:
+        if self.__stream is None:
+            await asyncio.sleep(self.poll_interval)
+            return None
+        try:
+            item = await asyncio.wait_for(self.__stream.__anext__(), self.poll_interval)
+        except (asyncio.TimeoutError, StopAsyncIteration):
+            return None
+        if isinstance(item, SubscriptionGap):
+            return item.end_height
+        return SubscriptionStream.get_msg_height(item)
+
+    async def __scan(self, height: int):
+        if self.__height is None:
+            self.__height = height - 1
+        if height <= self.__height:
+            return
+        async for scanned_height, event_list in self.__client.iter_events(self.__height + 1, height + 1):
+            for event in event_list:
+                self.__resolve(event)
+            self.__height = scanned_height
+
+    async def __lookup(self, pending: PendingTx):
+        try:
+            event = await self.__client.get_contract_event_by_tx_hash(pending.tx_hash)
+        except SDKException:
+            return
+        if event:
+            self.__resolve(event)
+
+    def __resolve(self, event: dict):
+        if not isinstance(event, dict):
+            return
+        pending = self.__pending.pop(str(event.get('TxHash', '')).lower(), None)
+        if pending is not None and not pending.future.done():
+            pending.future.set_result(event)
+
+    async def __check_mem_pool(self):
+        now = monotonic()
+        pending_list = [pending for pending in self.__pending.values()
+                        if now - pending.checked_at >= self.mem_pool_check_interval]
+        await asyncio.gather(*[self.__check_tx(pending) for pending in pending_list])
+
+    async def __check_tx(self, pending: PendingTx):
+        pending.checked_at = monotonic()
+        try:
+            await self.__client.get_memory_pool_tx_state(pending.tx_hash)
+            pending.missing_since = None
+            return
+        except SDKException as e:
+            if is_connection_error(e):
+                return
+        try:
+            event = await self.__client.get_contract_event_by_tx_hash(pending.tx_hash)
+        except SDKException as e:
+            if is_connection_error(e):
+                return
+            event = None
+        if event:
+            self.__resolve(event)
+            return
+        if pending.missing_since is None:
+            pending.missing_since = pending.checked_at
+        elif pending.checked_at - pending.missing_since >= self.drop_timeout:
+            if self.__pending.get(pending.tx_hash) is pending:
+                del self.__pending[pending.tx_hash]
+            if not pending.future.done():
+                pending.future.set_exception(SDKException(ErrorCode.tx_dropped(pending.tx_hash)))
+
+
+class SyncTxWatcher(object):
+    """
+    The blocking facade of TxWatcher, which runs the watcher on the shared event loop thread.
+    """
+
+    def __init__(self, client, loop_thread: EventLoopThread = None, **kwargs):
+        self.__client = client
+        self.__loop_thread = loop_thread if loop_thread is not None else get_shared_loop_thread()
+        self.__watcher = TxWatcher(client, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def wait(self, tx_hash: str, timeout: float = None) -> dict:
+        return self.__loop_thread.run(self.__watcher.wait(tx_hash, timeout))
+
+    async def __close(self):
+        await self.__watcher.close()
+        close = getattr(self.__client, 'close_connect', None) or getattr(self.__client, 'close', None)
+        if inspect.iscoroutinefunction(close):
+            await close()
+
+    def close(self):
+        self.__loop_thread.run(self.__close())
@@ -22,9 +22,11 @@ along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
 import socket
+import asyncio
 
 from sys import maxsize
-from websockets import client
+from time import perf_counter
+from websockets import client, exceptions
 from typing import List, Union
 
 from Cryptodome.Random.random import randint
@@ -38,17 +40,35 @@ from dna.contract.neo.abi.abi_function import AbiFunction
 from dna.vm.build_params import BuildParams
 from dna.contract.neo.invoke_function import NeoInvokeFunction
 from dna.utils.transaction import ensure_bytearray_contract_address
+from dna.network.fetcher import AioRangeFetcher
+from dna.network.singleflight import SingleFlight
+from dna.network.session import DEFAULT_TIMEOUT
+from dna.network.throttle import Throttle, ThrottleSlot
+from dna.network.metrics import Instrumentation, InstrumentSlot
+from dna.network.subscription import OverflowPolicy, SubscriptionStream
 
 
-class Websocket(object):
-    def __init__(self, url: str = ''):
+class Websocket(AioRangeFetcher):
+    def __init__(self, url: str = '', coalesce: bool = True, throttle: Throttle = None,
+                 instrumentation: Instrumentation = None, timeout: float = DEFAULT_TIMEOUT):
         self.__url = url
+        self.__timeout = DEFAULT_TIMEOUT
+        self.timeout = timeout
+        self.__throttle = throttle
+        self.__instrumentation = instrumentation
+        self.__single_flight = SingleFlight() if coalesce else None
         self.__id = 0
         self.__ws_client = None
+        self.__reader_task = None
+        self.__connect_lock = None
+        self.__pending = dict()
+        self.__subscribe_queue = None
+        self.dropped_response_count = 0
 
     def __generate_ws_id(self):
         if self.__id == 0:
             self.__id = randint(0, maxsize)
+        self.__id = self.__id % maxsize + 1
         return self.__id
 
     def set_address(self, url: str):
@@ -60,6 +80,49 @@ class Websocket(object):
     def connect_to_localhost(self):
         self.set_address('ws://localhost:20335')
 
+    @property
+    def single_flight(self):
+        return self.__single_flight
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float):
+        if timeout <= 0:
+            raise SDKException(ErrorCode.param_err('the timeout should be greater than zero.'))
+        self.__timeout = timeout
+
+    @property
+    def throttle(self):
+        return self.__throttle
+
+    @throttle.setter
+    def throttle(self, throttle: Throttle):
+        if throttle is not None and not isinstance(throttle, Throttle):
+            raise SDKException(ErrorCode.param_error)
+        self.__throttle = throttle
+
+    @property
+    def instrumentation(self):
+        return self.__instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation: Instrumentation):
+        if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+            raise SDKException(ErrorCode.param_error)
+        self.__instrumentation = instrumentation
+
+    @property
+    def subscribe_queue(self) -> asyncio.Queue:
+        if self.__subscribe_queue is None:
+            self.__subscribe_queue = asyncio.Queue()
+        return self.__subscribe_queue
+
+    def __is_connected(self) -> bool:
+        return self.__ws_client is not None and not self.__ws_client.closed
+
     async def connect(self):
         try:
             self.__ws_client = await client.connect(self.__url)
@@ -67,48 +130,130 @@ class Websocket(object):
             raise SDKException(ErrorCode.other_error(e.args[1])) from None
         except socket.gaierror as e:
             raise SDKException(ErrorCode.other_error(e.args[1])) from None
+        self.__reader_task = asyncio.ensure_future(self.__read_forever(self.__ws_client))
 
     async def close_connect(self):
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+            self.__reader_task = None
         if isinstance(self.__ws_client, client.WebSocketClientProtocol) and not self.__ws_client.closed:
             await self.__ws_client.close()
-
-    async def __send_recv(self, msg: dict, is_full: bool):
-        if self.__ws_client is None or self.__ws_client.closed:
+        self.__fail_pending()
+
+    async def wait_closed(self):
+        """
+        This interface is used to wait until the current connection is closed.
+        """
+        if self.__reader_task is not None:
+            await asyncio.wait([self.__reader_task])
+
+    async def __ensure_connected(self):
+        if self.__is_connected():
+            return
+        if self.__connect_lock is None:
+            self.__connect_lock = asyncio.Lock()
+        async with self.__connect_lock:
+            if self.__is_connected():
+                return
             try:
                 await self.connect()
             except TimeoutError:
                 raise SDKException(ErrorCode.connect_timeout(self.__url)) from None
-        await self.__ws_client.send(json.dumps(msg))
-        response = await self.__ws_client.recv()
-        response = json.loads(response)
+
+    async def __read_forever(self, ws_client):
+        try:
+            async for message in ws_client:
+                start = perf_counter()
+                try:
+                    response = json.loads(message)
+                except json.decoder.JSONDecodeError:
+                    continue
+                self.__dispatch(response, len(message), perf_counter() - start)
+        except (exceptions.ConnectionClosed, asyncio.CancelledError):
+            pass
+        finally:
+            if ws_client is self.__ws_client:
+                self.__fail_pending()
+
+    def __dispatch(self, response: dict, response_bytes: int, decode_time: float):
+        """
+        Hand a response to the request waiting for it. A message without Id which no request waits for is a pushed
+        notification, while a response with an Id whose request has timed out or been cancelled is dropped.
+        """
+        if not isinstance(response, dict):
+            self.dropped_response_count += 1
+            return
+        qid = response.get('Id')
+        if qid is None:
+            action = response.get('Action')
+            pending_qid = next((key for key, pending in self.__pending.items() if pending[0] == action), None)
+            if pending_qid is None:
+                self.subscribe_queue.put_nowait(response)
+                return
+            qid = pending_qid
+        pending = self.__pending.pop(qid, None)
+        if pending is None:
+            self.dropped_response_count += 1
+            return
+        _, future, info = pending
+        info.response_bytes = response_bytes
+        info.decode_time = decode_time
+        if not future.done():
+            future.set_result(response)
+
+    def __fail_pending(self):
+        pending, self.__pending = self.__pending, dict()
+        for _, future, _ in pending.values():
+            if not future.done():
+                future.set_exception(SDKException(ErrorCode.connect_timeout(self.__url)))
+
+    async def __send_recv(self, msg: dict, is_full: bool):
+        if self.__single_flight is not None and msg.get('Action', '').startswith('get'):
+            key = json.dumps(msg, sort_keys=True)
+            response = await self.__single_flight.request(key, lambda: self.__request(msg))
+        else:
+            response = await self.__request(msg)
         if is_full:
             return response
         if response['Error'] != 0:
             raise SDKException(ErrorCode.other_error(response.get('Result', '')))
         return response.get('Result', dict())
 
+    async def __request(self, msg: dict) -> dict:
+        action = msg.get('Action')
+        async with ThrottleSlot(self.__throttle), InstrumentSlot(self.__instrumentation, 'websocket', action,
+                                                                   self.__url) as info:
+            await self.__ensure_connected()
+            qid = self.__generate_ws_id()
+            msg['Id'] = qid
+            future = asyncio.get_event_loop().create_future()
+            self.__pending[qid] = (action, future, info)
+            try:
+                data = json.dumps(msg)
+                info.request_bytes = len(data)
+                await self.__ws_client.send(data)
+                response = await asyncio.wait_for(future, self.__timeout)
+                info.node_error = response.get('Error', 0)
+                return response
+            except (exceptions.ConnectionClosed, asyncio.TimeoutError):
+                raise SDKException(ErrorCode.connect_timeout(self.__url)) from None
+            finally:
+                self.__pending.pop(qid, None)
+
     async def send_heartbeat(self, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='heartbeat', Version='V1.0.0', Id=self.__id)
+        msg = dict(Action='heartbeat', Version='V1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_connection_count(self, is_full: bool = False) -> int:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getconnectioncount', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getconnectioncount', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_session_count(self, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsessioncount', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getsessioncount', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_balance(self, b58_address: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getbalance', Id=self.__id, Version='1.0.0', Addr=b58_address)
+        msg = dict(Action='getbalance', Version='1.0.0', Addr=b58_address)
         response = await self.__send_recv(msg, is_full=True)
         try:
             response['Result'] = dict((k.upper(), int(v)) for k, v in response.get('Result', dict()).items())
@@ -119,48 +264,34 @@ class Websocket(object):
         return response['Result']
 
     async def get_merkle_proof(self, tx_hash: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getmerkleproof', Id=self.__id, Version='1.0.0', Hash=tx_hash, Raw=0)
+        msg = dict(Action='getmerkleproof', Version='1.0.0', Hash=tx_hash, Raw=0)
         return await self.__send_recv(msg, is_full)
 
     async def get_storage(self, hex_contract_address: str, key: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getstorage', Id=self.__id, Version='1.0.0', Hash=hex_contract_address, Key=key)
+        msg = dict(Action='getstorage', Version='1.0.0', Hash=hex_contract_address, Key=key)
         return await self.__send_recv(msg, is_full)
 
     async def get_contract(self, hex_contract_address: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getcontract', Id=self.__id, Version='1.0.0', Hash=hex_contract_address, Raw=0)
+        msg = dict(Action='getcontract', Version='1.0.0', Hash=hex_contract_address, Raw=0)
         response = await self.__send_recv(msg, is_full=True)
         if is_full:
             return response
         return response['Result']
 
     async def get_contract_event_by_tx_hash(self, tx_hash: str, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsmartcodeeventbyhash', Id=self.__id, Version='1.0.0', Hash=tx_hash, Raw=0)
+        msg = dict(Action='getsmartcodeeventbyhash', Version='1.0.0', Hash=tx_hash, Raw=0)
         return await self.__send_recv(msg, is_full)
 
     async def get_contract_event_by_height(self, height: int, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsmartcodeeventbyheight', Id=self.__id, Version='1.0.0', Height=height)
+        msg = dict(Action='getsmartcodeeventbyheight', Version='1.0.0', Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_height(self, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockheight', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getblockheight', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_block_height_by_tx_hash(self, tx_hash: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockheightbytxhash', Id=self.__id, Version='1.0.0', Hash=tx_hash)
+        msg = dict(Action='getblockheightbytxhash', Version='1.0.0', Hash=tx_hash)
         response = await self.__send_recv(msg, is_full=True)
         if response.get('Result', '') == '':
             raise SDKException(ErrorCode.invalid_tx_hash(tx_hash))
@@ -169,58 +300,67 @@ class Websocket(object):
         return response['Result']
 
     async def get_block_hash_by_height(self, height: int, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockhash', Id=self.__id, Version='1.0.0', Height=height)
+        msg = dict(Action='getblockhash', Version='1.0.0', Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_by_height(self, height: int, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockbyheight', Version='1.0.0', Id=self.__id, Raw=0, Height=height)
+        msg = dict(Action='getblockbyheight', Version='1.0.0', Raw=0, Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_by_hash(self, block_hash: str, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockbyhash', Version='1.0.0', Id=self.__id, Hash=block_hash)
+        msg = dict(Action='getblockbyhash', Version='1.0.0', Hash=block_hash)
         return await self.__send_recv(msg, is_full)
 
     async def get_unbound_ong(self, b58_address: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getunboundong', Version='1.0.0', Id=self.__id, Addr=b58_address)
+        msg = dict(Action='getunboundong', Version='1.0.0', Addr=b58_address)
         return int(await self.__send_recv(msg, is_full))
 
     async def subscribe(self, contract_address_list: List[str] or str, is_event: bool = False,
                         is_json_block: bool = False,
                         is_raw_block: bool = False, is_tx_hash: bool = False, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
         if isinstance(contract_address_list, str):
             contract_address_list = [contract_address_list]
-        msg = dict(Action='subscribe', Version='1.0.0', Id=self.__id, ContractsFilter=contract_address_list,
+        msg = dict(Action='subscribe', Version='1.0.0', ContractsFilter=contract_address_list,
                    SubscribeEvent=is_event, SubscribeJsonBlock=is_json_block, SubscribeRawBlock=is_raw_block,
                    SubscribeBlockTxHashs=is_tx_hash)
         return await self.__send_recv(msg, is_full)
 
     async def recv_subscribe_info(self, is_full: bool = False):
-        response = await self.__ws_client.recv()
-        response = json.loads(response)
+        await self.__ensure_connected()
+        response = await self.subscribe_queue.get()
         if is_full:
             return response
         if response['Error'] != 0:
             raise SDKException(ErrorCode.other_error(response.get('Result', '')))
         return response.get('Result', dict())
 
+    def stream(self, contract_address_list: Union[List[str], str], is_event: bool = False,
+               is_json_block: bool = False, is_raw_block: bool = False, is_tx_hash: bool = False,
+               is_full: bool = False, max_queue_size: int = 1024,
+               overflow_policy: OverflowPolicy = OverflowPolicy.DropOldest, heartbeat_interval: float = 30,
+               reconnect_delay: float = 1, max_reconnect_delay: float = 60) -> SubscriptionStream:
+        """
+        This interface is used to consume a subscription as an async iterator:
+
+            async with ws.stream(contract_address, is_event=True) as stream:
+                async for msg in stream:
+                    ...
+
+        The subscription is re-issued automatically after a reconnection, and a SubscriptionGap is yielded
+        for the block heights whose messages may have been missed.
+        """
+        return SubscriptionStream(self, contract_address_list, is_event, is_json_block, is_raw_block, is_tx_hash,
+                                  is_full, max_queue_size, overflow_policy, heartbeat_interval, reconnect_delay,
+                                  max_reconnect_delay)
+
     async def send_raw_transaction(self, tx: Transaction, is_full: bool = False):
         tx_data = tx.serialize(is_hex=True)
-        msg = dict(Action='sendrawtransaction', Version='1.0.0', Id=self.__id, PreExec='0', Data=tx_data)
+        msg = dict(Action='sendrawtransaction', Version='1.0.0', PreExec='0', Data=tx_data)
         return await self.__send_recv(msg, is_full)
 
     async def send_raw_transaction_pre_exec(self, tx: Transaction, is_full: bool = False):
         tx_data = tx.serialize(is_hex=True)
-        msg = dict(Action='sendrawtransaction', Version='1.0.0', Id=self.__id, PreExec='1', Data=tx_data)
+        msg = dict(Action='sendrawtransaction', Version='1.0.0', PreExec='1', Data=tx_data)
         return await self.__send_recv(msg, is_full)
 
     async def send_neo_vm_tx_pre_exec(self, contract_address: Union[str, bytes, bytearray],
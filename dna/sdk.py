@@ -20,7 +20,6 @@ You should have received a copy of the GNU Lesser General Public License
 along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import asyncio
 import inspect
 
 from typing import Union
@@ -33,6 +32,8 @@ from dna.contract.neo.vm import NeoVm
 from dna.service.service import Service
 from dna.contract.native.vm import NativeVm
 from dna.network.websocket import Websocket
+from dna.network.tx_watcher import SyncTxWatcher
+from dna.network.sync_client import get_shared_loop_thread
 from dna.network.aiorestful import AioRestful
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
@@ -59,13 +60,15 @@ class AioRunner(object):
 
     @staticmethod
     def runner(func):
+        """
+        Wrap a coroutine function into a blocking function, which runs on the shared event loop thread.
+        """
+
         def wrapper(*args, **kwargs):
-            if inspect.iscoroutinefunction(func):
-                future = func(*args, **kwargs)
-            else:
-                coroutine = asyncio.coroutine(func)
-                future = coroutine(*args, **kwargs)
-            asyncio.get_event_loop().run_until_complete(future)
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return get_shared_loop_thread().run(result)
+            return result
 
         return wrapper
 
@@ -82,6 +85,8 @@ class DNA(AioRunner, metaclass=_Singleton):
         self.__websocket = Websocket(ws_address)
         self.__default_network = self.__rpc
         self.__default_aio_network = self.__aio_rpc
+        self.__tx_watcher = None
+        self.__tx_watcher_target = None
         self.__native_vm = NativeVm(self)
         self.__neo_vm = NeoVm(self)
         self.__wasm_vm = WasmVm(self)
@@ -105,6 +110,24 @@ class DNA(AioRunner, metaclass=_Singleton):
     def default_aio_network(self, network: Union[AioRpc, AioRestful, Websocket]):
         self.__default_aio_network = network
 
+    @property
+    def tx_watcher(self) -> SyncTxWatcher:
+        """
+        The blocking transaction watcher of the default network, which is rebuilt when the default network or its
+        address changes.
+        """
+        if isinstance(self.__default_network, Restful):
+            target = (AioRestful, self.__default_network.get_address())
+        else:
+            target = (AioRpc, self.__default_network.get_address())
+        if self.__tx_watcher is not None and self.__tx_watcher_target != target:
+            self.__tx_watcher.close()
+            self.__tx_watcher = None
+        if self.__tx_watcher is None:
+            self.__tx_watcher = SyncTxWatcher(target[0](target[1]))
+            self.__tx_watcher_target = target
+        return self.__tx_watcher
+
     @property
     def wallet_manager(self):
         if self.__wallet_manager is None:
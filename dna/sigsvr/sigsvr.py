@@ -31,12 +31,25 @@ from Cryptodome.Random.random import randint
 
 from dna.exception.error_code import ErrorCode
 from dna.exception.exception import SDKException
+from dna.network.session import PooledSession, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
 
 
 class SigSvr(object):
-    def __init__(self, url: str = ''):
+    def __init__(self, url: str = '', pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, gzip: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT):
         self.__url = url
+        self.__timeout = timeout
         self.__header = {'Content-type': 'application/json'}
+        self.__http = PooledSession(pool_size, keep_alive, gzip)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__http.close()
 
     def set_address(self, url: str):
         self.__url = url
@@ -54,7 +67,7 @@ class SigSvr(object):
         if isinstance(pwd, str):
             payload['pwd'] = pwd
         try:
-            response = requests.post(self.__url, json=payload, headers=self.__header, timeout=10)
+            response = self.__http.post(self.__url, json=payload, headers=self.__header, timeout=self.__timeout)
         except requests.exceptions.MissingSchema as e:
             raise SDKException(ErrorCode.connect_err(e.args[0])) from None
         except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
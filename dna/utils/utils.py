@@ -51,8 +51,15 @@ def to_array_reverse(arr: bytearray) -> bytearray:
     return arr
 
 
+def bytes_from_hex(value: str or bytes) -> bytearray:
+    """
+    This interface is used to decode a hexadecimal string, or its ascii bytes, e.g. the output of hexlify,
+    in one pass.
+    """
+    if not isinstance(value, str):
+        value = bytes(value).decode('ascii')
+    return bytearray.fromhex(value)
+
+
 def bytes_reader(b):
-    res = bytearray()
-    for i in range(len(b) // 2):
-        res += bytearray.fromhex(b[2 * i:2 * i + 2].decode())
-    return res
+    return bytes_from_hex(b[:len(b) // 2 * 2])
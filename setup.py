@@ -42,7 +42,7 @@ setup(
     maintainer='Honglei',
     maintainer_email='conghonglei@onchain.com',
     license='GNU Lesser General Public License v3 (LGPLv3)',
-    packages=find_packages(exclude=['test_*.py', 'tests']),
+    packages=find_packages(exclude=['test_*.py', 'tests', 'tools']),
     install_requires=[
         'aiohttp>=3.5.4',
         'base58>=1.0.3',
@@ -128,6 +128,12 @@ class TestAccount(unittest.TestCase):
         import_key = Account.get_private_key_from_wif(wif)
         self.assertEqual(hex_private_key, import_key.hex())
 
+    def test_get_public_key_serialize(self):
+        account = Account('75de8489fcb2dcaf2ef3cd607feffde18789de7da129b5e97c81e001793cb7cf',
+                          SignatureScheme.SHA256withECDSA)
+        expected = b'21035384561673e76c7e3003e705e4aa7aee67714c8b68d62dd1fb3221f48c5d3da0'
+        self.assertEqual(expected, account.get_public_key_serialize())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import unittest
+
+from dna.network.rpc import Rpc
+from tools.benchmark import (
+    BenchmarkRunner, CLIENTS, WORKLOADS, percentile, make_report, compare_reports, start_node_process
+)
+from tools.fake_node import FakeNode
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = [i / 100 for i in range(1, 101)]
+        self.assertEqual(0.5, percentile(values, 50))
+        self.assertEqual(0.99, percentile(values, 99))
+        self.assertEqual(0.0, percentile([], 99))
+
+    def test_run(self):
+        with FakeNode(height=20) as node:
+            runner = BenchmarkRunner(node.address, requests=5, concurrency=2, height=20, warm_up=1)
+            results = runner.run(CLIENTS, WORKLOADS)
+        self.assertEqual(len(CLIENTS) * len(WORKLOADS), len(results))
+        for result in results:
+            data = dict(result)
+            self.assertEqual(0, data['errors'], data)
+            self.assertEqual(5, data['requests'])
+            self.assertGreater(data['requests_per_second'], 0)
+            self.assertGreaterEqual(data['latency_p99_ms'], data['latency_p50_ms'])
+            self.assertGreater(data['alloc_peak_bytes_per_request'], 0)
+        report = make_report(results, dict(requests=5))
+        comparison = compare_reports(report, report)
+        self.assertEqual(len(results), len(comparison))
+        self.assertTrue(all(item['throughput_ratio'] == 1 for item in comparison))
+
+    def test_start_node_process_out_of_tree(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            try:
+                process, address = start_node_process(height=20)
+            finally:
+                os.chdir(cwd)
+        try:
+            self.assertEqual(20, Rpc(address).get_block_height())
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
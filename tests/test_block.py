@@ -0,0 +1,97 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from dna.core.block import Block, Header
+from dna.core.deploy_transaction import DeployTransaction
+from dna.core.sig import Sig
+from dna.core.transaction import Transaction, TxType
+from dna.exception.exception import SDKException
+from dna.vm.vm_type import VmType
+
+public_key = bytes.fromhex('03036c12be3726eb283d078dff481175e96224f0b0c632c7a37e10eb40fe6be889')
+sig_data = bytes.fromhex('0113141b59b1a62dc3837da026bbd8d541529632377ab7749d4150b71b97ea39798220f15fa039d8521608a6db5ef582cbc6b'
+                         '007106ae86d30344986adb906af7d')
+payer = bytes.fromhex('4756c9dd829b2142883adbe1ae4f8689a1f673e9')
+
+
+class TestBlock(unittest.TestCase):
+    @staticmethod
+    def build_block() -> Block:
+        invoke_tx = Transaction(0, TxType.InvokeNeoVm, 500, 20000, payer,
+                                bytearray(b'\x00\xc6\x6b'), nonce=1)
+        invoke_tx.sig_list.append(Sig([public_key], 1, [sig_data]))
+        deploy_tx = DeployTransaction('00c56b', VmType.Wasm, 'name', '1.0', 'author', 'email', 'description', 500,
+                                      20000, payer)
+        deploy_tx.sig_list.append(Sig([public_key], 1, [sig_data]))
+        attribute_tx = Transaction(0, TxType.InvokeWasmVm, 0, 0, None, bytearray(b'\x01'), nonce=2)
+        attribute_tx.attributes = [b'\x81\x02\xab\xcd', b'\x20\x00']
+        bookkeeping_tx = Transaction(0, TxType.Bookkeeping, 0, 0, None, bytearray(b'\x05'), nonce=3)
+        header = Header(0, bytes(range(32)), bytes(32), bytes(32), 1577836800, 10, 12345, b'\x01\x02',
+                        bytes(20), [public_key], [b'\xaa' * 64])
+        return Block(header, [invoke_tx, deploy_tx, attribute_tx, bookkeeping_tx])
+
+    def test_block_round_trip(self):
+        block = self.build_block()
+        block_hex = block.serialize(is_hex=True)
+        decoded = Block.deserialize_from(bytes.fromhex(block_hex))
+        self.assertEqual(10, decoded.height)
+        self.assertEqual(block.hash256_explorer(), decoded.hash256_explorer())
+        self.assertEqual(dict(block), dict(decoded))
+        self.assertEqual(block_hex, decoded.serialize(is_hex=True))
+        for tx, decoded_tx in zip(block.transactions, decoded.transactions):
+            self.assertEqual(tx.hash256_explorer(), decoded_tx.hash256_explorer())
+        self.assertEqual(TxType.InvokeNeoVm.value, decoded.transactions[0].tx_type)
+        self.assertEqual(1, len(decoded.transactions[0].sig_list))
+        self.assertEqual([public_key], decoded.transactions[0].sig_list[0].public_keys)
+
+    def test_deploy_transaction(self):
+        block = Block.deserialize_from(self.build_block().serialize())
+        deploy_tx = block.transactions[1]
+        self.assertIsInstance(deploy_tx, DeployTransaction)
+        self.assertEqual(bytearray.fromhex('00c56b'), deploy_tx.code)
+        self.assertEqual(VmType.Wasm, deploy_tx.vm_type)
+        self.assertEqual('1.0', deploy_tx.code_version)
+        self.assertEqual('description', deploy_tx.description)
+
+    def test_attributes(self):
+        block = Block.deserialize_from(self.build_block().serialize())
+        self.assertEqual([b'\x81\x02\xab\xcd', b'\x20\x00'], block.transactions[2].attributes)
+        self.assertEqual(bytearray(), block.transactions[3].attributes)
+
+    def test_header(self):
+        header = self.build_block().header
+        decoded = Header.deserialize_from(header.serialize())
+        self.assertEqual(dict(header), dict(decoded))
+        self.assertEqual(bytes(range(32))[::-1].hex(), dict(decoded)['PrevBlockHash'])
+
+    def test_unsupported_tx_type(self):
+        tx = Transaction(0, TxType.InvokeNeoVm, payload=bytearray(b'\x00'), nonce=1)
+        tx_bytes = bytearray(tx.serialize())
+        tx_bytes[1] = 0xff
+        with self.assertRaises(SDKException):
+            Transaction.deserialize_from(bytes(tx_bytes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import time
+import unittest
+import threading
+
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc
+from dna.network.aiorpc import AioRpc
+from dna.network.restful import Restful
+from dna.network.aiorestful import AioRestful
+from dna.network.cache import ResponseCache
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    methods = list()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.methods.append(payload['method'])
+        if payload['method'] == 'getblock':
+            result = dict(Hash='00' * 32, Header=dict(Height=payload['params'][0]))
+        elif payload['method'] == 'getrawtransaction':
+            result = None
+        else:
+            result = len(self.methods)
+        body = json.dumps(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=result)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_lru(self):
+        cache = ResponseCache(max_size=2)
+        cache.put('getblock', 'a', 1)
+        cache.put('getblock', 'b', 2)
+        self.assertEqual((True, 1), cache.get('getblock', 'a'))
+        cache.put('getblock', 'c', 3)
+        self.assertEqual((False, None), cache.get('getblock', 'b'))
+        self.assertEqual((True, 1), cache.get('getblock', 'a'))
+        self.assertEqual(2, len(cache))
+        stats = cache.stats()
+        self.assertEqual(2, stats['getblock']['hits'])
+        self.assertEqual(1, stats['getblock']['misses'])
+        self.assertEqual(1, stats['getblock']['evictions'])
+        self.assertEqual(2, stats['total']['size'])
+
+    def test_policies(self):
+        cache = ResponseCache(policies={'getbalance': 0.01, 'getblock': 0})
+        self.assertFalse(cache.is_cacheable('getblock'))
+        self.assertFalse(cache.is_cacheable('sendrawtransaction'))
+        self.assertTrue(cache.is_cacheable('/api/v1/block/details/height/{}'))
+        cache.put('getblock', 'a', 1)
+        self.assertEqual(0, len(cache))
+        cache.put('getbalance', 'b', 2)
+        self.assertEqual((True, 2), cache.get('getbalance', 'b'))
+        time.sleep(0.02)
+        self.assertEqual((False, None), cache.get('getbalance', 'b'))
+        self.assertEqual(1, cache.stats()['getbalance']['expirations'])
+
+
+class TestRpcCache(unittest.TestCase):
+    def setUp(self):
+        _RpcHandler.methods = list()
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _RpcHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_rpc_cache(self):
+        with Rpc(self.url, cache=ResponseCache()) as rpc:
+            for _ in range(3):
+                self.assertEqual(1, rpc.get_block_by_height(1)['Header']['Height'])
+            self.assertEqual(2, rpc.get_block_by_height(2)['Header']['Height'])
+            self.assertIsNone(rpc.get_transaction_by_tx_hash('11' * 32))
+            self.assertIsNone(rpc.get_transaction_by_tx_hash('11' * 32))
+            rpc.get_block_count()
+            rpc.get_block_count()
+        self.assertEqual(['getblock', 'getblock', 'getrawtransaction', 'getrawtransaction', 'getblockcount',
+                          'getblockcount'], _RpcHandler.methods)
+        self.assertEqual(2, rpc.cache.stats()['getblock']['hits'])
+
+    def test_cached_response_not_modified(self):
+        with Rpc(self.url, cache=ResponseCache()) as rpc:
+            self.assertEqual([2, 2, 2], [rpc.get_block_count_by_tx_hash('11' * 32) for _ in range(3)])
+            self.assertEqual(1, rpc.get_block_height_by_tx_hash('11' * 32))
+            rpc.get_block_by_height(1)['Header']['Height'] = 0
+            self.assertEqual(1, rpc.get_block_by_height(1)['Header']['Height'])
+        self.assertEqual(['getblockheightbytxhash', 'getblock'], _RpcHandler.methods)
+
+
+class TestAioCache(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.paths = list()
+
+        async def handle_rpc(request):
+            payload = await request.json()
+            self.paths.append(payload['method'])
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=dict(gasprice=500)))
+
+        async def handle_restful(request):
+            self.paths.append(request.path_qs)
+            return web.json_response(dict(Action='getblock', Desc='SUCCESS', Error=0, Result=dict(Hash='00' * 32)))
+
+        async def handle_tx_height(request):
+            self.paths.append(request.path_qs)
+            return web.json_response(dict(Action='getblockheightbytxhash', Desc='SUCCESS', Error=0, Result=7))
+
+        app = web.Application()
+        app.router.add_post('/', handle_rpc)
+        app.router.add_get('/api/v1/block/details/height/{height}', handle_restful)
+        app.router.add_get('/api/v1/storage/{address}/{key}', handle_restful)
+        app.router.add_get('/api/v1/allowance/{asset}/{from}/{to}', handle_restful)
+        app.router.add_get('/api/v1/block/height/txhash/{hash}', handle_tx_height)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_aio_rpc_ttl(self):
+        async with AioRpc(self.url, cache=ResponseCache(policies={'getgasprice': 0.05})) as rpc:
+            self.assertEqual(500, await rpc.get_gas_price())
+            self.assertEqual(500, await rpc.get_gas_price())
+            await asyncio.sleep(0.06)
+            self.assertEqual(500, await rpc.get_gas_price())
+        self.assertEqual(['getgasprice', 'getgasprice'], self.paths)
+
+    @DNA.runner
+    async def test_aio_restful_cache(self):
+        cache = ResponseCache()
+        async with AioRestful(self.url, cache=cache) as restful:
+            await restful.get_block_by_height(1)
+            await restful.get_block_by_height(1)
+            await restful.get_raw_block_by_height(1)
+        self.assertEqual(['/api/v1/block/details/height/1?raw=0', '/api/v1/block/details/height/1?raw=1'], self.paths)
+        self.assertEqual(1, cache.stats()['/api/v1/block/details/height/{}']['hits'])
+        self.assertIsNone(Restful(self.url).cache)
+
+    @DNA.runner
+    async def test_aio_restful_multi_segment_cache(self):
+        cache = ResponseCache()
+        contract_address = '1ddbb682743e9d9e2b71ff419e97a9358c5c4ee9'
+        b58_address = 'ANDfjwrUroaVtvBguDtrWKRMyxFwvVwnZD'
+        async with AioRestful(self.url, cache=cache) as restful:
+            for _ in range(2):
+                await restful.get_storage(contract_address, '01')
+                await restful.get_allowance('ont', b58_address, b58_address)
+        allowance_path = f'/api/v1/allowance/ont/{b58_address}/{b58_address}'
+        self.assertEqual([f'/api/v1/storage/{contract_address}/01', allowance_path], self.paths)
+        self.assertEqual(1, cache.stats()['/api/v1/storage/{}/{}']['hits'])
+        self.assertEqual(1, cache.stats()['/api/v1/allowance/{}/{}/{}']['hits'])
+
+    @DNA.runner
+    async def test_aio_cached_response_not_modified(self):
+        async with AioRestful(self.url, cache=ResponseCache()) as restful:
+            self.assertEqual([8, 8, 8], [await restful.get_block_count_by_tx_hash('11' * 32) for _ in range(3)])
+            self.assertEqual(7, await restful.get_block_height_by_tx_hash('11' * 32))
+        self.assertEqual(1, len(self.paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
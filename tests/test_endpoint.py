@@ -0,0 +1,134 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+import asyncio
+import unittest
+
+from dna.sdk import DNA
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.endpoint import CircuitBreaker, EndpointGroup, is_read_only
+
+
+class FakeClient(object):
+    def __init__(self, url: str, delay: float = 0, is_down: bool = False):
+        self.url = url
+        self.delay = delay
+        self.is_down = is_down
+        self.calls = 0
+
+    def get_address(self):
+        return self.url
+
+    def get_block_count(self):
+        self.calls += 1
+        if self.is_down:
+            raise SDKException(ErrorCode.connect_timeout(self.url))
+        time.sleep(self.delay)
+        return 100
+
+    def get_transaction_by_tx_hash(self, tx_hash: str):
+        self.calls += 1
+        raise SDKException(ErrorCode.other_error('unknown transaction'))
+
+    def send_raw_transaction(self, tx):
+        self.calls += 1
+        raise SDKException(ErrorCode.connect_timeout(self.url))
+
+    def close(self):
+        self.url = ''
+
+
+class FakeAioClient(FakeClient):
+    async def get_block_count(self):
+        self.calls += 1
+        if self.is_down:
+            raise SDKException(ErrorCode.connect_timeout(self.url))
+        await asyncio.sleep(self.delay)
+        return 100
+
+    async def close(self):
+        self.url = ''
+
+
+class TestEndpointGroup(unittest.TestCase):
+    def test_is_read_only(self):
+        self.assertTrue(is_read_only('get_block_by_height'))
+        self.assertTrue(is_read_only('send_raw_transaction_pre_exec'))
+        self.assertFalse(is_read_only('send_raw_transaction'))
+
+    def test_prefer_low_latency(self):
+        slow, fast = FakeClient('slow', 0.02), FakeClient('fast', 0)
+        group = EndpointGroup([slow, fast])
+        for _ in range(10):
+            self.assertEqual(100, group.get_block_count())
+        self.assertLessEqual(slow.calls, 2)
+        self.assertEqual('fast', group.get_address())
+
+    def test_failover_and_circuit_breaker(self):
+        down, up = FakeClient('down', is_down=True), FakeClient('up', 0.01)
+        group = EndpointGroup([down, up], failure_threshold=2, open_timeout=60)
+        for _ in range(5):
+            self.assertEqual(100, group.get_block_count())
+        self.assertEqual(2, down.calls)
+        self.assertEqual(5, up.calls)
+        self.assertFalse(group.endpoints[0].is_available(time.monotonic()))
+
+    def test_circuit_breaker_recovery(self):
+        node = FakeClient('node', is_down=True)
+        group = EndpointGroup([node], failure_threshold=1, open_timeout=0.05)
+        self.assertRaises(SDKException, group.get_block_count)
+        self.assertEqual(CircuitBreaker.OPEN, group.endpoints[0].breaker.state)
+        time.sleep(0.06)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, group.endpoints[0].breaker.state)
+        node.is_down = False
+        self.assertEqual(100, group.get_block_count())
+        self.assertEqual(CircuitBreaker.CLOSED, group.endpoints[0].breaker.state)
+        self.assertEqual(0, group.endpoints[0].failures)
+
+    def test_no_failover(self):
+        first, second = FakeClient('first'), FakeClient('second')
+        group = EndpointGroup([first, second])
+        self.assertRaises(SDKException, group.send_raw_transaction, None)
+        self.assertRaises(SDKException, group.get_transaction_by_tx_hash, '')
+        self.assertEqual(2, first.calls + second.calls)
+
+    def test_no_available_endpoint(self):
+        group = EndpointGroup([FakeClient('down', is_down=True)], failure_threshold=1, open_timeout=60)
+        self.assertRaises(SDKException, group.get_block_count)
+        try:
+            group.get_block_count()
+        except SDKException as e:
+            self.assertEqual(ErrorCode.no_available_endpoint['error'], e.args[0])
+
+    @DNA.runner
+    async def test_async_group(self):
+        clients = [FakeAioClient('down', is_down=True), FakeAioClient('up')]
+        async with EndpointGroup(clients) as group:
+            count_list = await asyncio.gather(*[group.get_block_count() for _ in range(10)])
+        self.assertEqual([100] * 10, count_list)
+        self.assertEqual(['', ''], [client.url for client in clients])
+
+
+if __name__ == '__main__':
+    unittest.main()
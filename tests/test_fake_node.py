@@ -0,0 +1,192 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from dna.sdk import DNA
+from dna.core.block import Block
+from dna.core.transaction import Transaction, TxType
+from dna.exception.exception import SDKException
+from dna.merkle.merkle_verifier import MerkleVerifier
+from dna.network.aiorestful import AioRestful
+from tools.fake_node import FakeChain, FakeNode, Fault, FaultKind
+from dna.network.restful import Restful
+from dna.network.rpc import Rpc
+from dna.network.websocket import Websocket
+
+
+def make_tx(nonce: int) -> Transaction:
+    return Transaction(0, TxType.InvokeNeoVm, 500, 20000, b'', bytearray(b'\x51\x52'), nonce=nonce)
+
+
+class TestFakeChain(unittest.TestCase):
+    def test_deterministic(self):
+        chain1, chain2 = FakeChain(height=10, seed=1), FakeChain(height=10, seed=1)
+        self.assertEqual(chain1.get_block_raw(10), chain2.get_block_raw(10))
+        self.assertNotEqual(chain1.get_block_raw(10), FakeChain(height=10, seed=2).get_block_raw(10))
+
+    def test_raw_block(self):
+        chain = FakeChain(height=5)
+        block = Block.deserialize_from(bytes.fromhex(chain.get_block_raw(3)))
+        self.assertEqual(3, block.height)
+        self.assertEqual(chain.get_block_json(3)['Hash'], block.hash256_explorer())
+        self.assertEqual(chain.blocks[2].hash256(), block.header.prev_block_hash)
+
+    def test_merkle_proof(self):
+        chain = FakeChain(height=20)
+        for height in (0, 7, 20):
+            proof = chain.get_merkle_proof(chain.blocks[height].transactions[0].hash256_explorer())
+            node = MerkleVerifier.get_proof(proof['BlockHeight'], proof['TargetHashes'], proof['CurBlockHeight'])
+            self.assertTrue(MerkleVerifier.validate_proof(node, proof['TransactionsRoot'], proof['CurBlockRoot'],
+                                                          is_big_endian=True))
+
+    def test_pending_tx(self):
+        chain = FakeChain(height=5)
+        tx_hash = chain.send_transaction(make_tx(1))
+        self.assertIn(tx_hash, chain.pending)
+        block = chain.produce_block()
+        self.assertEqual(6, block.height)
+        self.assertEqual(6, chain.get_tx_location(tx_hash)[0])
+        self.assertEqual(tx_hash, chain.get_event_by_tx_hash(tx_hash)['TxHash'])
+
+
+class TestFakeNodeRpc(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.node = FakeNode(height=30)
+        cls.node.start_in_thread()
+        cls.rpc = Rpc(cls.node.rpc_address)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rpc.close()
+        cls.node.close_in_thread()
+
+    def test_get_block(self):
+        self.assertEqual(30, self.rpc.get_block_height())
+        block = self.rpc.get_block_by_height(12)
+        self.assertEqual(12, block['Header']['Height'])
+        self.assertEqual(block['Hash'], self.rpc.get_block_hash_by_height(12))
+        raw_block = Block.deserialize_from(bytes.fromhex(self.rpc.get_raw_block_by_height(12)))
+        self.assertEqual(block['Hash'], raw_block.hash256_explorer())
+
+    def test_events(self):
+        event_list = self.rpc.get_contract_event_by_height(3)
+        self.assertEqual(2, len(event_list))
+        self.assertEqual(event_list[1], self.rpc.get_contract_event_by_tx_hash(event_list[1]['TxHash']))
+
+    def test_send_transaction(self):
+        tx = make_tx(100)
+        self.assertEqual(tx.hash256_explorer(), self.rpc.send_raw_transaction(tx))
+        self.assertEqual(1, self.rpc.send_raw_transaction_pre_exec(tx)['State'])
+        self.assertRaises(SDKException, self.rpc.send_raw_transaction, tx)
+
+    def test_unknown_block(self):
+        self.assertRaises(SDKException, self.rpc.get_block_by_height, 1000)
+
+    def test_fault(self):
+        self.node.set_fault(Fault(error_rate=1, kind=FaultKind.HttpError), 'getversion')
+        try:
+            self.assertRaises(SDKException, self.rpc.get_version)
+        finally:
+            self.node.set_fault(None, 'getversion')
+        self.assertEqual('1.0.0-fake', self.rpc.get_version())
+
+
+class TestFakeNodeRestful(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.node = FakeNode(height=20)
+        cls.node.start_in_thread()
+        cls.restful = Restful(cls.node.restful_address)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.restful.close()
+        cls.node.close_in_thread()
+
+    def test_get_raw_block_by_height(self):
+        block = self.restful.get_block_by_height(7)
+        raw_block = Block.deserialize_from(bytes.fromhex(self.restful.get_raw_block_by_height(7)))
+        self.assertEqual(7, raw_block.height)
+        self.assertEqual(block['Hash'], raw_block.hash256_explorer())
+        self.assertEqual(len(block['Transactions']), len(raw_block.transactions))
+
+    def test_get_raw_block_by_hash(self):
+        block_hash = self.restful.get_block_by_height(9)['Hash']
+        raw_block = Block.deserialize_from(bytes.fromhex(self.restful.get_raw_block_by_hash(block_hash)))
+        self.assertEqual(9, raw_block.height)
+        self.assertEqual(block_hash, raw_block.hash256_explorer())
+        response = self.restful.get_raw_block_by_hash(block_hash, is_full=True)
+        self.assertEqual(0, response['Error'])
+
+
+class TestFakeNodeAio(unittest.TestCase):
+    @DNA.runner
+    async def test_restful(self):
+        async with FakeNode(height=10) as node:
+            async with AioRestful(node.restful_address) as restful:
+                self.assertEqual(10, await restful.get_block_height())
+                block = await restful.get_block_by_height(4)
+                raw_block = await restful.get_raw_block_by_hash(block['Hash'])
+                self.assertEqual(4, Block.deserialize_from(bytes.fromhex(raw_block)).height)
+                tx_hash = block['Transactions'][0]['Hash']
+                self.assertEqual(4, await restful.get_block_height_by_tx_hash(tx_hash))
+                proof = await restful.get_merkle_proof(tx_hash)
+                self.assertEqual(10, proof['CurBlockHeight'])
+                tx = make_tx(200)
+                self.assertEqual(tx.hash256_explorer(), await restful.send_raw_transaction(tx))
+                self.assertEqual(1, (await restful.get_memory_pool_tx_count())[0])
+
+    @DNA.runner
+    async def test_latency(self):
+        async with FakeNode(height=10, fault=Fault(latency=0.05)) as node:
+            async with AioRestful(node.restful_address) as restful:
+                loop = asyncio.get_event_loop()
+                start = loop.time()
+                await restful.get_version()
+                self.assertGreaterEqual(loop.time() - start, 0.05)
+                self.assertEqual(1, node.request_counts['getversion'])
+
+    @DNA.runner
+    async def test_websocket(self):
+        async with FakeNode(height=10) as node:
+            ws = Websocket(node.ws_address)
+            try:
+                self.assertEqual(10, await ws.get_block_height())
+                block = await ws.get_block_by_height(5)
+                self.assertEqual(block['Hash'], await ws.get_block_hash_by_height(5))
+                await ws.subscribe([], is_event=True, is_tx_hash=True)
+                block = node.produce_block()
+                event = await asyncio.wait_for(ws.recv_subscribe_info(is_full=True), 5)
+                self.assertEqual('Notify', event['Action'])
+                for _ in range(len(block.transactions)):
+                    event = await asyncio.wait_for(ws.recv_subscribe_info(is_full=True), 5)
+                self.assertEqual('sendblocktxhashs', event['Action'])
+                self.assertEqual(11, event['Result']['Height'])
+            finally:
+                await ws.close_connect()
+
+
+if __name__ == '__main__':
+    unittest.main()
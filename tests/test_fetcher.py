@@ -0,0 +1,118 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import random
+import unittest
+
+from dna.sdk import DNA
+from dna.exception.exception import SDKException
+from dna.exception.error_code import ErrorCode
+from dna.network.fetcher import AioRangeFetcher, fetch_range
+
+
+class FakeClient(AioRangeFetcher):
+    def __init__(self, failures: int = 0):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = failures
+        self.calls = 0
+
+    async def get_block_by_height(self, height: int, is_full: bool = False):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.random() / 100)
+            if self.failures > 0:
+                self.failures -= 1
+                raise SDKException(ErrorCode.connect_timeout('fake'))
+            return dict(Header=dict(Height=height))
+        finally:
+            self.in_flight -= 1
+
+    async def get_contract_event_by_height(self, height: int, is_full: bool = False):
+        await asyncio.sleep(0)
+        return '' if height % 2 else [dict(TxHash=str(height))]
+
+
+class TestFetcher(unittest.TestCase):
+    @DNA.runner
+    async def test_iter_blocks_in_order(self):
+        client = FakeClient(failures=3)
+        heights = list()
+        async for height, block in client.iter_blocks(10, 60, concurrency=4, retry_delay=0):
+            self.assertEqual(height, block['Header']['Height'])
+            heights.append(height)
+        self.assertEqual(list(range(10, 60)), heights)
+        self.assertLessEqual(client.max_in_flight, 4)
+        self.assertEqual(53, client.calls)
+
+    @DNA.runner
+    async def test_iter_events(self):
+        client = FakeClient()
+        event_list = [(height, event) async for height, event in client.iter_events(0, 4)]
+        self.assertEqual([(0, [dict(TxHash='0')]), (1, []), (2, [dict(TxHash='2')]), (3, [])], event_list)
+
+    @DNA.runner
+    async def test_buffer_bound(self):
+        fetched = list()
+
+        async def fetch(height: int):
+            fetched.append(height)
+            if height == 0:
+                await asyncio.sleep(0.05)
+            return height
+
+        async for height, _ in fetch_range(fetch, 0, 100, concurrency=4, max_buffer_size=8):
+            self.assertLessEqual(max(fetched) - height, 8)
+            break
+
+    @DNA.runner
+    async def test_retry_exhausted(self):
+        async def fetch(height: int):
+            if height == 3:
+                raise SDKException(ErrorCode.connect_timeout('fake'))
+            return height
+
+        heights = list()
+        with self.assertRaises(SDKException):
+            async for height, _ in fetch_range(fetch, 0, 10, max_retries=1, retry_delay=0):
+                heights.append(height)
+        self.assertEqual([0, 1, 2], heights)
+
+    @DNA.runner
+    async def test_no_retry_on_node_error(self):
+        calls = list()
+
+        async def fetch(height: int):
+            calls.append(height)
+            raise SDKException(ErrorCode.other_error('fake'))
+
+        with self.assertRaises(SDKException):
+            async for _ in fetch_range(fetch, 0, 1, max_retries=3, retry_delay=0):
+                pass
+        self.assertEqual([0], calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.aiorpc import AioRpc
+from dna.network.rpc import RpcMethod
+from dna.network.hedge import HedgePolicy
+from dna.network.throttle import Throttle
+from dna.network.aiorestful import AioRestful
+from dna.exception.exception import SDKException
+
+
+async def start_node(delay: float, result, error: int = 0):
+    desc = 'SUCCESS' if error == 0 else 'INTERNAL ERROR'
+
+    async def handle_rpc(request):
+        await asyncio.sleep(delay)
+        payload = await request.json()
+        return web.json_response(dict(desc=desc, error=error, id=payload['id'], jsonrpc='2.0', result=result))
+
+    async def handle_restful(request):
+        await asyncio.sleep(delay)
+        return web.json_response(dict(Action='getblockbyheight', Desc=desc, Error=error, Result=result))
+
+    app = web.Application()
+    app.router.add_post('/', handle_rpc)
+    app.router.add_get('/api/v1/block/details/height/{height}', handle_restful)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+
+class TestHedgePolicy(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.slow_runner, self.slow_url = await start_node(0.5, 1)
+        self.fast_runner, self.fast_url = await start_node(0, 2)
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.slow_runner.cleanup()
+        await self.fast_runner.cleanup()
+
+    def test_get_path_key(self):
+        path_key = AioRestful.get_path_key('/api/v1/block/details/height/100?raw=0')
+        self.assertEqual('/api/v1/block/details/height/{}', path_key)
+        path_key = AioRestful.get_path_key('/api/v1/storage/1ddbb682743e9d9e2b71ff419e97a9358c5c4ee9/01')
+        self.assertEqual('/api/v1/storage/{}/{}', path_key)
+
+    @DNA.runner
+    async def test_hedge_rpc(self):
+        policy = HedgePolicy([self.fast_url], initial_delay=0.02, budget_ratio=1)
+        async with AioRpc(self.slow_url, hedge_policy=policy) as rpc:
+            self.assertEqual(2, await rpc.get_block_by_height(0))
+            self.assertEqual(2, await rpc.get_block_count())
+        metrics = policy.metrics()
+        self.assertEqual(1, metrics[RpcMethod.GET_BLOCK]['hedge_wins'])
+        self.assertEqual(1, metrics[RpcMethod.GET_BLOCK_COUNT]['hedged'])
+
+    @DNA.runner
+    async def test_censored_latency(self):
+        policy = HedgePolicy([self.fast_url], initial_delay=0.02, budget_ratio=1)
+        async with AioRpc(self.slow_url, hedge_policy=policy) as rpc:
+            self.assertEqual(2, await rpc.get_block_by_height(0))
+        samples = sorted(policy.get_metrics(RpcMethod.GET_BLOCK).latency_samples)
+        self.assertEqual(2, len(samples))
+        self.assertGreaterEqual(samples[1], 0.02)
+
+    @DNA.runner
+    async def test_hedge_throttle(self):
+        primary_throttle, backup_throttle = Throttle(), Throttle()
+        policy = HedgePolicy([self.fast_url], initial_delay=0.02, budget_ratio=1,
+                             backup_throttles={self.fast_url: backup_throttle})
+        async with AioRpc(self.slow_url, hedge_policy=policy, throttle=primary_throttle) as rpc:
+            self.assertEqual(2, await rpc.get_block_by_height(0))
+        async with AioRestful(self.slow_url, hedge_policy=policy, throttle=primary_throttle) as restful:
+            self.assertEqual(2, await restful.get_block_by_height(10))
+        self.assertEqual(2, primary_throttle.requests)
+        self.assertEqual(2, backup_throttle.requests)
+
+    @DNA.runner
+    async def test_no_hedge_for_fast_node(self):
+        policy = HedgePolicy([self.slow_url], initial_delay=0.2, budget_ratio=1)
+        async with AioRpc(self.fast_url, hedge_policy=policy) as rpc:
+            self.assertEqual(2, await rpc.get_block_by_height(0))
+        self.assertEqual(0, policy.metrics()[RpcMethod.GET_BLOCK]['hedged'])
+
+    @DNA.runner
+    async def test_hedge_budget(self):
+        policy = HedgePolicy([self.fast_url], initial_delay=0.01, method_budgets={RpcMethod.GET_BLOCK: 0})
+        async with AioRpc(self.slow_url, hedge_policy=policy) as rpc:
+            self.assertEqual(1, await rpc.get_block_by_height(0))
+        metrics = policy.metrics()[RpcMethod.GET_BLOCK]
+        self.assertEqual(0, metrics['hedged'])
+        self.assertEqual(1, metrics['budget_exhausted'])
+
+    @DNA.runner
+    async def test_hedge_error_response(self):
+        error_runner, error_url = await start_node(0, 'unknown block', error=42001)
+        try:
+            policy = HedgePolicy([error_url], initial_delay=0.02, budget_ratio=1)
+            async with AioRpc(self.slow_url, hedge_policy=policy) as rpc:
+                self.assertEqual(1, await rpc.get_block_by_height(0))
+            async with AioRestful(self.slow_url, hedge_policy=policy) as restful:
+                self.assertEqual(1, await restful.get_block_by_height(10))
+            self.assertEqual(0, policy.metrics()[RpcMethod.GET_BLOCK]['hedge_wins'])
+            policy = HedgePolicy([self.slow_url], initial_delay=0.02, budget_ratio=1)
+            async with AioRpc(error_url, hedge_policy=policy) as rpc:
+                with self.assertRaises(SDKException):
+                    await rpc.get_block_by_height(0)
+        finally:
+            await error_runner.cleanup()
+
+    @DNA.runner
+    async def test_hedge_restful(self):
+        policy = HedgePolicy([self.fast_url], initial_delay=0.02, budget_ratio=1)
+        async with AioRestful(self.slow_url, hedge_policy=policy) as restful:
+            self.assertEqual(2, await restful.get_block_by_height(10))
+        self.assertEqual(1, policy.metrics()['/api/v1/block/details/height/{}']['hedge_wins'])
+
+
+if __name__ == '__main__':
+    unittest.main()
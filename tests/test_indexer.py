@@ -0,0 +1,98 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import os
+import tempfile
+
+from dna.sdk import DNA
+from dna.exception.exception import SDKException
+from dna.network.aiorpc import AioRpc
+from dna.network.aiorestful import AioRestful
+from tools.fake_node import FakeNode, Fault, FaultKind, ONT_CONTRACT_ADDRESS, ONG_CONTRACT_ADDRESS
+from dna.network.indexer import EventIndexer, get_event_name
+
+
+class TestEventIndexer(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'events.db')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_get_event_name(self):
+        self.assertEqual('transfer', get_event_name(['transfer', 'a', 'b', 1]))
+        self.assertEqual('', get_event_name('00'))
+        self.assertEqual('', get_event_name([]))
+
+    @DNA.runner
+    async def test_index(self):
+        async with FakeNode(height=30) as node:
+            async with AioRpc(node.rpc_address) as rpc:
+                with EventIndexer(rpc, self.path, batch_size=7, concurrency=4) as indexer:
+                    self.assertEqual(31 * 2 * 2, await indexer.run())
+                    self.assertEqual(31, indexer.checkpoint)
+                    notifies = indexer.get_notifies(ONT_CONTRACT_ADDRESS, start_height=10, end_height=20)
+                    self.assertEqual(20, len(notifies))
+                    self.assertEqual(list(range(10, 20)), sorted(set(notify['Height'] for notify in notifies)))
+                    event = node.chain.get_events_by_height(12)[1]
+                    notifies = indexer.get_notifies(tx_hash=event['TxHash'])
+                    self.assertEqual(event['Notify'], [dict(ContractAddress=notify['ContractAddress'],
+                                                            States=notify['States']) for notify in notifies])
+                    self.assertEqual(124, len(indexer.get_notifies(event_name='transfer')))
+                    self.assertEqual(3, len(indexer.get_notifies(ONG_CONTRACT_ADDRESS, limit=3)))
+                    self.assertEqual(0, await indexer.run())
+
+    @DNA.runner
+    async def test_resume(self):
+        async with FakeNode(height=20) as node:
+            async with AioRestful(node.restful_address) as restful:
+                with EventIndexer(restful, self.path, contract_addresses=[ONT_CONTRACT_ADDRESS]) as indexer:
+                    self.assertEqual(20, await indexer.run(end_height=10))
+                    self.assertEqual(10, indexer.checkpoint)
+                node.chain.produce_block()
+                with EventIndexer(restful, self.path, contract_addresses=[ONT_CONTRACT_ADDRESS]) as indexer:
+                    self.assertEqual(10, indexer.checkpoint)
+                    self.assertEqual(24, await indexer.run())
+                    self.assertEqual(22, indexer.checkpoint)
+                    self.assertEqual(44, indexer.count(ONT_CONTRACT_ADDRESS))
+                    self.assertEqual(0, indexer.count(ONG_CONTRACT_ADDRESS))
+
+    @DNA.runner
+    async def test_failure_keeps_checkpoint(self):
+        async with FakeNode(height=20) as node:
+            async with AioRpc(node.rpc_address) as rpc:
+                with EventIndexer(rpc, self.path, batch_size=5, max_retries=0) as indexer:
+                    await indexer.run(end_height=5)
+                    node.set_fault(Fault(error_rate=1, kind=FaultKind.NodeError), 'getsmartcodeevent')
+                    with self.assertRaises(SDKException):
+                        await indexer.run()
+                    self.assertEqual(5, indexer.checkpoint)
+                    node.set_fault(None, 'getsmartcodeevent')
+                    await indexer.run()
+                    self.assertEqual(21, indexer.checkpoint)
+                    self.assertEqual(21 * 4, indexer.count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import os
+import tempfile
+
+from dna.core.block import Block, Header
+from dna.core.transaction import Transaction, TxType
+from dna.exception.exception import SDKException
+from dna.io.binary_reader import BinaryReader
+from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_reader import MemoryReader
+from dna.io.memory_stream import StreamManager
+
+
+def build_data() -> bytes:
+    with StreamManager.checkout() as ms:
+        writer = BinaryWriter(ms)
+        writer.write_uint8(0xab)
+        writer.write_uint16(0x1234)
+        writer.write_int32(-7)
+        writer.write_uint64(2 ** 63 + 1)
+        for value in (0, 0xfc, 0xfd, 0x10000, 2 ** 40):
+            writer.write_var_int(value)
+        writer.write_var_bytes(b'payload')
+        writer.write_var_str('name')
+        writer.write_bool(True)
+        return ms.to_bytes()
+
+
+def read_all(reader: BinaryReader) -> list:
+    values = [reader.read_uint8(), reader.read_uint16(), reader.read_int32(), reader.read_uint64()]
+    values.extend(reader.read_var_int() for _ in range(5))
+    values.extend([reader.read_var_bytes(), reader.read_var_str(), reader.read_bool()])
+    return values
+
+
+class TestMemoryReader(unittest.TestCase):
+    def test_same_as_binary_reader(self):
+        data = build_data()
+        with StreamManager.checkout(data) as ms:
+            expected = read_all(BinaryReader(ms))
+        for buffer in (data, bytearray(data), memoryview(data)):
+            reader = MemoryReader(buffer)
+            self.assertEqual(expected, read_all(reader))
+            self.assertEqual(0, reader.remaining)
+
+    def test_view(self):
+        data = bytearray(b'\x03abcdef')
+        reader = MemoryReader(data)
+        view = reader.read_var_view()
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(b'abc', view)
+        data[1] = ord('x')
+        self.assertEqual(b'xbc', view)
+        self.assertEqual(4, reader.tell())
+        reader.seek(1)
+        self.assertEqual(b'xb', reader.read_bytes(2))
+
+    def test_out_of_range(self):
+        reader = MemoryReader(b'\x05ab')
+        self.assertRaises(SDKException, reader.read_var_bytes)
+        reader = MemoryReader(b'')
+        self.assertRaises(SDKException, reader.read_byte)
+        self.assertRaises(SDKException, reader.read_uint32)
+
+    def test_big_endian(self):
+        reader = MemoryReader(b'\x12\x34\x00\x00\x00\x01')
+        self.assertEqual(0x1234, reader.read_uint16(little_endian=False))
+        self.assertEqual(1, reader.read_uint32(little_endian=False))
+
+    def test_mmap_blocks(self):
+        blocks = list()
+        for height in range(3):
+            tx = Transaction(0, TxType.InvokeNeoVm, 500, 20000, None, bytearray(b'\x51'), nonce=height + 1)
+            blocks.append(Block(Header(height=height, timestamp=1577836800 + height), [tx]))
+        with tempfile.TemporaryDirectory() as path:
+            file_path = os.path.join(path, 'blocks.dat')
+            with open(file_path, 'wb') as f:
+                for block in blocks:
+                    f.write(block.serialize())
+            decoded = list()
+            with MemoryReader.open_file(file_path) as reader:
+                while reader.remaining > 0:
+                    decoded.append(Block.deserialize(reader))
+        self.assertEqual([block.hash256_explorer() for block in blocks],
+                         [block.hash256_explorer() for block in decoded])
+        self.assertEqual(blocks[2].transactions[0].hash256(), decoded[2].transactions[0].hash256())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import threading
+
+from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_stream import StreamPool, StreamManager
+
+
+class TestStreamPool(unittest.TestCase):
+    def test_checkout(self):
+        pool = StreamPool(max_size=2)
+        with pool.checkout(b'\x01\x02') as ms:
+            self.assertEqual(b'\x01\x02', ms.read())
+            self.assertEqual(1, pool.in_use)
+        with pool.checkout() as reused:
+            self.assertIs(ms, reused)
+            self.assertEqual(b'', reused.to_bytes())
+        stats = pool.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(0.5, stats['hit_rate'])
+        self.assertEqual(0, stats['in_use'])
+
+    def test_bounded(self):
+        pool = StreamPool(max_size=2)
+        streams = [pool.get_stream() for _ in range(5)]
+        for ms in streams:
+            pool.release_stream(ms)
+        self.assertEqual(2, len(pool))
+        self.assertEqual(3, pool.stats()['discards'])
+
+    def test_shrink_oversized(self):
+        pool = StreamPool(max_buffer_size=1024)
+        with pool.checkout() as ms:
+            ms.write(bytes(4096))
+        self.assertEqual(0, len(pool))
+        with pool.checkout() as other:
+            self.assertIsNot(ms, other)
+            other.write(bytes(16))
+        self.assertEqual(1, len(pool))
+
+    def test_double_release(self):
+        pool = StreamPool()
+        ms = pool.get_stream()
+        pool.release_stream(ms)
+        pool.release_stream(ms)
+        self.assertEqual(1, len(pool))
+        self.assertIsNot(pool.get_stream(), pool.get_stream())
+
+    def test_release_after_checkout_again(self):
+        pool = StreamPool()
+        checkout = pool.checkout()
+        ms = checkout.__enter__()
+        pool.release_stream(ms)
+        holder = pool.get_stream(b'\x01\x02')
+        self.assertIs(ms, holder)
+        checkout.__exit__(None, None, None)
+        self.assertEqual(b'\x01\x02', holder.read())
+        self.assertEqual(0, len(pool))
+        self.assertIsNot(holder, pool.get_stream())
+        pool.release_stream(holder)
+        self.assertEqual(1, len(pool))
+
+    def test_release_foreign_stream(self):
+        pool = StreamPool()
+        pool.release_stream(StreamManager.get_stream(b'\x01'))
+        self.assertEqual(0, len(pool))
+        self.assertEqual(0, pool.stats()['releases'])
+
+    def test_threads(self):
+        pool = StreamPool(max_size=4)
+        errors = list()
+
+        def work(index: int):
+            data = bytes([index]) * 64
+            for _ in range(500):
+                with pool.checkout() as ms:
+                    writer = BinaryWriter(ms)
+                    writer.write_bytes(data)
+                    if ms.to_bytes() != data:
+                        errors.append(index)
+
+        threads = [threading.Thread(target=work, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertLessEqual(len(pool), 4)
+        self.assertEqual(0, pool.in_use)
+
+    def test_stream_manager(self):
+        with StreamManager.checkout(b'\xff') as ms:
+            self.assertEqual(b'\xff', ms.read())
+        self.assertIn('hit_rate', StreamManager.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
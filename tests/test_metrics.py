@@ -0,0 +1,218 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import json
+import asyncio
+import threading
+
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import websockets
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc
+from dna.network.retry import RetryPolicy
+from dna.network.websocket import Websocket
+from dna.network.aiorestful import AioRestful
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.metrics import Histogram, Instrumentation, MetricsRegistry, RequestInfo
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    failures = 0
+    requests = 0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        _RpcHandler.requests += 1
+        if _RpcHandler.requests <= self.failures:
+            self.close_connection = True
+            return
+        if payload['method'] == 'getblock':
+            body = dict(desc='UNKNOWN BLOCK', error=44001, id=1, jsonrpc='2.0', result='')
+        else:
+            body = dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100)
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 7, 20):
+            histogram.observe(value)
+        self.assertEqual([(1, 2), (5, 3), (10, 4), (float('inf'), 5)], histogram.cumulative_counts())
+        self.assertEqual(5, histogram.count)
+        self.assertEqual(31.5, histogram.sum)
+
+    def test_export(self):
+        registry = MetricsRegistry(latency_buckets=(0.1, 1))
+        info = RequestInfo('rpc', 'getblockcount', 'http://127.0.0.1')
+        info.latency, info.request_bytes, info.response_bytes = 0.05, 70, 60
+        registry.observe(info)
+        failed = RequestInfo('restful', '/api/v1/block/details/height/{}', 'http://127.0.0.1')
+        failed.latency = 2
+        failed.error = SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))
+        registry.observe(failed)
+        registry.observe_retry('restful', '/api/v1/block/details/height/{}')
+        data = registry.to_dict()
+        self.assertEqual(1, data['rpc']['getblockcount']['requests'])
+        self.assertEqual([(0.1, 1), (1, 1), (float('inf'), 1)], data['rpc']['getblockcount']['latency']['buckets'])
+        height_metrics = data['restful']['/api/v1/block/details/height/{}']
+        self.assertEqual({'60002': 1}, height_metrics['errors'])
+        self.assertEqual(1, height_metrics['retries'])
+        self.assertEqual(0, height_metrics['response_bytes']['count'])
+        text = registry.to_prometheus()
+        self.assertIn('# TYPE dna_sdk_request_duration_seconds histogram', text)
+        self.assertIn('dna_sdk_requests_total{protocol="rpc",method="getblockcount"} 1', text)
+        self.assertIn('dna_sdk_request_duration_seconds_bucket{protocol="rpc",method="getblockcount",le="0.1"} 1',
+                      text)
+        self.assertIn('dna_sdk_request_duration_seconds_bucket'
+                      '{protocol="restful",method="/api/v1/block/details/height/{}",le="+Inf"} 1', text)
+        self.assertIn('dna_sdk_errors_total{protocol="restful",method="/api/v1/block/details/height/{}",code="60002"} 1',
+                      text)
+        self.assertIn('dna_sdk_retries_total{protocol="restful",method="/api/v1/block/details/height/{}"} 1', text)
+        self.assertIn('dna_sdk_response_bytes_sum{protocol="rpc",method="getblockcount"} 60', text)
+        registry.clear()
+        self.assertEqual(dict(), dict(registry))
+
+    def test_label_escape(self):
+        registry = MetricsRegistry()
+        registry.observe(RequestInfo('websocket', 'a"b\\c', ''))
+        self.assertIn('method="a\\"b\\\\c"', registry.to_prometheus())
+
+
+class TestRpcInstrumentation(unittest.TestCase):
+    def setUp(self):
+        _RpcHandler.failures = 0
+        _RpcHandler.requests = 0
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _RpcHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_hooks(self):
+        instrumentation = Instrumentation()
+        started, finished = list(), list()
+        instrumentation.add_hook(pre=lambda info: started.append(info.method), post=finished.append)
+        with Rpc(self.url, instrumentation=instrumentation) as rpc:
+            self.assertEqual(100, rpc.get_block_count())
+            self.assertRaises(SDKException, rpc.get_block_by_height, 1)
+        self.assertEqual(['getblockcount', 'getblock'], started)
+        self.assertGreater(finished[0].request_bytes, 0)
+        self.assertGreater(finished[0].response_bytes, 0)
+        self.assertGreater(finished[0].latency, 0)
+        self.assertIsNone(finished[0].error_code)
+        self.assertEqual('44001', finished[1].error_code)
+        metrics = instrumentation.registry.get('rpc', 'getblock')
+        self.assertEqual({'44001': 1}, metrics.errors)
+        self.assertEqual(1, metrics.decode_time.count)
+        instrumentation.remove_hook(post=finished.append)
+        with Rpc(self.url, instrumentation=instrumentation) as rpc:
+            rpc.get_block_count()
+        self.assertEqual(2, len(finished))
+        self.assertEqual(2, instrumentation.registry.get('rpc', 'getblockcount').requests)
+
+    def test_retries(self):
+        _RpcHandler.failures = 1
+        instrumentation = Instrumentation()
+        with Rpc(self.url, retry_policy=RetryPolicy(base_delay=0.01), instrumentation=instrumentation) as rpc:
+            self.assertEqual(100, rpc.get_block_count())
+        metrics = instrumentation.registry.get('rpc', 'getblockcount')
+        self.assertEqual(2, metrics.requests)
+        self.assertEqual(1, metrics.retries)
+        self.assertEqual({'60002': 1}, metrics.errors)
+
+
+class TestAioInstrumentation(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        async def handle_restful(request):
+            return web.json_response(dict(Action='getblockbyheight', Desc='SUCCESS', Error=0, Result='00' * 100))
+
+        app = web.Application()
+        app.router.add_get('/api/v1/block/details/height/{height}', handle_restful)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_restful(self):
+        instrumentation = Instrumentation()
+        async with AioRestful(self.url, instrumentation=instrumentation) as restful:
+            await asyncio.gather(*[restful.get_raw_block_by_height(height) for height in range(3)])
+        metrics = instrumentation.registry.get('restful', '/api/v1/block/details/height/{}')
+        self.assertEqual(3, metrics.requests)
+        self.assertEqual(3, metrics.response_bytes.count)
+        self.assertGreater(metrics.response_bytes.sum, 600)
+
+    @DNA.runner
+    async def test_websocket(self):
+        async def handle_ws(ws_server, *args):
+            async for message in ws_server:
+                msg = json.loads(message)
+                await ws_server.send(json.dumps(dict(Action=msg['Action'], Desc='SUCCESS', Error=0, Id=msg['Id'],
+                                                     Result=10, Version='1.0.0')))
+
+        server = await websockets.serve(handle_ws, '127.0.0.1', 0)
+        instrumentation = Instrumentation()
+        ws = Websocket(f'ws://127.0.0.1:{server.sockets[0].getsockname()[1]}', instrumentation=instrumentation)
+        try:
+            self.assertEqual(10, await ws.get_block_height())
+        finally:
+            await ws.close_connect()
+            server.close()
+            await server.wait_closed()
+        metrics = instrumentation.registry.get('websocket', 'getblockheight')
+        self.assertEqual(1, metrics.requests)
+        self.assertGreater(metrics.request_bytes.sum, 0)
+        self.assertGreater(metrics.response_bytes.sum, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
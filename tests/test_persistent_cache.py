@@ -0,0 +1,183 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+
+from unittest import mock
+
+from dna.sdk import DNA
+from dna.network.aiorestful import AioRestful
+from tools.fake_node import FakeNode
+from dna.network.persistent_cache import PersistentCache
+from dna.network.rpc import Rpc
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'cache.db')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_read_through(self):
+        cache = PersistentCache(self.path)
+        cache.put('getblock', 'a', dict(Height=1))
+        cache.put('getbalance', 'b', dict(ont='1'))
+        self.assertEqual((True, dict(Height=1)), cache.get('getblock', 'a'))
+        cache.close()
+        other = PersistentCache(self.path)
+        self.assertEqual((True, dict(Height=1)), other.get('getblock', 'a'))
+        self.assertEqual((True, dict(Height=1)), other.get('getblock', 'a'))
+        self.assertEqual((False, None), other.get('getbalance', 'b'))
+        stats = other.stats()
+        self.assertEqual(1, stats['disk']['hits'])
+        self.assertEqual(1, stats['disk']['size'])
+        other.close()
+
+    def test_wal(self):
+        cache = PersistentCache(self.path)
+        conn = sqlite3.connect(self.path)
+        self.assertEqual('wal', conn.execute('PRAGMA journal_mode').fetchone()[0])
+        conn.close()
+        cache.close()
+
+    def test_eviction(self):
+        cache = PersistentCache(self.path, max_bytes=4096, max_size=1)
+        for index in range(100):
+            cache.put('getblock', f'key-{index}', 'x' * 100)
+        stats = cache.stats()
+        self.assertLessEqual(stats['disk']['bytes'], 4096)
+        self.assertGreater(stats['disk']['evictions'], 0)
+        self.assertEqual((True, 'x' * 100), cache.get('getblock', 'key-99'))
+        self.assertEqual((False, None), cache.get('getblock', 'key-0'))
+        cache.close()
+
+    def test_read_while_locked(self):
+        cache = PersistentCache(self.path)
+        cache.put('getblock', 'a', dict(Height=1))
+        cache.close()
+        other = PersistentCache(self.path, busy_timeout=5)
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            with mock.patch('dna.network.persistent_cache.time.time', return_value=time.time() + 3600), \
+                    mock.patch('dna.network.persistent_cache.ACCESS_BATCH_SIZE', 1):
+                start = time.monotonic()
+                self.assertEqual((True, dict(Height=1)), other.get('getblock', 'a'))
+                self.assertLess(time.monotonic() - start, 1)
+        finally:
+            conn.execute('ROLLBACK')
+            conn.close()
+        self.assertEqual(0, other.stats()['disk']['errors'])
+        other.close()
+
+    def test_access_time_batch(self):
+        cache = PersistentCache(self.path, max_size=1)
+        for index in range(3):
+            cache.put('getblock', f'key-{index}', index)
+        conn = sqlite3.connect(self.path)
+        conn.execute('UPDATE entries SET accessed = 0')
+        conn.commit()
+        self.assertEqual((True, 0), cache.get('getblock', 'key-0'))
+        self.assertEqual(0, conn.execute("SELECT accessed FROM entries WHERE key = 'key-0'").fetchone()[0])
+        cache.put('getblock', 'key-3', 3)
+        self.assertGreater(conn.execute("SELECT accessed FROM entries WHERE key = 'key-0'").fetchone()[0], 0)
+        self.assertEqual(0, conn.execute("SELECT accessed FROM entries WHERE key = 'key-1'").fetchone()[0])
+        conn.close()
+        cache.close()
+
+    def test_schema_version(self):
+        cache = PersistentCache(self.path)
+        cache.put('getblock', 'a', 1)
+        cache.close()
+        cache = PersistentCache(self.path, schema_version=2)
+        self.assertEqual((False, None), cache.get('getblock', 'a'))
+        cache.close()
+
+    def test_clients(self):
+        cache = PersistentCache(self.path)
+        with FakeNode(height=10) as node:
+            rpc = Rpc(node.rpc_address, cache=cache)
+            block = rpc.get_block_by_height(3)
+            rpc.close()
+            other = PersistentCache(self.path)
+            rpc = Rpc(node.rpc_address, cache=other)
+            self.assertEqual(block, rpc.get_block_by_height(3))
+            rpc.close()
+            self.assertEqual(1, node.request_counts['getblock'])
+            other.close()
+        cache.close()
+
+
+class TestAioPersistentCache(unittest.TestCase):
+    @DNA.runner
+    async def test_restful(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = PersistentCache(os.path.join(path, 'cache.db'))
+            async with FakeNode(height=10) as node:
+                async with AioRestful(node.restful_address, cache=cache) as restful:
+                    block = await restful.get_block_by_height(5)
+                    cache.clear()
+                    self.assertEqual(block, await restful.get_block_by_height(5))
+                    self.assertEqual(2, node.request_counts['getblock'])
+            cache.close()
+
+    @DNA.runner
+    async def test_locked_database_off_loop(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = PersistentCache(os.path.join(path, 'cache.db'), busy_timeout=0.2)
+            conn = sqlite3.connect(os.path.join(path, 'cache.db'), isolation_level=None)
+            conn.execute('BEGIN IMMEDIATE')
+            ticks = list()
+
+            async def tick():
+                while len(ticks) < 5:
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.01)
+
+            try:
+                ticker = asyncio.ensure_future(tick())
+                await cache.aio_put('getblock', 'a', dict(Height=1))
+                self.assertEqual(5, len(ticks))
+                await ticker
+            finally:
+                conn.execute('ROLLBACK')
+                conn.close()
+            self.assertEqual(1, cache.stats()['disk']['errors'])
+            await cache.aio_put('getblock', 'b', dict(Height=2))
+            cache.close()
+            cache = PersistentCache(os.path.join(path, 'cache.db'))
+            is_hit, value = await cache.aio_get('getblock', 'b')
+            self.assertEqual((True, dict(Height=2)), (is_hit, value))
+            value['Height'] = 0
+            self.assertEqual((True, dict(Height=2)), await cache.aio_get('getblock', 'b'))
+            cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,276 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import json
+import asyncio
+import threading
+
+from time import monotonic
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc
+from dna.network.aiorpc import AioRpc
+from dna.network.restful import Restful
+from dna.core.sig import Sig
+from dna.core.transaction import Transaction, TxType
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.retry import CircuitBreaker, Idempotency, RetryPolicy, is_duplicated_tx_error
+
+public_key = bytes.fromhex('03036c12be3726eb283d078dff481175e96224f0b0c632c7a37e10eb40fe6be889')
+sig_data = bytes.fromhex('0113141b59b1a62dc3837da026bbd8d541529632377ab7749d4150b71b97ea39798220f15fa039d8521608a6db5ef582cbc6b'
+                         '007106ae86d30344986adb906af7d')
+payer = bytes.fromhex('4756c9dd829b2142883adbe1ae4f8689a1f673e9')
+
+
+def build_tx() -> Transaction:
+    tx = Transaction(0, TxType.InvokeNeoVm, 500, 20000, payer, bytearray(b'\x00\xc6\x6b'), nonce=1)
+    tx.sig_list.append(Sig([public_key], 1, [sig_data]))
+    return tx
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    failures = 0
+    bodies = list()
+
+    def __reply(self, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        self.bodies.append(body)
+        if len(self.bodies) <= self.failures:
+            # the request reaches the node, but the response is lost.
+            self.close_connection = True
+            return
+        if len(self.bodies) > 1 and 'sendrawtransaction' in body:
+            self.__reply(dict(desc='INTERNAL ERROR', error=43001, id=1, jsonrpc='2.0',
+                              result='duplicated transaction detected'))
+            return
+        self.__reply(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100))
+
+    def do_GET(self):
+        self.bodies.append(self.path)
+        if len(self.bodies) <= self.failures:
+            self.close_connection = True
+            return
+        self.__reply(dict(Action='getblockheight', Desc='SUCCESS', Error=0, Result=99, Version='1.0.0'))
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=0)
+        self.assertEqual([0.1, 0.2, 0.3, 0.3], [policy.get_delay(attempt) for attempt in range(4)])
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        for _ in range(100):
+            self.assertTrue(0 <= policy.get_delay(1) <= 0.2)
+        self.assertRaises(SDKException, RetryPolicy, max_attempts=0)
+        self.assertRaises(SDKException, RetryPolicy, jitter=2)
+
+    def test_idempotency(self):
+        policy = RetryPolicy(idempotency={'getbalance': Idempotency.UNSAFE})
+        self.assertEqual(Idempotency.IDEMPOTENT, policy.get_idempotency('getblock'))
+        self.assertEqual(Idempotency.RESEND, policy.get_idempotency('sendrawtransaction'))
+        self.assertEqual(Idempotency.IDEMPOTENT, policy.get_idempotency('sendrawtransaction_pre_exec'))
+        self.assertEqual(Idempotency.UNSAFE, policy.get_idempotency('sendemergencygovreq'))
+        self.assertEqual(Idempotency.UNSAFE, policy.get_idempotency('getbalance'))
+
+    def test_retry(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+        timeouts = list()
+
+        def send(timeout):
+            timeouts.append(timeout)
+            if len(timeouts) < 3:
+                raise SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))
+            return 1
+
+        self.assertEqual(1, policy.call('http://127.0.0.1', 'getblock', send, timeout=5))
+        self.assertEqual(3, len(timeouts))
+        self.assertEqual(2, policy.retries)
+        self.assertTrue(all(timeout <= 5 for timeout in timeouts))
+
+    def test_no_retry(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+        attempts = list()
+
+        def send(timeout):
+            attempts.append(timeout)
+            raise SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))
+
+        self.assertRaises(SDKException, policy.call, 'http://127.0.0.1', 'sendemergencygovreq', send)
+        self.assertEqual(1, len(attempts))
+
+        def send_other_error(timeout):
+            attempts.append(timeout)
+            raise SDKException(ErrorCode.other_error('unknown block'))
+
+        self.assertRaises(SDKException, policy.call, 'http://127.0.0.1', 'getblock', send_other_error)
+        self.assertEqual(2, len(attempts))
+
+    def test_deadline(self):
+        policy = RetryPolicy(max_attempts=100, base_delay=0.05, max_delay=0.05, jitter=0, deadline=0.3)
+        attempts = list()
+
+        def send(timeout):
+            attempts.append(timeout)
+            raise SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))
+
+        start = monotonic()
+        self.assertRaises(SDKException, policy.call, 'http://127.0.0.1', 'getblock', send, 10)
+        self.assertLess(monotonic() - start, 0.5)
+        self.assertLess(len(attempts), 10)
+        self.assertTrue(all(timeout <= 0.3 for timeout in attempts))
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+        policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+        attempts = list()
+
+        def send(timeout):
+            attempts.append(timeout)
+            if len(attempts) <= 2:
+                raise SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))
+            return 1
+
+        for _ in range(2):
+            self.assertRaises(SDKException, policy.call, 'http://127.0.0.1', 'getblock', send)
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        with self.assertRaises(SDKException) as context:
+            policy.call('http://127.0.0.1', 'getblock', send)
+        self.assertEqual(ErrorCode.circuit_breaker_open('')['error'], context.exception.args[0])
+        self.assertEqual(2, len(attempts))
+        self.assertEqual(1, breaker.rejected)
+        threading.Event().wait(0.15)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+        self.assertEqual(1, policy.call('http://127.0.0.1', 'getblock', send))
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        self.assertEqual('closed', dict(policy)['circuit_state'])
+
+    def test_is_duplicated_tx_error(self):
+        self.assertTrue(is_duplicated_tx_error(SDKException(ErrorCode.other_error('duplicated transaction detected'))))
+        self.assertFalse(is_duplicated_tx_error(SDKException(ErrorCode.other_error('invalid transaction'))))
+
+
+class TestClientRetry(unittest.TestCase):
+    def setUp(self):
+        _FlakyHandler.failures = 0
+        _FlakyHandler.bodies = list()
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_timeout(self):
+        self.assertRaises(SDKException, Rpc, self.url, timeout=0)
+        with Rpc(self.url, timeout=3) as rpc:
+            self.assertEqual(3, rpc.timeout)
+            rpc.timeout = 5
+            self.assertEqual(5, rpc.timeout)
+
+    def test_rpc_retry(self):
+        _FlakyHandler.failures = 2
+        with Rpc(self.url, retry_policy=RetryPolicy(base_delay=0.01)) as rpc:
+            self.assertEqual(100, rpc.get_block_count())
+        self.assertEqual(3, len(_FlakyHandler.bodies))
+
+    def test_rpc_without_retry(self):
+        _FlakyHandler.failures = 1
+        with Rpc(self.url) as rpc:
+            self.assertRaises(SDKException, rpc.get_block_count)
+            self.assertEqual(100, rpc.get_block_count())
+
+    def test_resend_transaction(self):
+        _FlakyHandler.failures = 1
+        tx = build_tx()
+        with Rpc(self.url, retry_policy=RetryPolicy(base_delay=0.01)) as rpc:
+            self.assertEqual(tx.hash256_explorer(), rpc.send_raw_transaction(tx))
+            self.assertEqual(1, rpc.retry_policy.duplicates)
+        self.assertEqual(2, len(_FlakyHandler.bodies))
+        self.assertEqual(_FlakyHandler.bodies[0], _FlakyHandler.bodies[1])
+
+    def test_restful_retry(self):
+        _FlakyHandler.failures = 1
+        with Restful(self.url, retry_policy=RetryPolicy(base_delay=0.01)) as restful:
+            self.assertEqual(99, restful.get_block_height())
+        self.assertEqual(2, len(_FlakyHandler.bodies))
+
+
+class TestAioClientRetry(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.requests = 0
+
+        async def handle_rpc(request):
+            self.requests += 1
+            if self.requests == 1:
+                await asyncio.sleep(1)
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100))
+
+        app = web.Application()
+        app.router.add_post('/', handle_rpc)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_retry_on_timeout(self):
+        async with AioRpc(self.url, timeout=0.2, retry_policy=RetryPolicy(base_delay=0.01)) as rpc:
+            self.assertEqual(100, await rpc.get_block_count())
+        self.assertEqual(2, self.requests)
+
+    @DNA.runner
+    async def test_timeout_without_retry(self):
+        async with AioRpc(self.url, timeout=0.2) as rpc:
+            with self.assertRaises(SDKException):
+                await rpc.get_block_count()
+
+
+if __name__ == '__main__':
+    unittest.main()
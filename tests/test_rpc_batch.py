@@ -0,0 +1,110 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc, RpcMethod
+from dna.network.aiorpc import AioRpc
+from dna.exception.exception import SDKException
+
+
+async def handle_batch(request):
+    result = list()
+    for payload in await request.json():
+        if payload['method'] == RpcMethod.GET_BLOCK_COUNT:
+            result.append(dict(desc='SUCCESS', error=0, id=payload['id'], jsonrpc='2.0', result=100))
+        elif payload['method'] == RpcMethod.GET_BLOCK_HASH:
+            result.append(dict(desc='SUCCESS', error=0, id=payload['id'], jsonrpc='2.0',
+                               result=f'{payload["params"][0]:064x}'))
+        else:
+            result.append(dict(desc='INVALID METHOD', error=42001, id=payload['id'], jsonrpc='2.0', result=''))
+    return web.json_response(result[::-1])
+
+
+class TestRpcBatch(unittest.TestCase):
+    def test_generate_json_rpc_batch_payload(self):
+        rpc = Rpc(qid=1)
+        calls = [RpcMethod.GET_BLOCK_COUNT] + [(RpcMethod.GET_BLOCK_HASH, [height]) for height in range(4)]
+        batch_payload_list = rpc.generate_json_rpc_batch_payload(calls, 2)
+        self.assertEqual([2, 2, 1], [len(batch_payload) for batch_payload in batch_payload_list])
+        ids = [payload['id'] for batch_payload in batch_payload_list for payload in batch_payload]
+        self.assertEqual(list(range(5)), ids)
+        self.assertEqual([], batch_payload_list[0][0]['params'])
+        self.assertEqual([3], batch_payload_list[2][0]['params'])
+        self.assertRaises(SDKException, rpc.generate_json_rpc_batch_payload, calls, 0)
+
+    def test_parse_json_rpc_batch_response(self):
+        rpc = Rpc(qid=1)
+        batch_payload = rpc.generate_json_rpc_batch_payload([RpcMethod.GET_BLOCK_COUNT] * 3)[0]
+        batch_response = [dict(desc='SUCCESS', error=0, id=2, jsonrpc='2.0', result=3),
+                          dict(desc='INVALID PARAMS', error=45002, id=0, jsonrpc='2.0', result=''),
+                          dict(jsonrpc='2.0', id=99, result=99)]
+        result = rpc.parse_json_rpc_batch_response(batch_payload, batch_response)
+        self.assertIsInstance(result[0], SDKException)
+        self.assertIn('INVALID PARAMS', result[0].args[1])
+        self.assertIsInstance(result[1], SDKException)
+        self.assertEqual(3, result[2])
+        full = rpc.parse_json_rpc_batch_response(batch_payload, batch_response, is_full=True)
+        self.assertEqual(batch_response[0], full[2])
+
+
+class TestAioRpcBatch(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        app = web.Application()
+        app.router.add_post('/', handle_batch)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_batch(self):
+        calls = [(RpcMethod.GET_BLOCK_HASH, [height]) for height in range(10)]
+        calls.insert(3, RpcMethod.GET_VERSION)
+        calls.append(RpcMethod.GET_BLOCK_COUNT)
+        async with AioRpc(self.url) as rpc:
+            result = await rpc.batch(calls, max_batch_size=4)
+        self.assertEqual(12, len(result))
+        self.assertIsInstance(result[3], SDKException)
+        self.assertEqual([f'{height:064x}' for height in range(10)], result[:3] + result[4:11])
+        self.assertEqual(100, result[11])
+        with Rpc(self.url) as rpc:
+            sync_result = await self.__run_sync(rpc.batch, calls, 5)
+        self.assertEqual(result[:3] + result[4:], sync_result[:3] + sync_result[4:])
+
+    @staticmethod
+    async def __run_sync(func, *args):
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+
+if __name__ == '__main__':
+    unittest.main()
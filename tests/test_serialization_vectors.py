@@ -0,0 +1,95 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import hashlib
+
+from dna.core.sig import Sig
+from dna.core.program import ProgramBuilder
+from dna.io.binary_writer import BinaryWriter, encode_var_int, encode_var_bytes
+from dna.io.memory_stream import StreamManager
+from dna.utils.utils import bytes_from_hex, bytes_reader
+
+public_key = bytes.fromhex('03036c12be3726eb283d078dff481175e96224f0b0c632c7a37e10eb40fe6be889')
+sig_data = bytes.fromhex('0113141b59b1a62dc3837da026bbd8d541529632377ab7749d4150b71b97ea397982'
+                         '20f15fa039d8521608a6db5ef582cbc6b007106ae86d30344986adb906af7d')
+
+PUSH_BYTES_VECTORS = [
+    (1, '015f', '6b2884fef44bd4288621a2cda9f88ca07b4808619dcf88729412a0bef080a581'),
+    (75, '4b5feceb66ff', '810f6f6e200e44e731f2101b6ed60d96b7452de0b5436b44ded166f625f9cefc'),
+    (76, '4c4c5feceb66', '263e8ff04834f031aa3548aad36e6eb6d819d1cf98102fefeee38b32b1d2b9b2'),
+    (255, '4cff5feceb66', '6c2ee9dadc21d90ac62bb9b8aecaab864f4dced4335db1818a1ef0b9466a39fe'),
+    (256, '4d00015feceb', '64f6571dd1f8884ea8b7a282c062033f67a8c681a46ff48d365ba4aa1ae625a5'),
+    (65535, '4dffff5feceb', 'c440b344f6d46909fe8ff3044de859905661680a218254f5b67cd16837847953'),
+    (65536, '4e000001005f', 'ae12dad5629b55585c6e4ff8a269000f31921fa4307e7d3f472b147ea414cba0'),
+]
+
+SIG_VECTOR = '42410113141b59b1a62dc3837da026bbd8d541529632377ab7749d4150b71b97ea39798220f15fa039d852' \
+             '1608a6db5ef582cbc6b007106ae86d30344986adb906af7d232103036c12be3726eb283d078dff481175e9' \
+             '6224f0b0c632c7a37e10eb40fe6be889ac'
+
+
+def make_data(length: int) -> bytes:
+    data = b''
+    index = 0
+    while len(data) < length:
+        data += hashlib.sha256(str(index).encode()).digest()
+        index += 1
+    return data[:length]
+
+
+class TestSerializationVectors(unittest.TestCase):
+    def test_push_bytes(self):
+        for length, prefix, digest in PUSH_BYTES_VECTORS:
+            script = ProgramBuilder.push_bytes(make_data(length))
+            self.assertIsInstance(script, bytearray)
+            self.assertEqual(prefix, script[:6].hex())
+            self.assertEqual(digest, hashlib.sha256(script).hexdigest())
+        self.assertRaises(ValueError, ProgramBuilder.push_bytes, b'')
+
+    def test_sig_serialize(self):
+        serialized = Sig([public_key], 1, [sig_data]).serialize()
+        self.assertIsInstance(serialized, bytearray)
+        self.assertEqual(SIG_VECTOR, serialized.hex())
+        self.assertEqual(SIG_VECTOR, Sig.deserialize_from(serialized).serialize().hex())
+
+    def test_encode_var_int(self):
+        for value in (0, 1, 0xfc, 0xfd, 0xffff, 0x10000, 0xffffffff, 0x100000000, 2 ** 64 - 1):
+            with StreamManager.checkout() as ms:
+                BinaryWriter(ms).write_var_int(value)
+                self.assertEqual(ms.to_bytes(), encode_var_int(value))
+        with StreamManager.checkout() as ms:
+            BinaryWriter(ms).write_var_bytes(public_key)
+            self.assertEqual(ms.to_bytes(), encode_var_bytes(public_key))
+        self.assertEqual('21' + public_key.hex(), encode_var_bytes(public_key).hex())
+
+    def test_bytes_from_hex(self):
+        self.assertEqual(bytearray(b'\x01\xab'), bytes_from_hex('01ab'))
+        self.assertEqual(bytearray(b'\x01\xab'), bytes_from_hex(b'01AB'))
+        self.assertEqual(bytearray(b'\x01\xab'), bytes_reader(b'01ab'))
+        self.assertEqual(bytearray(b'\x01'), bytes_reader(b'01a'))
+        self.assertEqual(bytearray(), bytes_reader(b''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import unittest
+import threading
+
+from socketserver import ThreadingMixIn
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from aiohttp import web
+from aiohttp.client import ClientSession
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc
+from dna.network.aiorpc import AioRpc
+from dna.network.aiorestful import AioRestful
+from dna.network.session import PooledSession
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    ports = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.ports.add(self.client_address[1])
+        body = json.dumps(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledSession(unittest.TestCase):
+    def setUp(self):
+        _KeepAliveHandler.ports = set()
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_session_headers(self):
+        session = PooledSession(pool_size=4, keep_alive=False, gzip=False)
+        self.assertEqual('close', session.session.headers['Connection'])
+        self.assertEqual('identity', session.session.headers['Accept-Encoding'])
+        self.assertIs(session.session, session.session)
+        session.close()
+
+    def test_reuse_connection(self):
+        with Rpc(self.url, pool_size=1) as rpc:
+            for _ in range(5):
+                self.assertEqual(100, rpc.get_block_count())
+        self.assertEqual(1, len(_KeepAliveHandler.ports))
+
+    def test_share_between_threads(self):
+        with Rpc(self.url, pool_size=2) as rpc:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                counts = list(executor.map(lambda _: rpc.get_block_count(), range(32)))
+        self.assertEqual([100] * 32, counts)
+        self.assertLessEqual(len(_KeepAliveHandler.ports), 2)
+
+
+class TestAioPooledSession(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.ports = set()
+
+        async def handle_rpc(request):
+            self.ports.add(request.transport.get_extra_info('peername')[1])
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100))
+
+        async def handle_restful(request):
+            return web.json_response(dict(Action='getblockheight', Desc='SUCCESS', Error=0, Result=99))
+
+        app = web.Application()
+        app.router.add_post('/', handle_rpc)
+        app.router.add_get('/api/v1/block/height', handle_restful)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_reuse_session(self):
+        async with AioRpc(self.url, limit=4, limit_per_host=1) as rpc:
+            for _ in range(5):
+                self.assertEqual(100, await rpc.get_block_count())
+            session = rpc.session
+            self.assertEqual(4, session.connector.limit)
+            self.assertEqual(1, session.connector.limit_per_host)
+        self.assertTrue(session.closed)
+        self.assertIsNone(rpc.session)
+        self.assertEqual(1, len(self.ports))
+
+    @DNA.runner
+    async def test_injected_session(self):
+        async with ClientSession() as session:
+            async with AioRestful(self.url, session=session) as restful:
+                self.assertEqual(99, await restful.get_block_height())
+            self.assertFalse(session.closed)
+            self.assertIs(session, restful.session)
+
+    @DNA.runner
+    async def test_replace_owned_session(self):
+        rpc = AioRpc(self.url)
+        self.assertEqual(100, await rpc.get_block_count())
+        owned_session = rpc.session
+        async with ClientSession() as session:
+            rpc.session = session
+            self.assertEqual(100, await rpc.get_block_count())
+            self.assertTrue(owned_session.closed)
+            await rpc.close()
+            self.assertFalse(session.closed)
+
+    def test_switch_event_loop(self):
+        rpc = AioRpc(self.url)
+        session_list = list()
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            try:
+                self.assertEqual(100, loop.run_until_complete(rpc.get_block_count()))
+                session_list.append(rpc.session)
+            finally:
+                loop.close()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(rpc.close())
+        finally:
+            loop.close()
+        self.assertIsNot(session_list[0], session_list[1])
+        self.assertTrue(all(session.closed for session in session_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import unittest
+
+import websockets
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.aiorpc import AioRpc
+from dna.network.aiorestful import AioRestful
+from dna.network.websocket import Websocket
+from dna.network.singleflight import SingleFlight
+from dna.exception.exception import SDKException
+from dna.exception.error_code import ErrorCode
+
+
+class TestSingleFlight(unittest.TestCase):
+    @DNA.runner
+    async def test_share_request(self):
+        single_flight = SingleFlight()
+        calls = list()
+
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        result = await asyncio.gather(*[single_flight.request('key', send) for _ in range(10)])
+        self.assertEqual([1] * 10, result)
+        self.assertEqual(2, await single_flight.request('key', send))
+        self.assertEqual(dict(requests=2, coalesced=9, in_flight=0), dict(single_flight))
+
+    @DNA.runner
+    async def test_share_error(self):
+        single_flight = SingleFlight()
+
+        async def send():
+            await asyncio.sleep(0.01)
+            raise SDKException(ErrorCode.connect_timeout('fake'))
+
+        result = await asyncio.gather(*[single_flight.request('key', send) for _ in range(3)], return_exceptions=True)
+        self.assertTrue(all(isinstance(e, SDKException) for e in result))
+        self.assertEqual(0, len(single_flight))
+
+    @DNA.runner
+    async def test_cancel_caller(self):
+        single_flight = SingleFlight()
+
+        async def send():
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        first = asyncio.ensure_future(single_flight.request('key', send))
+        second = asyncio.ensure_future(single_flight.request('key', send))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        self.assertEqual('result', await second)
+
+
+class TestAioCoalesce(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.requests = list()
+
+        async def handle_rpc(request):
+            payload = await request.json()
+            self.requests.append(payload['method'])
+            await asyncio.sleep(0.02)
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100))
+
+        async def handle_restful(request):
+            self.requests.append(request.path)
+            await asyncio.sleep(0.02)
+            return web.json_response(dict(Action='getblockheight', Desc='SUCCESS', Error=0, Result=99))
+
+        app = web.Application()
+        app.router.add_post('/', handle_rpc)
+        app.router.add_get('/api/v1/block/height', handle_restful)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_aio_rpc(self):
+        async with AioRpc(self.url) as rpc:
+            result = await asyncio.gather(*[rpc.get_block_count() for _ in range(20)])
+            self.assertEqual([100] * 20, result)
+            self.assertEqual(['getblockcount'], self.requests)
+            await asyncio.gather(*[rpc.get_block_hash_by_height(height) for height in range(3)])
+            self.assertEqual(4, len(self.requests))
+            self.assertEqual(19, rpc.single_flight.coalesced)
+
+    @DNA.runner
+    async def test_aio_rpc_without_coalesce(self):
+        async with AioRpc(self.url, coalesce=False) as rpc:
+            await asyncio.gather(*[rpc.get_block_count() for _ in range(5)])
+        self.assertEqual(5, len(self.requests))
+        self.assertIsNone(rpc.single_flight)
+
+    @DNA.runner
+    async def test_aio_restful(self):
+        async with AioRestful(self.url) as restful:
+            result = await asyncio.gather(*[restful.get_block_height() for _ in range(20)])
+        self.assertEqual([99] * 20, result)
+        self.assertEqual(['/api/v1/block/height'], self.requests)
+
+    @DNA.runner
+    async def test_coalesced_result_not_shared(self):
+        async with AioRpc(self.url) as rpc:
+            result = await asyncio.gather(*[rpc.get_block_height() for _ in range(5)])
+        self.assertEqual([99] * 5, result)
+        self.requests.clear()
+        async with AioRestful(self.url) as restful:
+            result = await asyncio.gather(*[restful.get_block_count() for _ in range(5)])
+        self.assertEqual([100] * 5, result)
+        self.assertEqual(['/api/v1/block/height'], self.requests)
+
+
+class TestWebsocketCoalesce(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.actions = list()
+
+        async def handle_ws(ws_server, *args):
+            async for message in ws_server:
+                msg = json.loads(message)
+                self.actions.append(msg['Action'])
+                await ws_server.send(json.dumps(dict(Action=msg['Action'], Desc='SUCCESS', Error=0, Id=msg['Id'],
+                                                     Result=10, Version='1.0.0')))
+
+        self.server = await websockets.serve(handle_ws, '127.0.0.1', 0)
+        self.url = f'ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @DNA.runner
+    async def test_websocket(self):
+        ws = Websocket(self.url)
+        result = await asyncio.gather(*[ws.get_block_height() for _ in range(10)])
+        self.assertEqual([10] * 10, result)
+        self.assertEqual(['getblockheight'], self.actions)
+        await ws.close_connect()
+
+
+if __name__ == '__main__':
+    unittest.main()
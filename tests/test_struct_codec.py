@@ -0,0 +1,90 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from dna.io import struct_codec
+from dna.core.block import Header
+from dna.core.transaction import Transaction, TX_HEADER_FORMAT
+from dna.exception.exception import SDKException
+from dna.io.binary_reader import BinaryReader
+from dna.io.binary_writer import BinaryWriter
+from dna.io.memory_reader import MemoryReader
+from dna.io.memory_stream import StreamManager
+
+
+class TestStructCodec(unittest.TestCase):
+    def test_get_codec(self):
+        self.assertIs(struct_codec.get_codec('<I'), struct_codec.get_codec('<I'))
+        self.assertEqual(struct_codec.get_codec('<BBIQQ20s').size, 42)
+
+    def test_encode_var_int(self):
+        vectors = [(0, '00'), (0xfc, 'fc'), (0xfd, 'fdfd00'), (0xffff, 'fdffff'), (0x10000, 'fe00000100'),
+                   (0xffffffff, 'feffffffff'), (0x100000000, 'ff0000000001000000')]
+        for value, encoded in vectors:
+            self.assertEqual(encoded, struct_codec.encode_var_int(value).hex())
+            with StreamManager.checkout() as ms:
+                writer = BinaryWriter(ms)
+                writer.write_var_int(value)
+                self.assertEqual(encoded, ms.hexlify().decode())
+                ms.seek(0)
+                self.assertEqual(value, BinaryReader(ms).read_var_int())
+            self.assertEqual(value, MemoryReader(bytes.fromhex(encoded)).read_var_int())
+        self.assertRaises(ValueError, struct_codec.encode_var_int, -1)
+
+    def test_read_var_int_max_size(self):
+        self.assertRaises(SDKException, MemoryReader(bytes.fromhex('fdffff')).read_var_int, 0xfffe)
+
+    def test_fields(self):
+        values = (0, 0xd1, 0x12345678, 500, 20000, bytes(range(20)))
+        with StreamManager.checkout() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_fields(TX_HEADER_FORMAT, *values)
+            data = ms.to_bytes()
+            ms.seek(0)
+            self.assertEqual(values, BinaryReader(ms).read_fields(TX_HEADER_FORMAT))
+        self.assertEqual('00d178563412f401000000000000204e000000000000000102030405060708090a0b0c0d0e0f10111213',
+                         data.hex())
+        self.assertEqual(values, MemoryReader(data).read_fields(TX_HEADER_FORMAT))
+        self.assertRaises(SDKException, MemoryReader(data[:-1]).read_fields, TX_HEADER_FORMAT)
+
+    def test_transaction_header(self):
+        tx = Transaction(0, 0xd1, 500, 20000, bytes(range(20)), bytearray(b'\x00\xc1\x04main'), nonce=1)
+        tx_bytes = tx.serialize()
+        header = struct_codec.get_codec(TX_HEADER_FORMAT).pack(0, 0xd1, 1, 500, 20000, bytes(range(20)))
+        self.assertEqual(header, tx_bytes[:42])
+        self.assertEqual(tx_bytes, Transaction.deserialize_from(tx_bytes).serialize())
+        tx.payer = bytes(19)
+        self.assertRaises(SDKException, tx.serialize)
+
+    def test_header(self):
+        header = Header(1, bytes(range(32)), bytes(32), bytes(range(32, 64)), 1560000000, 42, 7, b'\x01',
+                        bytes(20), [b'\x02' * 33], [b'\x03' * 65])
+        header_bytes = header.serialize()
+        self.assertEqual(header_bytes, Header.deserialize_from(header_bytes).serialize())
+        restored = Header.deserialize_from(header_bytes)
+        self.assertEqual((1, 1560000000, 42, 7), (restored.version, restored.timestamp, restored.height,
+                                                  restored.consensus_data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import unittest
+
+import websockets
+
+from dna.sdk import DNA
+from dna.network.websocket import Websocket
+from dna.network.subscription import OverflowPolicy, SubscriptionGap, SubscriptionStream
+
+
+class FakeChain(object):
+    def __init__(self):
+        self.height = 0
+        self.subscribers = set()
+
+    async def handle(self, ws_server, *args):
+        try:
+            async for message in ws_server:
+                msg = json.loads(message)
+                result = self.height if msg['Action'] == 'getblockheight' else ''
+                await ws_server.send(json.dumps(dict(Action=msg['Action'], Desc='SUCCESS', Error=0, Id=msg['Id'],
+                                                     Result=result, Version='1.0.0')))
+                if msg['Action'] == 'subscribe':
+                    self.subscribers.add(ws_server)
+        finally:
+            self.subscribers.discard(ws_server)
+
+    async def produce(self, count: int):
+        for _ in range(count):
+            self.height += 1
+            msg = json.dumps(dict(Action='sendblocktxhashs', Desc='SUCCESS', Error=0, Version='1.0.0',
+                                  Result=dict(Height=self.height, TxHashes=[])))
+            for ws_server in list(self.subscribers):
+                await ws_server.send(msg)
+            await asyncio.sleep(0.005)
+
+
+class TestSubscriptionStream(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.chain = FakeChain()
+        self.server = await websockets.serve(self.chain.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ws = Websocket(f'ws://127.0.0.1:{self.port}')
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.ws.close_connect()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def wait_subscribed(self):
+        while len(self.chain.subscribers) == 0:
+            await asyncio.sleep(0.005)
+
+    @DNA.runner
+    async def test_stream(self):
+        async with self.ws.stream([], is_tx_hash=True, heartbeat_interval=0.01) as stream:
+            await self.wait_subscribed()
+            await self.chain.produce(5)
+            heights = [(await stream.__anext__())['Height'] for _ in range(5)]
+        self.assertEqual([1, 2, 3, 4, 5], heights)
+        self.assertTrue(stream.closed)
+
+    @DNA.runner
+    async def test_reconnect_and_report_gap(self):
+        async with self.ws.stream([], is_tx_hash=True, reconnect_delay=0.01) as stream:
+            await self.wait_subscribed()
+            await self.chain.produce(3)
+            self.server.close()
+            await self.server.wait_closed()
+            await self.chain.produce(4)
+            self.server = await websockets.serve(self.chain.handle, '127.0.0.1', self.port)
+            await self.wait_subscribed()
+            await self.chain.produce(1)
+            items = [await asyncio.wait_for(stream.__anext__(), 1) for _ in range(5)]
+        self.assertEqual([1, 2, 3], [item['Height'] for item in items[:3]])
+        self.assertIsInstance(items[3], SubscriptionGap)
+        self.assertEqual(4, items[3].start_height)
+        self.assertIn(items[3].end_height, (7, 8))
+        self.assertEqual(8, items[4]['Height'])
+        self.assertGreaterEqual(stream.reconnect_count, 1)
+
+    @DNA.runner
+    async def test_drop_oldest(self):
+        async with self.ws.stream([], is_tx_hash=True, max_queue_size=3) as stream:
+            await self.wait_subscribed()
+            await self.chain.produce(6)
+            await asyncio.sleep(0.05)
+            items = [await stream.__anext__() for _ in range(4)]
+        self.assertEqual(dict(StartHeight=1, EndHeight=3, Reason='overflow'), dict(items[0]))
+        self.assertEqual([4, 5, 6], [item['Height'] for item in items[1:]])
+        self.assertEqual(3, stream.dropped_count)
+
+    @DNA.runner
+    async def test_drop_newest(self):
+        stream = SubscriptionStream(self.ws, [], is_tx_hash=True, max_queue_size=2,
+                                    overflow_policy=OverflowPolicy.DropNewest)
+        async with stream:
+            await self.wait_subscribed()
+            await self.chain.produce(4)
+            await asyncio.sleep(0.05)
+            items = [await stream.__anext__() for _ in range(3)]
+        self.assertEqual([1, 2], [item['Height'] for item in items[:2]])
+        self.assertEqual((3, 4), (items[2].start_height, items[2].end_height))
+
+    @DNA.runner
+    async def test_raise_unexpected_error(self):
+        recv_subscribe_info = self.ws.recv_subscribe_info
+
+        async def recv_malformed_info(is_full: bool = False):
+            msg = await recv_subscribe_info(is_full)
+            if msg['Result']['Height'] == 2:
+                return msg['Result']['Missing']
+            return msg
+
+        self.ws.recv_subscribe_info = recv_malformed_info
+        async with self.ws.stream([], is_tx_hash=True) as stream:
+            await self.wait_subscribed()
+            await self.chain.produce(2)
+            self.assertEqual(1, (await asyncio.wait_for(stream.__anext__(), 1))['Height'])
+            with self.assertRaises(KeyError):
+                await asyncio.wait_for(stream.__anext__(), 1)
+            self.assertTrue(stream.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
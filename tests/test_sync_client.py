@@ -0,0 +1,104 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from dna.network.aiorpc import AioRpc
+from dna.network.sync_client import EventLoopThread, SyncClient, get_shared_loop_thread
+from dna.exception.exception import SDKException
+
+
+class TestEventLoopThread(unittest.TestCase):
+    def test_run(self):
+        loop_thread = EventLoopThread()
+        self.assertEqual(3, loop_thread.run(asyncio.sleep(0.01, 3)))
+
+        async def block_in_loop():
+            return loop_thread.run(asyncio.sleep(0))
+
+        with self.assertRaises(SDKException):
+            loop_thread.run(block_in_loop())
+        loop_thread.close()
+        self.assertTrue(loop_thread.closed)
+        with self.assertRaises(SDKException):
+            loop_thread.run(asyncio.sleep(0))
+
+    def test_shared(self):
+        self.assertIs(get_shared_loop_thread(), get_shared_loop_thread())
+
+
+class TestSyncClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server_thread = EventLoopThread()
+        cls.ports = set()
+
+        async def handle_rpc(request):
+            cls.ports.add(request.transport.get_extra_info('peername')[1])
+            payload = await request.json()
+            if payload['method'] == 'getblock':
+                result = dict(Header=dict(Height=payload['params'][0]))
+            else:
+                result = 100
+            await asyncio.sleep(0.01)
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=result))
+
+        async def start():
+            app = web.Application()
+            app.router.add_post('/', handle_rpc)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            return runner, site._server.sockets[0].getsockname()[1]
+
+        cls.runner, port = cls.server_thread.run(start())
+        cls.url = f'http://127.0.0.1:{port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server_thread.run(cls.runner.cleanup())
+        cls.server_thread.close()
+
+    def test_call_from_threads(self):
+        TestSyncClient.ports.clear()
+        with SyncClient(AioRpc(self.url, limit=2)) as rpc:
+            self.assertEqual(100, rpc.get_block_count())
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                counts = list(executor.map(lambda height: rpc.get_block_hash_by_height(height), range(32)))
+            self.assertEqual([100] * 32, counts)
+            self.assertEqual(self.url, rpc.get_address())
+        self.assertLessEqual(len(TestSyncClient.ports), 2)
+
+    def test_iterate(self):
+        with SyncClient(AioRpc(self.url)) as rpc:
+            heights = [height for height, block in rpc.iter_blocks(5, 25, concurrency=4)]
+        self.assertEqual(list(range(5, 25)), heights)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+
+from time import monotonic
+
+from aiohttp import web
+
+from dna.sdk import DNA
+from dna.network.rpc import Rpc
+from dna.network.aiorpc import AioRpc
+from dna.exception.error_code import ErrorCode
+from dna.exception.exception import SDKException
+from dna.network.throttle import AdaptiveConcurrency, Throttle, ThrottleSlot, TokenBucket, is_overload_error
+
+
+class TestThrottle(unittest.TestCase):
+    def test_is_overload_error(self):
+        self.assertTrue(is_overload_error(SDKException(ErrorCode.connect_timeout('http://127.0.0.1'))))
+        self.assertTrue(is_overload_error(ConnectionResetError()))
+        self.assertFalse(is_overload_error(SDKException(ErrorCode.param_error)))
+        self.assertFalse(is_overload_error(asyncio.CancelledError()))
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, burst=5)
+        self.assertEqual([0.0] * 5, [bucket.reserve() for _ in range(5)])
+        self.assertAlmostEqual(0.01, bucket.reserve(), delta=0.005)
+        bucket.on_overload()
+        self.assertEqual(50, bucket.rate)
+        bucket.on_overload()
+        self.assertEqual(50, bucket.rate)
+        bucket.on_success()
+        self.assertEqual(51, bucket.rate)
+        self.assertRaises(SDKException, TokenBucket, 0)
+
+    def test_token_bucket_rate(self):
+        throttle = Throttle(TokenBucket(rate=200, burst=1, adaptive=False))
+        start = monotonic()
+        for _ in range(21):
+            with ThrottleSlot(throttle):
+                pass
+        self.assertGreaterEqual(monotonic() - start, 0.09)
+        self.assertEqual(21, throttle.requests)
+
+    def test_aimd(self):
+        concurrency = AdaptiveConcurrency(initial_limit=4, min_limit=1, max_limit=5)
+        for _ in range(4):
+            self.assertTrue(concurrency.try_acquire())
+        self.assertFalse(concurrency.try_acquire())
+        for _ in range(4):
+            concurrency.release(0.01)
+        self.assertEqual(4, concurrency.limit)
+        concurrency.acquire()
+        concurrency.release(0.01)
+        self.assertEqual(5, concurrency.limit)
+        self.assertEqual(0, concurrency.in_flight)
+        concurrency.acquire()
+        concurrency.release(0.01, SDKException(ErrorCode.connect_timeout('http://127.0.0.1')))
+        self.assertEqual(2, concurrency.limit)
+        concurrency.acquire()
+        concurrency.release(1)
+        # backs off at most once per round trip.
+        self.assertEqual(2, concurrency.limit)
+        concurrency.acquire()
+        concurrency.release(None, SDKException(ErrorCode.param_error))
+        self.assertEqual(2, concurrency.limit)
+        self.assertRaises(SDKException, AdaptiveConcurrency, 0)
+
+    def test_iter(self):
+        throttle = Throttle(TokenBucket(rate=10), AdaptiveConcurrency(initial_limit=2))
+        with self.assertRaises(ValueError):
+            with ThrottleSlot(throttle):
+                raise ValueError()
+        data = dict(throttle)
+        self.assertEqual(1, data['requests'])
+        self.assertEqual(1, data['overloads'])
+        self.assertEqual(5, data['rate'])
+        self.assertEqual(0, data['in_flight'])
+
+    def test_rpc_overload(self):
+        throttle = Throttle(concurrency=AdaptiveConcurrency(initial_limit=8))
+        rpc = Rpc('http://127.0.0.1:1', throttle=throttle)
+        self.assertIs(throttle, rpc.throttle)
+        self.assertRaises(SDKException, rpc.get_block_count)
+        self.assertEqual(1, throttle.overloads)
+        self.assertEqual(4, throttle.concurrency.limit)
+        self.assertEqual(0, throttle.concurrency.in_flight)
+
+
+class TestAioThrottle(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handle_rpc(request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.02)
+            self.in_flight -= 1
+            return web.json_response(dict(desc='SUCCESS', error=0, id=1, jsonrpc='2.0', result=100))
+
+        app = web.Application()
+        app.router.add_post('/', handle_rpc)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        await self.runner.cleanup()
+
+    @DNA.runner
+    async def test_concurrency_limit(self):
+        concurrency = AdaptiveConcurrency(initial_limit=2, max_limit=2)
+        async with AioRpc(self.url, coalesce=False, throttle=Throttle(concurrency=concurrency)) as rpc:
+            counts = await asyncio.gather(*[rpc.get_block_count() for _ in range(10)])
+        self.assertEqual([100] * 10, counts)
+        self.assertEqual(2, self.max_in_flight)
+        self.assertEqual(0, concurrency.in_flight)
+
+    @DNA.runner
+    async def test_cancelled_request_releases_slot(self):
+        concurrency = AdaptiveConcurrency(initial_limit=1, max_limit=1)
+        async with AioRpc(self.url, coalesce=False, throttle=Throttle(concurrency=concurrency)) as rpc:
+            task = asyncio.ensure_future(rpc.get_block_count())
+            await asyncio.sleep(0.005)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(0, concurrency.in_flight)
+            self.assertEqual(100, await rpc.get_block_count())
+        self.assertEqual(1, concurrency.limit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,6 +31,8 @@ from tests import acct1, acct2, acct3, sdk, not_panic_exception
 from dna.utils import utils
 from dna.common.address import Address
 from dna.core.transaction import Transaction
+from dna.core.deploy_transaction import DeployTransaction
+from dna.vm.vm_type import VmType
 
 
 class TestTransaction(unittest.TestCase):
@@ -51,6 +53,34 @@ class TestTransaction(unittest.TestCase):
         self.assertGreaterEqual(tx.gas_price, 0)
         self.assertGreaterEqual(tx.nonce, 0)
 
+    def test_serialize_unsigned_cache(self):
+        payer = bytes.fromhex('4756c9dd829b2142883adbe1ae4f8689a1f673e9')
+        tx = Transaction(0, 0xd1, 500, 20000, payer, bytearray(b'\x00\xc6\x6b'), nonce=1)
+        tx_hash = tx.hash256()
+        self.assertIs(tx.serialize_unsigned(), tx.serialize_unsigned())
+        self.assertIs(tx_hash, tx.hash256())
+        self.assertEqual(tx_hash.hex(), tx.hash256(is_hex=True))
+        self.assertEqual(tx_hash[::-1].hex(), tx.hash256_explorer())
+        for field, value in [('nonce', 2), ('gas_price', 0), ('gas_limit', 1), ('payload', b'\x51'),
+                             ('attributes', [b'\x20\x00']), ('payer', bytes(20))]:
+            setattr(tx, field, value)
+            self.assertNotEqual(tx_hash, tx.hash256())
+            tx_hash = tx.hash256()
+            self.assertEqual(tx.serialize(), Transaction.deserialize_from(tx.serialize()).serialize())
+        tx.attributes.append(b'\x81\x02\xab\xcd')
+        self.assertNotEqual(tx_hash, tx.hash256())
+        self.assertEqual(2, len(Transaction.deserialize_from(tx.serialize()).attributes))
+        self.assertRaises(AttributeError, setattr, tx, 'unknown', 0)
+
+    def test_deploy_code_immutable(self):
+        code = bytearray.fromhex('00c56b')
+        tx = DeployTransaction(code, VmType.Neo, 'name', gas_price=500, gas_limit=20000, payer=bytes(20))
+        tx_hash = tx.hash256()
+        code[0] = 0x51
+        self.assertIsInstance(tx.code, bytes)
+        self.assertEqual(bytes.fromhex('00c56b'), tx.code)
+        self.assertEqual(tx_hash, Transaction.deserialize_from(tx.serialize()).hash256())
+
     @not_panic_exception
     def test_multi_serialize(self):
         pub_keys = [acct1.get_public_key_bytes(), acct2.get_public_key_bytes(), acct3.get_public_key_bytes()]
@@ -0,0 +1,142 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import unittest
+import threading
+
+from dna.sdk import DNA
+from dna.exception.exception import SDKException
+from dna.exception.error_code import ErrorCode
+from dna.network.fetcher import AioRangeFetcher
+from dna.network.tx_watcher import TxWatcher, SyncTxWatcher
+
+
+class FakeChain(AioRangeFetcher):
+    def __init__(self):
+        self.height = 10
+        self.blocks = dict()
+        self.mem_pool = set()
+        self.height_requests = 0
+
+    def send(self, tx_hash: str):
+        self.mem_pool.add(tx_hash)
+
+    def produce(self, *tx_hashes: str):
+        self.height += 1
+        self.blocks[self.height] = [dict(TxHash=tx_hash, State=1, Notify=list()) for tx_hash in tx_hashes]
+        self.mem_pool.difference_update(tx_hashes)
+
+    async def get_block_height(self):
+        self.height_requests += 1
+        return self.height
+
+    async def get_contract_event_by_height(self, height: int):
+        return self.blocks.get(height, '')
+
+    async def get_contract_event_by_tx_hash(self, tx_hash: str):
+        for event_list in self.blocks.values():
+            for event in event_list:
+                if event['TxHash'] == tx_hash:
+                    return event
+        return dict()
+
+    async def get_memory_pool_tx_state(self, tx_hash: str):
+        if tx_hash not in self.mem_pool:
+            raise SDKException(ErrorCode.other_error('UNKNOWN TRANSACTION'))
+        return dict(State=list())
+
+
+class TestTxWatcher(unittest.TestCase):
+    @DNA.runner
+    async def test_wait_many(self):
+        chain = FakeChain()
+        watcher = TxWatcher(chain, poll_interval=0.01)
+        tx_hashes = [f'{index:064x}' for index in range(100)]
+        for tx_hash in tx_hashes:
+            chain.send(tx_hash)
+        waiters = asyncio.gather(*[watcher.wait(tx_hash, timeout=2) for tx_hash in tx_hashes])
+        await asyncio.sleep(0.03)
+        chain.produce(*tx_hashes[:50])
+        chain.produce()
+        chain.produce(*tx_hashes[50:])
+        event_list = await waiters
+        self.assertEqual(tx_hashes, [event['TxHash'] for event in event_list])
+        self.assertEqual(0, len(watcher))
+        await watcher.close()
+
+    @DNA.runner
+    async def test_timeout(self):
+        chain = FakeChain()
+        watcher = TxWatcher(chain, poll_interval=0.01)
+        chain.send('aa' * 32)
+        with self.assertRaises(SDKException) as context:
+            await watcher.wait('aa' * 32, timeout=0.05)
+        self.assertEqual(60004, context.exception.args[0])
+        self.assertEqual(0, len(watcher))
+        await watcher.close()
+
+    @DNA.runner
+    async def test_dropped(self):
+        chain = FakeChain()
+        watcher = TxWatcher(chain, poll_interval=0.01, mem_pool_check_interval=0.02, drop_timeout=0.05)
+        with self.assertRaises(SDKException) as context:
+            await watcher.wait('bb' * 32, timeout=2)
+        self.assertEqual(60005, context.exception.args[0])
+        await watcher.close()
+
+    @DNA.runner
+    async def test_landed_before_watch(self):
+        chain = FakeChain()
+        chain.produce('cc' * 32)
+        watcher = TxWatcher(chain, poll_interval=0.01, mem_pool_check_interval=0.02)
+        chain.produce()
+        chain.produce()
+        event = await watcher.wait('cc' * 32, timeout=2)
+        self.assertEqual(1, event['State'])
+        await watcher.close()
+
+    @DNA.runner
+    async def test_mined_before_watch(self):
+        chain = FakeChain()
+        chain.produce('ee' * 32)
+        chain.produce()
+        watcher = TxWatcher(chain, poll_interval=10, use_subscription=False)
+        event = await watcher.wait('ee' * 32, timeout=0.5)
+        self.assertEqual('ee' * 32, event['TxHash'])
+        self.assertEqual(0, len(watcher))
+        await watcher.close()
+
+
+class TestSyncTxWatcher(unittest.TestCase):
+    def test_wait(self):
+        chain = FakeChain()
+        chain.send('dd' * 32)
+        with SyncTxWatcher(chain, poll_interval=0.01) as watcher:
+            timer = threading.Timer(0.05, chain.produce, ['dd' * 32])
+            timer.start()
+            self.assertEqual('dd' * 32, watcher.wait('DD' * 32, timeout=2)['TxHash'])
+            timer.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
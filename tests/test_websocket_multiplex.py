@@ -0,0 +1,95 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import asyncio
+import unittest
+
+import websockets
+
+from dna.sdk import DNA
+from dna.network.websocket import Websocket
+from dna.exception.exception import SDKException
+
+
+async def handle_ws(ws_server, *args):
+    async def reply(msg):
+        if msg['Action'] == 'getsessioncount':
+            await asyncio.sleep(0.2)
+        await asyncio.sleep(0.01 * (msg['Height'] % 5) if 'Height' in msg else 0)
+        result = msg.get('Height', 0) * 2
+        await ws_server.send(json.dumps(dict(Action=msg['Action'], Desc='SUCCESS', Error=0, Id=msg['Id'],
+                                             Result=result, Version='1.0.0')))
+        if msg['Action'] == 'subscribe':
+            await ws_server.send(json.dumps(dict(Action='Notify', Desc='SUCCESS', Error=0, Result='event')))
+
+    tasks = list()
+    async for message in ws_server:
+        tasks.append(asyncio.ensure_future(reply(json.loads(message))))
+    await asyncio.gather(*tasks)
+
+
+class TestWebsocketMultiplex(unittest.TestCase):
+    @DNA.runner
+    async def setUp(self):
+        self.server = await websockets.serve(handle_ws, '127.0.0.1', 0)
+        self.url = f'ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}'
+
+    @DNA.runner
+    async def tearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @DNA.runner
+    async def test_concurrent_requests(self):
+        ws = Websocket(self.url)
+        heights = list(range(200))
+        result = await asyncio.gather(*[ws.get_block_hash_by_height(height) for height in heights])
+        self.assertEqual([height * 2 for height in heights], result)
+        await ws.close_connect()
+
+    @DNA.runner
+    async def test_subscribe_message(self):
+        ws = Websocket(self.url)
+        self.assertEqual(0, await ws.subscribe('1ddbb682743e9d9e2b71ff419e97a9358c5c4ee9', is_event=True))
+        heights = await asyncio.gather(*[ws.get_block_hash_by_height(height) for height in range(10)])
+        self.assertEqual(18, heights[-1])
+        self.assertEqual('event', await asyncio.wait_for(ws.recv_subscribe_info(), 1))
+        await ws.close_connect()
+
+    @DNA.runner
+    async def test_drop_late_response(self):
+        ws = Websocket(self.url, timeout=0.05)
+        with self.assertRaises(SDKException):
+            await ws.get_session_count()
+        self.assertEqual(0, await ws.get_block_hash_by_height(0))
+        await asyncio.sleep(0.3)
+        self.assertEqual(1, ws.dropped_response_count)
+        self.assertTrue(ws.subscribe_queue.empty())
+        await ws.close_connect()
+
+    def test_timeout(self):
+        self.assertRaises(SDKException, Websocket, self.url, timeout=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,347 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import itertools
+import subprocess
+import tracemalloc
+
+from typing import List, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from dna.core.transaction import Transaction, TxType
+from dna.network.aiorestful import AioRestful
+from dna.network.aiorpc import AioRpc
+from tools.fake_node import FakeChain, GAS_PRICE, GAS_LIMIT
+from dna.network.restful import Restful
+from dna.network.rpc import Rpc
+from dna.network.websocket import Websocket
+
+CLIENTS = ['rpc', 'aiorpc', 'restful', 'aiorestful', 'websocket']
+WORKLOADS = ['block_scan', 'balance_fan_out', 'tx_submit', 'pre_exec']
+SYNC_CLIENTS = {'rpc': Rpc, 'restful': Restful}
+ASYNC_CLIENTS = {'aiorpc': AioRpc, 'aiorestful': AioRestful, 'websocket': Websocket}
+DEFAULT_REQUESTS = 500
+DEFAULT_CONCURRENCY = 16
+DEFAULT_NODE_HEIGHT = 1000
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if len(sorted_values) == 0:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class BenchmarkResult(object):
+    def __init__(self, client: str, workload: str, concurrency: int):
+        self.client = client
+        self.workload = workload
+        self.concurrency = concurrency
+        self.latencies = list()
+        self.errors = 0
+        self.duration = 0.0
+        self.cpu_time = 0.0
+        self.alloc_peak_bytes = 0
+        self.alloc_blocks = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def __iter__(self):
+        latencies = sorted(self.latencies)
+        requests = max(1, self.requests)
+        data = dict()
+        data['client'] = self.client
+        data['workload'] = self.workload
+        data['concurrency'] = self.concurrency
+        data['requests'] = self.requests
+        data['errors'] = self.errors
+        data['duration'] = round(self.duration, 6)
+        data['requests_per_second'] = round(self.requests / self.duration, 2) if self.duration > 0 else 0.0
+        data['latency_p50_ms'] = round(percentile(latencies, 50) * 1000, 3)
+        data['latency_p99_ms'] = round(percentile(latencies, 99) * 1000, 3)
+        data['cpu_per_request_us'] = round(self.cpu_time / requests * 1e6, 2)
+        data['alloc_peak_bytes_per_request'] = round(self.alloc_peak_bytes / requests, 1)
+        data['alloc_blocks_per_request'] = round(self.alloc_blocks / requests, 2)
+        for key, value in data.items():
+            yield (key, value)
+
+
+class Workload(object):
+    """
+    The arguments of the requests of a workload, which are derived from the same seed as the fake node,
+    so that every client sends the same requests.
+    """
+
+    def __init__(self, height: int = DEFAULT_NODE_HEIGHT, seed: int = 0):
+        self.height = height
+        self.addresses = [address.b58encode() for address in FakeChain(height=0, seed=seed).accounts]
+        self.__nonce = itertools.count(int(time.time() * 1000) & 0x7FFFFFFF)
+
+    def make_tx(self) -> Transaction:
+        return Transaction(0, TxType.InvokeNeoVm, GAS_PRICE, GAS_LIMIT, b'', bytearray(b'\x00\xc1\x04main'),
+                           nonce=next(self.__nonce))
+
+    def get_calls(self, client, name: str, count: int) -> List[Callable]:
+        if name == 'block_scan':
+            return [lambda height=index % (self.height + 1): client.get_block_by_height(height)
+                    for index in range(count)]
+        if name == 'balance_fan_out':
+            return [lambda address=self.addresses[index % len(self.addresses)]: client.get_balance(address)
+                    for index in range(count)]
+        if name == 'tx_submit':
+            return [lambda tx=self.make_tx(): client.send_raw_transaction(tx) for _ in range(count)]
+        if name == 'pre_exec':
+            return [lambda tx=self.make_tx(): client.send_raw_transaction_pre_exec(tx) for _ in range(count)]
+        raise ValueError(f'unknown workload {name}')
+
+
+class BenchmarkRunner(object):
+    """
+    Drive the network clients against a node and measure the throughput, the latency percentiles, the client
+    CPU time and the allocations of each workload:
+
+        runner = BenchmarkRunner(node_address, requests=500, concurrency=16)
+        results = runner.run(['rpc', 'aiorpc'], ['block_scan'])
+
+    Each workload is run once for the timing, and once more under tracemalloc for the allocations, because
+    tracing slows down the requests. The sync clients are driven by a thread pool of `concurrency` workers,
+    and the async clients by `concurrency` tasks.
+    """
+
+    def __init__(self, address: str, requests: int = DEFAULT_REQUESTS, concurrency: int = DEFAULT_CONCURRENCY,
+                 height: int = DEFAULT_NODE_HEIGHT, seed: int = 0, warm_up: int = 10, trace_alloc: bool = True):
+        self.address = address
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warm_up = warm_up
+        self.trace_alloc = trace_alloc
+        self.workload = Workload(height, seed)
+        self.__blocks = 0
+
+    def __get_url(self, client: str) -> str:
+        if client == 'websocket':
+            return self.address.replace('http://', 'ws://', 1)
+        return self.address
+
+    @staticmethod
+    def __timed(call: Callable, result: BenchmarkResult):
+        start = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            result.errors += 1
+        result.latencies.append(time.perf_counter() - start)
+
+    @staticmethod
+    async def __aio_timed(call: Callable, result: BenchmarkResult):
+        start = time.perf_counter()
+        try:
+            await call()
+        except Exception:
+            result.errors += 1
+        result.latencies.append(time.perf_counter() - start)
+
+    def __run_sync_calls(self, calls: List[Callable], result: BenchmarkResult):
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            list(executor.map(lambda call: self.__timed(call, result), calls))
+
+    async def __run_async_calls(self, calls: List[Callable], result: BenchmarkResult):
+        queue = iter(calls)
+
+        async def worker():
+            for call in queue:
+                await self.__aio_timed(call, result)
+
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+
+    def __start_trace(self):
+        self.__blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+
+    def __stop_trace(self, result: BenchmarkResult):
+        result.alloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result.alloc_blocks = max(0, sys.getallocatedblocks() - self.__blocks)
+
+    def run_sync(self, client_name: str, workload: str) -> BenchmarkResult:
+        result = BenchmarkResult(client_name, workload, self.concurrency)
+        client = SYNC_CLIENTS[client_name](self.__get_url(client_name), pool_size=self.concurrency)
+        try:
+            self.__run_sync_calls(self.workload.get_calls(client, workload, self.warm_up), result)
+            result.latencies, result.errors = list(), 0
+            calls = self.workload.get_calls(client, workload, self.requests)
+            cpu_start, start = time.process_time(), time.perf_counter()
+            self.__run_sync_calls(calls, result)
+            result.duration = time.perf_counter() - start
+            result.cpu_time = time.process_time() - cpu_start
+            if self.trace_alloc:
+                calls = self.workload.get_calls(client, workload, self.requests)
+                self.__start_trace()
+                self.__run_sync_calls(calls, BenchmarkResult(client_name, workload, self.concurrency))
+                self.__stop_trace(result)
+        finally:
+            client.close()
+        return result
+
+    async def run_async(self, client_name: str, workload: str) -> BenchmarkResult:
+        result = BenchmarkResult(client_name, workload, self.concurrency)
+        client = ASYNC_CLIENTS[client_name](self.__get_url(client_name))
+        try:
+            await self.__run_async_calls(self.workload.get_calls(client, workload, self.warm_up), result)
+            result.latencies, result.errors = list(), 0
+            calls = self.workload.get_calls(client, workload, self.requests)
+            cpu_start, start = time.process_time(), time.perf_counter()
+            await self.__run_async_calls(calls, result)
+            result.duration = time.perf_counter() - start
+            result.cpu_time = time.process_time() - cpu_start
+            if self.trace_alloc:
+                calls = self.workload.get_calls(client, workload, self.requests)
+                self.__start_trace()
+                await self.__run_async_calls(calls, BenchmarkResult(client_name, workload, self.concurrency))
+                self.__stop_trace(result)
+        finally:
+            if client_name == 'websocket':
+                await client.close_connect()
+            else:
+                await client.close()
+        return result
+
+    def run(self, clients: List[str] = None, workloads: List[str] = None) -> List[BenchmarkResult]:
+        results = list()
+        loop = asyncio.new_event_loop()
+        try:
+            for workload in workloads or WORKLOADS:
+                for client in clients or CLIENTS:
+                    if client in SYNC_CLIENTS:
+                        results.append(self.run_sync(client, workload))
+                    else:
+                        results.append(loop.run_until_complete(self.run_async(client, workload)))
+        finally:
+            loop.close()
+        return results
+
+
+def start_node_process(height: int = DEFAULT_NODE_HEIGHT, seed: int = 0, latency: float = 0.0) -> tuple:
+    """
+    Start a fake node in a child process, so that its CPU time and allocations are not measured as the client's.
+    The child runs in the root of the source tree, which holds both the tools and the dna packages, so that it does
+    not depend on the working directory of the caller. Return the process and the address of the node.
+    """
+    args = [sys.executable, '-m', 'tools.fake_node', '--port', '0', '--height', str(height), '--seed',
+            str(seed), '--latency', str(latency)]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, universal_newlines=True, cwd=ROOT_DIR)
+    line = process.stdout.readline()
+    if not line.startswith('Serving a fake node at '):
+        process.kill()
+        raise RuntimeError(f'failed to start the fake node: {line}')
+    return process, line.split()[5]
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, cwd=ROOT_DIR,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def make_report(results: List[BenchmarkResult], config: dict) -> dict:
+    return dict(commit=get_commit(), python=platform.python_version(), platform=platform.platform(), config=config,
+                results=[dict(result) for result in results])
+
+
+def compare_reports(baseline: dict, report: dict) -> List[dict]:
+    """
+    Compare the throughput and the p99 latency of a report with a baseline report, as ratios of current to baseline.
+    """
+    base_results = dict(((r['client'], r['workload']), r) for r in baseline.get('results', list()))
+    comparison = list()
+    for result in report['results']:
+        base = base_results.get((result['client'], result['workload']))
+        if base is None:
+            continue
+        comparison.append(dict(client=result['client'], workload=result['workload'],
+                               throughput_ratio=round(result['requests_per_second'] /
+                                                      max(base['requests_per_second'], 1e-9), 3),
+                               p99_ratio=round(result['latency_p99_ms'] / max(base['latency_p99_ms'], 1e-9), 3)))
+    return comparison
+
+
+def format_results(results: List[Dict], columns: List[str] = None) -> str:
+    if columns is None:
+        columns = ['client', 'workload', 'requests_per_second', 'latency_p50_ms', 'latency_p99_ms',
+                   'cpu_per_request_us', 'alloc_peak_bytes_per_request', 'errors']
+    lines = ['\t'.join(columns)]
+    for result in results:
+        lines.append('\t'.join(str(result[column]) for column in columns))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the network clients against a fake node.')
+    parser.add_argument('--address', default='', help='the address of a running node, a fake node is started if empty')
+    parser.add_argument('--clients', nargs='+', choices=CLIENTS, default=CLIENTS)
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--height', type=int, default=DEFAULT_NODE_HEIGHT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='the latency injected into the fake node')
+    parser.add_argument('--no-alloc', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', default='', help='a previous output to compare with')
+    args = parser.parse_args()
+    process, address = None, args.address
+    if not address:
+        process, address = start_node_process(args.height, args.seed, args.latency)
+    try:
+        runner = BenchmarkRunner(address, args.requests, args.concurrency, args.height, args.seed,
+                                 trace_alloc=not args.no_alloc)
+        results = runner.run(args.clients, args.workloads)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    config = dict(requests=args.requests, concurrency=args.concurrency, height=args.height, seed=args.seed,
+                  latency=args.latency, external_node=bool(args.address))
+    report = make_report(results, config)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(format_results(report['results']))
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            comparison = compare_reports(json.load(f), report)
+        print(format_results(comparison, ['client', 'workload', 'throughput_ratio', 'p99_ratio']))
+
+
+if __name__ == '__main__':
+    main()
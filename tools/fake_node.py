@@ -0,0 +1,733 @@
+#
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright 2019 DNA Dev team
+#
+"""
+Copyright (C) 2018-2019 The ontology Authors
+This file is part of The ontology library.
+
+The ontology is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+The ontology is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with The ontology.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import random
+import asyncio
+import argparse
+import threading
+
+from enum import Enum
+from typing import List, Dict, Callable
+
+from aiohttp import web, WSMsgType
+
+from dna.common.address import Address
+from dna.core.block import Block, Header
+from dna.core.transaction import Transaction, TxType
+from dna.crypto.digest import Digest
+from dna.network.sync_client import EventLoopThread
+
+DEFAULT_HEIGHT = 100
+DEFAULT_TXS_PER_BLOCK = 2
+DEFAULT_ACCOUNT_COUNT = 16
+DEFAULT_NETWORK_ID = 2
+GENESIS_TIMESTAMP = 1577836800
+GAS_PRICE = 500
+GAS_LIMIT = 20000
+ONT_CONTRACT_ADDRESS = '0100000000000000000000000000000000000000'
+ONG_CONTRACT_ADDRESS = '0200000000000000000000000000000000000000'
+
+
+class NodeError(object):
+    SUCCESS = (0, 'SUCCESS')
+    ILLEGAL_DATA_FORMAT = (41003, 'ILLEGAL DATAFORMAT')
+    INVALID_METHOD = (42001, 'INVALID METHOD')
+    INVALID_PARAMS = (42002, 'INVALID PARAMS')
+    INVALID_TRANSACTION = (43001, 'INVALID TRANSACTION')
+    UNKNOWN_TRANSACTION = (44001, 'UNKNOWN TRANSACTION')
+    UNKNOWN_BLOCK = (44003, 'UNKNOWN BLOCK')
+    INTERNAL_ERROR = (45001, 'INTERNAL ERROR')
+
+
+class FakeNodeError(Exception):
+    def __init__(self, error: tuple, result=''):
+        super().__init__(error[0], error[1])
+        self.code, self.desc = error
+        self.result = result
+
+
+class FaultKind(Enum):
+    NodeError = 'node_error'
+    HttpError = 'http_error'
+    Disconnect = 'disconnect'
+
+
+class Fault(object):
+    """
+    The latency and the errors injected into the requests of a fake node. Each request is delayed by
+    latency plus a uniform random jitter, and fails with the given kind of error at error_rate.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 kind: FaultKind = FaultKind.NodeError):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.kind = kind
+
+
+def to_explorer_hex(value: bytes) -> str:
+    return bytes.hex(value[::-1])
+
+
+def compute_merkle_root(hash_list: List[bytes]) -> bytes:
+    if len(hash_list) == 0:
+        return bytes(32)
+    while len(hash_list) > 1:
+        if len(hash_list) % 2 == 1:
+            hash_list = hash_list + hash_list[-1:]
+        hash_list = [Digest.hash256(hash_list[i] + hash_list[i + 1]) for i in range(0, len(hash_list), 2)]
+    return hash_list[0]
+
+
+class FakeChain(object):
+    """
+    A deterministic synthetic chain: the blocks, transactions and events only depend on the seed, and the
+    transactions sent to the node are packed into the next produced block.
+
+    The merkle proofs are built over the transactions roots of all blocks in the same way as
+    MerkleVerifier.get_proof expects, so that they can be validated by MerkleVerifier.validate_proof.
+    """
+
+    def __init__(self, height: int = DEFAULT_HEIGHT, txs_per_block: int = DEFAULT_TXS_PER_BLOCK, block_time: int = 1,
+                 seed: int = 0, account_count: int = DEFAULT_ACCOUNT_COUNT):
+        self.txs_per_block = txs_per_block
+        self.block_time = block_time
+        self.seed = seed
+        self.accounts = [Address(Digest.hash160(f'dna-fake-node-{seed}-{index}'.encode('utf-8')))
+                         for index in range(max(2, account_count))]
+        self.blocks = list()
+        self.pending = dict()
+        self.__block_json = list()
+        self.__block_raw = list()
+        self.__events = list()
+        self.__block_index = dict()
+        self.__tx_index = dict()
+        self.__merkle_levels = None
+        self.__lock = threading.RLock()
+        for _ in range(height + 1):
+            self.produce_block()
+
+    @property
+    def height(self) -> int:
+        return len(self.blocks) - 1
+
+    def __digest(self, *args) -> bytes:
+        return Digest.sha256('-'.join(str(arg) for arg in (self.seed,) + args).encode('utf-8'))
+
+    def __make_tx(self, height: int, index: int) -> Transaction:
+        payer = self.accounts[(height + index) % len(self.accounts)]
+        payload = bytearray(self.__digest('payload', height, index))
+        nonce = height * max(1, self.txs_per_block) + index + 1
+        return Transaction(0, TxType.InvokeNeoVm, GAS_PRICE, GAS_LIMIT, payer, payload, nonce=nonce)
+
+    def __make_event(self, height: int, index: int, tx: Transaction) -> dict:
+        tx_hash = tx.hash256_explorer()
+        if tx_hash in self.pending:
+            return dict(TxHash=tx_hash, State=1, GasConsumed=GAS_PRICE * GAS_LIMIT // 10, Notify=list())
+        from_address = Address(tx.payer).b58encode()
+        to_address = self.accounts[(height + index + 1) % len(self.accounts)].b58encode()
+        amount = int.from_bytes(self.__digest('amount', height, index)[:2], 'little') + 1
+        notify = [dict(ContractAddress=ONT_CONTRACT_ADDRESS, States=['transfer', from_address, to_address, amount]),
+                  dict(ContractAddress=ONG_CONTRACT_ADDRESS,
+                       States=['transfer', from_address, 'AFmseVrdL9f9oyCzZefL9tG6UbviEH9ugK', GAS_PRICE * 20])]
+        return dict(TxHash=tx_hash, State=1, GasConsumed=GAS_PRICE * 20, Notify=notify)
+
+    @staticmethod
+    def tx_to_json(tx: Transaction, height: int) -> dict:
+        return dict(Version=tx.version, Nonce=tx.nonce, GasPrice=tx.gas_price, GasLimit=tx.gas_limit,
+                    Payer=Address(tx.payer).b58encode(), TxType=tx.tx_type, Payload=dict(Code=bytes(tx.payload).hex()),
+                    Attributes=list(), Sigs=list(), Hash=tx.hash256_explorer(), Height=height)
+
+    def produce_block(self) -> Block:
+        with self.__lock:
+            height = len(self.blocks)
+            tx_list = [self.__make_tx(height, index) for index in range(self.txs_per_block)]
+            tx_list.extend(self.pending.values())
+            if height == 0:
+                prev_hash, block_root = bytes(32), bytes(32)
+            else:
+                prev_header = self.blocks[-1].header
+                prev_hash = prev_header.hash256()
+                block_root = Digest.hash256(prev_header.block_root + prev_header.transactions_root)
+            tx_root = compute_merkle_root([tx.hash256() for tx in tx_list])
+            consensus_data = int.from_bytes(self.__digest('consensus', height)[:8], 'little')
+            header = Header(0, prev_hash, tx_root, block_root, GENESIS_TIMESTAMP + height * self.block_time, height,
+                            consensus_data)
+            block = Block(header, tx_list)
+            block_raw = block.serialize(is_hex=True)
+            block_json = dict(Hash=block.hash256_explorer(), Size=len(block_raw) // 2, Header=dict(header),
+                              Transactions=[self.tx_to_json(tx, height) for tx in tx_list])
+            events = [self.__make_event(height, index, tx) for index, tx in enumerate(tx_list)]
+            self.blocks.append(block)
+            self.__block_raw.append(block_raw)
+            self.__block_json.append(block_json)
+            self.__events.append(events)
+            self.__block_index[block_json['Hash']] = height
+            for index, tx in enumerate(tx_list):
+                self.__tx_index[tx.hash256_explorer()] = (height, index)
+            self.pending.clear()
+            self.__merkle_levels = None
+            return block
+
+    def send_transaction(self, tx: Transaction) -> str:
+        tx_hash = tx.hash256_explorer()
+        with self.__lock:
+            if tx_hash in self.__tx_index or tx_hash in self.pending:
+                raise FakeNodeError(NodeError.INVALID_TRANSACTION, 'duplicated transaction detected')
+            self.pending[tx_hash] = tx
+        return tx_hash
+
+    def get_block_height(self, key: int or str) -> int:
+        if isinstance(key, str) and not key.isdigit():
+            height = self.__block_index.get(key)
+        else:
+            height = int(key)
+        if height is None or not 0 <= height <= self.height:
+            raise FakeNodeError(NodeError.UNKNOWN_BLOCK)
+        return height
+
+    def get_block_json(self, key: int or str) -> dict:
+        return self.__block_json[self.get_block_height(key)]
+
+    def get_block_raw(self, key: int or str) -> str:
+        return self.__block_raw[self.get_block_height(key)]
+
+    def get_tx_location(self, tx_hash: str) -> tuple:
+        location = self.__tx_index.get(tx_hash)
+        if location is None:
+            raise FakeNodeError(NodeError.UNKNOWN_TRANSACTION)
+        return location
+
+    def get_tx_json(self, tx_hash: str) -> dict:
+        height, index = self.get_tx_location(tx_hash)
+        return self.__block_json[height]['Transactions'][index]
+
+    def get_tx_raw(self, tx_hash: str) -> str:
+        height, index = self.get_tx_location(tx_hash)
+        return self.blocks[height].transactions[index].serialize(is_hex=True)
+
+    def get_events_by_height(self, height: int) -> List[dict] or None:
+        events = self.__events[self.get_block_height(height)]
+        return events if len(events) != 0 else None
+
+    def get_event_by_tx_hash(self, tx_hash: str) -> dict or None:
+        location = self.__tx_index.get(tx_hash)
+        if location is None:
+            return None
+        return self.__events[location[0]][location[1]]
+
+    def __get_merkle_levels(self) -> List[List[bytes]]:
+        levels = self.__merkle_levels
+        if levels is None:
+            level = [block.header.transactions_root for block in self.blocks]
+            levels = [level]
+            while len(level) > 1:
+                level = [Digest.sha256(b'\x01' + level[i] + level[i + 1]) if i + 1 < len(level) else level[i]
+                         for i in range(0, len(level), 2)]
+                levels.append(level)
+            self.__merkle_levels = levels
+        return levels
+
+    def get_merkle_proof(self, tx_hash: str) -> dict:
+        height, _ = self.get_tx_location(tx_hash)
+        with self.__lock:
+            levels = self.__get_merkle_levels()
+        target_hashes = list()
+        index = height
+        for level in levels[:-1]:
+            if index % 2 == 1:
+                target_hashes.append(to_explorer_hex(level[index - 1]))
+            elif index < len(level) - 1:
+                target_hashes.append(to_explorer_hex(level[index + 1]))
+            index //= 2
+        return dict(Type='MerkleProof', TransactionsRoot=to_explorer_hex(levels[0][height]), BlockHeight=height,
+                    CurBlockRoot=to_explorer_hex(levels[-1][0]), CurBlockHeight=len(levels[0]) - 1,
+                    TargetHashes=target_hashes)
+
+    def get_amount(self, *args) -> int:
+        return int.from_bytes(self.__digest(*args)[:4], 'little')
+
+    def pre_exec(self, tx: Transaction) -> dict:
+        return dict(State=1, Gas=GAS_LIMIT, Result=bytes.hex(self.__digest('pre-exec', bytes(tx.payload).hex())[:8]),
+                    Notify=list())
+
+    def get_storage(self, contract_address: str, key: str) -> str:
+        return bytes.hex(self.__digest('storage', contract_address, key))
+
+
+class FakeNode(object):
+    """
+    A local stand-in for a node, which serves the JSON-RPC methods, the restful API and the websocket actions of
+    a deterministic FakeChain on one port, with injectable latency and errors:
+
+        async with FakeNode(height=1000, fault=Fault(latency=0.005)) as node:
+            rpc = AioRpc(node.rpc_address)
+
+    It can also be run on a background thread by `with FakeNode() as node`, or from the command line by
+    `python -m tools.fake_node --port 20336`.
+    """
+
+    def __init__(self, height: int = DEFAULT_HEIGHT, txs_per_block: int = DEFAULT_TXS_PER_BLOCK, block_time: int = 1,
+                 produce_blocks: bool = False, seed: int = 0, network_id: int = DEFAULT_NETWORK_ID,
+                 fault: Fault = None):
+        self.chain = FakeChain(height, txs_per_block, block_time, seed)
+        self.produce_blocks = produce_blocks
+        self.network_id = network_id
+        self.fault = fault if fault is not None else Fault()
+        self.request_counts = dict()
+        self.__faults = dict()
+        self.__random = random.Random(seed)
+        self.__handlers = self.__get_handlers()
+        self.__address = ''
+        self.__loop = None
+        self.__runner = None
+        self.__producer_task = None
+        self.__loop_thread = None
+        self.__ws_subscriptions = dict()
+
+    @property
+    def address(self) -> str:
+        return self.__address
+
+    @property
+    def rpc_address(self) -> str:
+        return self.__address
+
+    @property
+    def restful_address(self) -> str:
+        return self.__address
+
+    @property
+    def ws_address(self) -> str:
+        return self.__address.replace('http://', 'ws://', 1)
+
+    def set_fault(self, fault: Fault or None, method: str = ''):
+        """
+        Set the fault of a JSON-RPC method name, e.g. 'getblock', or the default fault of all methods.
+        A batch request is faulted as the method 'batch'.
+        """
+        if not method:
+            self.fault = fault if fault is not None else Fault()
+        elif fault is None:
+            self.__faults.pop(method, None)
+        else:
+            self.__faults[method] = fault
+
+    def __get_handlers(self) -> Dict[str, Callable]:
+        chain = self.chain
+        return {
+            'getversion': lambda *args: '1.0.0-fake',
+            'getconnectioncount': lambda *args: 4,
+            'getsessioncount': lambda *args: len(self.__ws_subscriptions),
+            'getgasprice': lambda *args: dict(gasprice=GAS_PRICE, height=chain.height),
+            'getnetworkid': lambda *args: self.network_id,
+            'getgenerateblocktime': lambda *args: chain.block_time,
+            'getblockcount': lambda *args: chain.height + 1,
+            'getblockheight': lambda *args: chain.height,
+            'getbestblockhash': lambda *args: chain.get_block_json(chain.height)['Hash'],
+            'getblockhash': lambda height, *args: chain.get_block_json(int(height))['Hash'],
+            'getblock': self.__get_block,
+            'getrawtransaction': self.__get_transaction,
+            'getblockheightbytxhash': lambda tx_hash, *args: chain.get_tx_location(tx_hash)[0],
+            'getsmartcodeevent': self.__get_events,
+            'getmerkleproof': lambda tx_hash, *args: chain.get_merkle_proof(tx_hash),
+            'getbalance': lambda address, *args: dict(ont=str(chain.get_amount('ont', address) % 10 ** 6),
+                                                      ong=str(chain.get_amount('ong', address))),
+            'getallowance': lambda asset, from_address, to_address, *args: str(
+                chain.get_amount('allowance', asset, from_address, to_address) % 10 ** 6),
+            'getunboundong': lambda address, *args: str(chain.get_amount('unbound', address)),
+            'getgrantong': lambda address, *args: str(chain.get_amount('grant', address)),
+            'getstorage': lambda contract_address, key, *args: chain.get_storage(contract_address, key),
+            'getcontractstate': lambda contract_address, *args: dict(
+                Code=chain.get_storage(contract_address, 'code'), NeedStorage=True, Name='fake', CodeVersion='1.0',
+                Author='', Email='', Description=''),
+            'getmempooltxcount': lambda *args: [len(chain.pending), 0],
+            'getmempooltxstate': self.__get_mem_pool_tx_state,
+            'getblockrootwithnewtxroot': lambda tx_root, *args: bytes.hex(Digest.hash256(bytes.fromhex(tx_root))),
+            'sendrawtransaction': self.__send_transaction,
+        }
+
+    def __get_block(self, key: int or str, verbose: int = 0, *args):
+        if verbose:
+            return self.chain.get_block_json(key)
+        return self.chain.get_block_raw(key)
+
+    def __get_transaction(self, tx_hash: str, verbose: int = 0, *args):
+        if verbose:
+            return self.chain.get_tx_json(tx_hash)
+        return self.chain.get_tx_raw(tx_hash)
+
+    def __get_events(self, key: int or str, *args):
+        if isinstance(key, int) or key.isdigit():
+            return self.chain.get_events_by_height(int(key))
+        return self.chain.get_event_by_tx_hash(key)
+
+    def __get_mem_pool_tx_state(self, tx_hash: str, *args):
+        if tx_hash not in self.chain.pending:
+            raise FakeNodeError(NodeError.UNKNOWN_TRANSACTION)
+        return dict(State=[dict(Type=1, Height=self.chain.height, ErrCode=0)])
+
+    def __send_transaction(self, tx_data: str, pre_exec: int = 0, *args):
+        try:
+            tx = Transaction.deserialize_from(bytes.fromhex(tx_data))
+        except Exception:
+            raise FakeNodeError(NodeError.INVALID_TRANSACTION, 'invalid transaction data') from None
+        if int(pre_exec) == 1:
+            return self.chain.pre_exec(tx)
+        return self.chain.send_transaction(tx)
+
+    def call(self, method: str, params: list = None):
+        """
+        Call a JSON-RPC method of the node, and return the result or raise FakeNodeError.
+        """
+        handler = self.__handlers.get(method)
+        if handler is None:
+            raise FakeNodeError(NodeError.INVALID_METHOD)
+        try:
+            return handler(*(params or list()))
+        except (TypeError, ValueError, IndexError):
+            raise FakeNodeError(NodeError.INVALID_PARAMS) from None
+
+    def __call(self, method: str, params: list) -> tuple:
+        try:
+            return NodeError.SUCCESS, self.call(method, params)
+        except FakeNodeError as e:
+            return (e.code, e.desc), e.result
+
+    async def __inject(self, method: str) -> FaultKind or None:
+        self.request_counts[method] = self.request_counts.get(method, 0) + 1
+        fault = self.__faults.get(method, self.fault)
+        delay = fault.latency + (self.__random.uniform(0, fault.jitter) if fault.jitter > 0 else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if fault.error_rate > 0 and self.__random.random() < fault.error_rate:
+            return fault.kind
+        return None
+
+    @staticmethod
+    def __rpc_response(qid, error: tuple, result) -> dict:
+        return dict(desc=error[1], error=error[0], id=qid, jsonrpc='2.0', result=result)
+
+    @staticmethod
+    def __fault_response(request: web.Request, kind: FaultKind, body: dict) -> web.Response:
+        if kind == FaultKind.Disconnect:
+            request.transport.close()
+        if kind == FaultKind.HttpError:
+            return web.Response(status=500, text='injected error')
+        return web.json_response(body)
+
+    async def __handle_rpc(self, request: web.Request) -> web.Response:
+        try:
+            payload = json.loads(await request.read())
+        except json.decoder.JSONDecodeError:
+            return web.json_response(self.__rpc_response(0, NodeError.ILLEGAL_DATA_FORMAT, ''))
+        if isinstance(payload, list):
+            fault = await self.__inject('batch')
+            if fault is not None:
+                body = [self.__rpc_response(item.get('id'), NodeError.INTERNAL_ERROR, '') for item in payload]
+                return self.__fault_response(request, fault, body)
+            body = [self.__rpc_response(item.get('id'), *self.__call(item.get('method'), item.get('params')))
+                    for item in payload]
+            return web.json_response(body)
+        fault = await self.__inject(payload.get('method'))
+        if fault is not None:
+            body = self.__rpc_response(payload.get('id'), NodeError.INTERNAL_ERROR, '')
+            return self.__fault_response(request, fault, body)
+        return web.json_response(self.__rpc_response(payload.get('id'),
+                                                     *self.__call(payload.get('method'), payload.get('params'))))
+
+    @staticmethod
+    def __restful_response(action: str, error: tuple, result) -> dict:
+        return dict(Action=action, Desc=error[1], Error=error[0], Result=result, Version='1.0.0')
+
+    def __make_restful_handler(self, action: str, method: str, get_params: Callable):
+        async def handle(request: web.Request) -> web.Response:
+            fault = await self.__inject(method)
+            if fault is not None:
+                body = self.__restful_response(action, NodeError.INTERNAL_ERROR, '')
+                return self.__fault_response(request, fault, body)
+            try:
+                params = get_params(request.match_info, request.query)
+            except (KeyError, ValueError):
+                return web.json_response(self.__restful_response(action, NodeError.INVALID_PARAMS, ''))
+            return web.json_response(self.__restful_response(action, *self.__call(method, params)))
+
+        return handle
+
+    async def __handle_send_transaction(self, request: web.Request) -> web.Response:
+        fault = await self.__inject('sendrawtransaction')
+        if fault is not None:
+            body = self.__restful_response('sendrawtransaction', NodeError.INTERNAL_ERROR, '')
+            return self.__fault_response(request, fault, body)
+        try:
+            data = json.loads(await request.read())['Data']
+        except (json.decoder.JSONDecodeError, KeyError, TypeError):
+            body = self.__restful_response('sendrawtransaction', NodeError.ILLEGAL_DATA_FORMAT, '')
+            return web.json_response(body)
+        pre_exec = 1 if request.query.get('preExec') == '1' else 0
+        result = self.__call('sendrawtransaction', [data, pre_exec])
+        return web.json_response(self.__restful_response('sendrawtransaction', *result))
+
+    def __get_restful_routes(self) -> list:
+        def verbose(query) -> int:
+            return 0 if query.get('raw') == '1' else 1
+
+        return [
+            ('/api/v1/version', 'getversion', 'getversion', lambda m, q: []),
+            ('/api/v1/networkid', 'getnetworkid', 'getnetworkid', lambda m, q: []),
+            ('/api/v1/node/connectioncount', 'getconnectioncount', 'getconnectioncount', lambda m, q: []),
+            ('/api/v1/node/generateblocktime', 'getgenerateblocktime', 'getgenerateblocktime', lambda m, q: []),
+            ('/api/v1/gasprice', 'getgasprice', 'getgasprice', lambda m, q: []),
+            ('/api/v1/block/height', 'getblockheight', 'getblockheight', lambda m, q: []),
+            ('/api/v1/block/details/height/{height}', 'getblockbyheight', 'getblock',
+             lambda m, q: [int(m['height']), verbose(q)]),
+            ('/api/v1/block/details/hash/{hash}', 'getblockbyhash', 'getblock', lambda m, q: [m['hash'], verbose(q)]),
+            ('/api/v1/block/height/txhash/{hash}', 'getblockheightbytxhash', 'getblockheightbytxhash',
+             lambda m, q: [m['hash']]),
+            ('/api/v1/transaction/{hash}', 'gettransaction', 'getrawtransaction',
+             lambda m, q: [m['hash'], verbose(q)]),
+            ('/api/v1/balance/{address}', 'getbalance', 'getbalance', lambda m, q: [m['address']]),
+            ('/api/v1/allowance/{asset}/{from}/{to}', 'getallowance', 'getallowance',
+             lambda m, q: [m['asset'], m['from'], m['to']]),
+            ('/api/v1/unboundong/{address}', 'getunboundong', 'getunboundong', lambda m, q: [m['address']]),
+            ('/api/v1/grantong/{address}', 'getgrantong', 'getgrantong', lambda m, q: [m['address']]),
+            ('/api/v1/contract/{address}', 'getcontract', 'getcontractstate', lambda m, q: [m['address']]),
+            ('/api/v1/storage/{address}/{key}', 'getstorage', 'getstorage', lambda m, q: [m['address'], m['key']]),
+            ('/api/v1/smartcode/event/transactions/{height}', 'getsmartcodeeventbyheight', 'getsmartcodeevent',
+             lambda m, q: [int(m['height'])]),
+            ('/api/v1/smartcode/event/txhash/{hash}', 'getsmartcodeeventbyhash', 'getsmartcodeevent',
+             lambda m, q: [m['hash']]),
+            ('/api/v1/merkleproof/{hash}', 'getmerkleproof', 'getmerkleproof', lambda m, q: [m['hash']]),
+            ('/api/v1/mempool/txcount', 'getmempooltxcount', 'getmempooltxcount', lambda m, q: []),
+            ('/api/v1/mempool/txstate/{hash}', 'getmempooltxstate', 'getmempooltxstate', lambda m, q: [m['hash']]),
+        ]
+
+    @staticmethod
+    def __get_ws_call(msg: dict) -> tuple:
+        action = msg.get('Action', '')
+        verbose = 0 if int(msg.get('Raw', 0)) == 1 else 1
+        calls = {
+            'getblockbyheight': lambda: ('getblock', [int(msg['Height']), verbose]),
+            'getblockbyhash': lambda: ('getblock', [msg['Hash'], verbose]),
+            'getblockhash': lambda: ('getblockhash', [int(msg['Height'])]),
+            'getblockheightbytxhash': lambda: ('getblockheightbytxhash', [msg['Hash']]),
+            'gettransaction': lambda: ('getrawtransaction', [msg['Hash'], verbose]),
+            'getbalance': lambda: ('getbalance', [msg['Addr']]),
+            'getallowance': lambda: ('getallowance', [msg['Asset'], msg['From'], msg['To']]),
+            'getunboundong': lambda: ('getunboundong', [msg['Addr']]),
+            'getgrantong': lambda: ('getgrantong', [msg['Addr']]),
+            'getcontract': lambda: ('getcontractstate', [msg['Hash']]),
+            'getstorage': lambda: ('getstorage', [msg['Hash'], msg['Key']]),
+            'getsmartcodeeventbyheight': lambda: ('getsmartcodeevent', [int(msg['Height'])]),
+            'getsmartcodeeventbyhash': lambda: ('getsmartcodeevent', [msg['Hash']]),
+            'getmerkleproof': lambda: ('getmerkleproof', [msg['Hash']]),
+            'getmempooltxstate': lambda: ('getmempooltxstate', [msg['Hash']]),
+            'sendrawtransaction': lambda: ('sendrawtransaction', [msg['Data'], int(msg.get('PreExec', 0))]),
+        }
+        call = calls.get(action)
+        if call is not None:
+            return call()
+        return action, list()
+
+    @staticmethod
+    def __ws_response(action: str, qid, error: tuple, result) -> str:
+        response = dict(Action=action, Desc=error[1], Error=error[0], Result=result, Version='1.0.0')
+        if qid is not None:
+            response['Id'] = qid
+        return json.dumps(response)
+
+    async def __handle_ws_msg(self, ws: web.WebSocketResponse, msg: dict):
+        action, qid = msg.get('Action', ''), msg.get('Id')
+        subscription = self.__ws_subscriptions[ws]
+        try:
+            method, params = self.__get_ws_call(msg)
+        except (KeyError, ValueError):
+            await ws.send_str(self.__ws_response(action, qid, NodeError.INVALID_PARAMS, ''))
+            return
+        fault = await self.__inject(method)
+        if fault == FaultKind.Disconnect:
+            await ws.close()
+            return
+        if fault is not None:
+            await ws.send_str(self.__ws_response(action, qid, NodeError.INTERNAL_ERROR, ''))
+            return
+        if action == 'subscribe':
+            for key in ('SubscribeEvent', 'SubscribeJsonBlock', 'SubscribeRawBlock', 'SubscribeBlockTxHashs'):
+                subscription[key] = bool(msg.get(key, False))
+            subscription['ConstractsFilter'] = msg.get('ContractsFilter') or list()
+            result = (NodeError.SUCCESS, dict(subscription))
+        elif action == 'heartbeat':
+            result = (NodeError.SUCCESS, dict(subscription))
+        else:
+            result = self.__call(method, params)
+        await ws.send_str(self.__ws_response(action, qid, *result))
+
+    async def __handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.__ws_subscriptions[ws] = dict(ConstractsFilter=list(), SubscribeEvent=False, SubscribeJsonBlock=False,
+                                           SubscribeRawBlock=False, SubscribeBlockTxHashs=False)
+        tasks = set()
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    msg = json.loads(message.data)
+                except json.decoder.JSONDecodeError:
+                    continue
+                task = asyncio.ensure_future(self.__handle_ws_msg(ws, msg))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            self.__ws_subscriptions.pop(ws, None)
+            for task in tasks:
+                task.cancel()
+        return ws
+
+    async def __notify(self, block: Block):
+        height = block.height
+        block_json = self.chain.get_block_json(height)
+        events = self.chain.get_events_by_height(height) or list()
+        for ws, subscription in list(self.__ws_subscriptions.items()):
+            messages = list()
+            if subscription['SubscribeEvent']:
+                contracts = subscription['ConstractsFilter']
+                for event in events:
+                    if not contracts or any(notify['ContractAddress'] in contracts for notify in event['Notify']):
+                        messages.append(self.__ws_response('Notify', None, NodeError.SUCCESS, event))
+            if subscription['SubscribeJsonBlock']:
+                messages.append(self.__ws_response('sendjsonblock', None, NodeError.SUCCESS, block_json))
+            if subscription['SubscribeRawBlock']:
+                messages.append(self.__ws_response('sendrawblock', None, NodeError.SUCCESS,
+                                                   self.chain.get_block_raw(height)))
+            if subscription['SubscribeBlockTxHashs']:
+                tx_hashes = [tx['Hash'] for tx in block_json['Transactions']]
+                messages.append(self.__ws_response('sendblocktxhashs', None, NodeError.SUCCESS,
+                                                   dict(Height=height, TxHashs=tx_hashes)))
+            try:
+                for message in messages:
+                    await ws.send_str(message)
+            except ConnectionError:
+                pass
+
+    def produce_block(self) -> Block:
+        """
+        Produce the next block with the pending transactions, and push it to the websocket subscribers.
+        It can be called from any thread.
+        """
+        block = self.chain.produce_block()
+        if self.__loop is not None and not self.__loop.is_closed():
+            self.__loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self.__notify(block)))
+        return block
+
+    async def __produce_forever(self):
+        while True:
+            await asyncio.sleep(self.chain.block_time)
+            self.produce_block()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0):
+        app = web.Application()
+        app.router.add_post('/', self.__handle_rpc)
+        app.router.add_get('/', self.__handle_ws)
+        for path, action, method, get_params in self.__get_restful_routes():
+            app.router.add_get(path, self.__make_restful_handler(action, method, get_params))
+        app.router.add_post('/api/v1/transaction', self.__handle_send_transaction)
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, host, port)
+        await site.start()
+        self.__loop = asyncio.get_event_loop()
+        self.__address = f'http://{host}:{site._server.sockets[0].getsockname()[1]}'
+        if self.produce_blocks:
+            self.__producer_task = asyncio.ensure_future(self.__produce_forever())
+
+    async def close(self):
+        if self.__producer_task is not None:
+            self.__producer_task.cancel()
+            self.__producer_task = None
+        for ws in list(self.__ws_subscriptions):
+            await ws.close()
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+        self.__loop = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start_in_thread(self, host: str = '127.0.0.1', port: int = 0):
+        """
+        Serve on a background event loop thread, which is used to test the synchronous clients.
+        """
+        self.__loop_thread = EventLoopThread('dna-fake-node')
+        self.__loop_thread.run(self.start(host, port))
+
+    def close_in_thread(self):
+        if self.__loop_thread is not None:
+            self.__loop_thread.run(self.close())
+            self.__loop_thread.close()
+            self.__loop_thread = None
+
+    def __enter__(self):
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_in_thread()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake DNA node on a deterministic synthetic chain.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=20336)
+    parser.add_argument('--height', type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument('--txs-per-block', type=int, default=DEFAULT_TXS_PER_BLOCK)
+    parser.add_argument('--block-time', type=int, default=1)
+    parser.add_argument('--produce-blocks', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    node = FakeNode(args.height, args.txs_per_block, args.block_time, args.produce_blocks, args.seed,
+                    fault=Fault(args.latency, args.jitter, args.error_rate))
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(node.start(args.host, args.port))
+    print(f'Serving a fake node at {node.address} with height {node.chain.height}', flush=True)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(node.close())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()